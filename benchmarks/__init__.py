@@ -0,0 +1,3 @@
+"""
+Performance benchmarks for `logchange`.
+"""
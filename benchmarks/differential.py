@@ -0,0 +1,414 @@
+"""
+Differential testing of optimized parse and render paths against reference implementations.
+
+Every engine runs a reference implementation and an optimized one on the same random
+input, stops on the first divergence and reports timing ratios.
+
+Usage:
+    python -m benchmarks.differential --cases 500
+    python -m benchmarks.differential --engine dedent --cases 10000 --json
+"""
+import abc
+import argparse
+import io
+import json
+import random
+import sys
+import textwrap
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from benchmarks.generator import RandomChangeLogGenerator
+from logchange.changelog import ChangeLog, ChangeLogStreamError
+from logchange.record import Record
+from logchange.record_body import RecordBody
+from logchange.stream_formatter import StreamFormatter
+from logchange.utils import _strip_empty_lines_splitlines, dedent
+
+# Input kinds
+CHANGELOG = "changelog"
+BODY = "body"
+
+
+class SkipCase(Exception):
+    """
+    Optimized path is not applicable to this input, the case is not compared.
+    """
+
+
+class DiffCase(NamedTuple):
+    """
+    Random input.
+
+    Arguments:
+        seed -- Generator seed
+        changelog -- Changelog text with original line endings
+        body -- Release body text with original line endings
+    """
+
+    seed: int
+    changelog: str
+    body: str
+
+    @classmethod
+    def generate(cls, seed: int, releases: int) -> "DiffCase":
+        """
+        Generate random changelog and release body.
+        """
+        generator = RandomChangeLogGenerator(releases, seed=seed)
+        body = generator.get_random_body(random.Random(seed))
+        if generator.crlf:
+            body = body.replace("\n", "\r\n")
+        return cls(seed, generator.generate(), body)
+
+    def get_input(self, kind: str) -> str:
+        """
+        Get changelog or release body text.
+        """
+        return self.changelog if kind == CHANGELOG else self.body
+
+
+class Engine(abc.ABC):
+    """
+    Optimized path and its reference implementation.
+
+    Outputs are compared with `==`, an exception is compared by its type name.
+    """
+
+    name = ""
+    kind = CHANGELOG
+
+    @abc.abstractmethod
+    def reference(self, text: str) -> Any:
+        """
+        Reference implementation.
+        """
+
+    @abc.abstractmethod
+    def candidate(self, text: str) -> Any:
+        """
+        Optimized path.
+        """
+
+
+class DedentEngine(Engine):
+    """
+    `utils.dedent` fast path against `textwrap.dedent` over `str.splitlines`.
+    """
+
+    name = "dedent"
+
+    def reference(self, text: str) -> Any:
+        return textwrap.dedent(_strip_empty_lines_splitlines(text))
+
+    def candidate(self, text: str) -> Any:
+        return dedent(text)
+
+
+class _SmallChunkChangeLog(ChangeLog):
+    # small chunks, so even short random changelogs are formatted in workers
+    FORMAT_CHUNK_SIZE = 2
+
+
+class FormatReleasedEngine(Engine):
+    """
+    `ChangeLog.format_released` in worker processes against a serial run.
+    """
+
+    name = "format_released workers"
+
+    def __init__(self, workers: int = 2) -> None:
+        self.workers = workers
+
+    def reference(self, text: str) -> Any:
+        changelog = ChangeLog.parse(text)
+        changelog.format_released()
+        return changelog.render()
+
+    def candidate(self, text: str) -> Any:
+        changelog = _SmallChunkChangeLog.parse(text)
+        changelog.format_released(workers=self.workers)
+        return changelog.render()
+
+
+class StreamFormatterEngine(Engine):
+    """
+    `StreamFormatter` against `RecordBody.parse` + `sanitize` + `render`.
+    """
+
+    name = "StreamFormatter"
+    kind = BODY
+
+    def reference(self, text: str) -> Any:
+        is_crlf = "\r\n" in text
+        body = RecordBody.parse(dedent(text.replace("\r\n", "\n")))
+        body.sanitize()
+        result = body.render()
+        return result.replace("\n", "\r\n") if is_crlf else result
+
+    def candidate(self, text: str) -> Any:
+        output = io.StringIO()
+        # small spill size to exercise spilling to disk
+        StreamFormatter(spill_size=256).format(io.StringIO(text), output)
+        return output.getvalue()
+
+
+class UnreleasedEditEngine(Engine):
+    """
+    `Unreleased` edit that keeps released part as it is against an edit
+    after all release records are parsed.
+    """
+
+    name = "unreleased edit"
+
+    def reference(self, text: str) -> Any:
+        changelog = ChangeLog.parse(text)
+        try:
+            changelog.released
+        except ValueError:
+            # edit does not validate released part, so it is not compared to an error
+            raise SkipCase() from None
+        changelog.get_unreleased().append_section("fixed", "- Fix")
+        return changelog.render()
+
+    def candidate(self, text: str) -> Any:
+        changelog = ChangeLog.parse(text)
+        changelog.get_unreleased().append_section("fixed", "- Fix")
+        return changelog.render()
+
+
+class StreamRecordsEngine(Engine):
+    """
+    `ChangeLog.iterate_stream_record_texts` over file lines against a full parse.
+    """
+
+    name = "stream records"
+
+    @staticmethod
+    def _render(records: Any) -> List[str]:
+        result = []
+        try:
+            for record in records:
+                result.append(record.render())
+        except ValueError as e:
+            result.append(type(e).__name__)
+        return result
+
+    def reference(self, text: str) -> Any:
+        # `ChangeLogFile.read` converts line endings
+        text = text.replace("\r\n", "\n")
+        return self._render(ChangeLog.parse(text).iterate_records())
+
+    def candidate(self, text: str) -> Any:
+        # `ChangeLogFile.iterate_lines` strips line endings
+        lines = text.replace("\r\n", "\n").split("\n")
+        record_texts = ChangeLog.iterate_stream_record_texts(lines)
+        try:
+            return self._render(Record.parse(i) for i in record_texts)
+        except ChangeLogStreamError:
+            raise SkipCase() from None
+
+
+ENGINES: List[Engine] = [
+    DedentEngine(),
+    FormatReleasedEngine(),
+    StreamFormatterEngine(),
+    UnreleasedEditEngine(),
+    StreamRecordsEngine(),
+]
+
+
+class Divergence(NamedTuple):
+    """
+    First input on which engine outputs differ.
+
+    Arguments:
+        seed -- Case seed
+        text -- Input text
+        expected -- Reference output
+        actual -- Optimized path output
+    """
+
+    seed: int
+    text: str
+    expected: Any
+    actual: Any
+
+    def render(self) -> str:
+        """
+        Render seed, input and the first differing position.
+        """
+        expected = repr(self.expected)
+        actual = repr(self.actual)
+        index = next(
+            (i for i, (a, b) in enumerate(zip(expected, actual)) if a != b),
+            min(len(expected), len(actual)),
+        )
+        start = max(0, index - 40)
+        return "\n".join(
+            [
+                f"seed {self.seed}, outputs differ at {index}",
+                f"  input:     {self.text!r}",
+                f"  reference: ...{expected[start : index + 40]}",
+                f"  candidate: ...{actual[start : index + 40]}",
+            ]
+        )
+
+
+class EngineResult(NamedTuple):
+    """
+    Engine run result.
+
+    Arguments:
+        name -- Engine name
+        cases -- Number of compared cases
+        skipped -- Number of cases the optimized path does not apply to
+        reference_time -- Total reference time in seconds
+        candidate_time -- Total optimized path time in seconds
+        divergence -- First divergence or None
+    """
+
+    name: str
+    cases: int
+    skipped: int
+    reference_time: float
+    candidate_time: float
+    divergence: Optional[Divergence]
+
+    @property
+    def ratio(self) -> float:
+        """
+        Optimized path time to reference time, less is faster.
+        """
+        return self.candidate_time / max(self.reference_time, 1e-9)
+
+    def render(self) -> str:
+        """
+        Render as a table line and divergence details.
+        """
+        status = "DIVERGED" if self.divergence else "ok"
+        line = (
+            f"{self.name:<26} {self.cases:>7} {self.skipped:>7} {self.reference_time * 1000:>10.1f}"
+            f" {self.candidate_time * 1000:>10.1f} {self.ratio:>7.2f}  {status}"
+        )
+        if not self.divergence:
+            return line
+        return f"{line}\n{self.divergence.render()}"
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Convert to JSON-serializable dict.
+        """
+        return {
+            "name": self.name,
+            "cases": self.cases,
+            "skipped": self.skipped,
+            "reference_time": self.reference_time,
+            "candidate_time": self.candidate_time,
+            "ratio": self.ratio,
+            "divergence": self.divergence._asdict() if self.divergence else None,
+        }
+
+
+def _call(func: Callable[[str], Any], text: str) -> Any:
+    try:
+        return func(text)
+    except SkipCase:
+        raise
+    except Exception as e:
+        return f"<{type(e).__name__}>"
+
+
+def run_engine(engine: Engine, cases: Sequence[DiffCase]) -> EngineResult:
+    """
+    Run `engine` on `cases` until the first divergence.
+    """
+    reference_time = 0.0
+    candidate_time = 0.0
+    compared = 0
+    skipped = 0
+    for case in cases:
+        text = case.get_input(engine.kind)
+        try:
+            start = time.perf_counter()
+            expected = _call(engine.reference, text)
+            reference_time += time.perf_counter() - start
+            start = time.perf_counter()
+            actual = _call(engine.candidate, text)
+            candidate_time += time.perf_counter() - start
+        except SkipCase:
+            skipped += 1
+            continue
+
+        compared += 1
+        if actual != expected:
+            divergence = Divergence(case.seed, text, expected, actual)
+            return EngineResult(
+                engine.name, compared, skipped, reference_time, candidate_time, divergence
+            )
+
+    return EngineResult(engine.name, compared, skipped, reference_time, candidate_time, None)
+
+
+def run(
+    engines: Sequence[Engine], cases: int, seed: int = 0, releases: int = 20
+) -> List[EngineResult]:
+    """
+    Run `engines` on the same random cases.
+
+    Arguments:
+        engines -- Engines to run.
+        cases -- Number of random cases.
+        seed -- Seed of the first case, next cases use next seeds.
+        releases -- Maximum number of releases in a changelog.
+    """
+    diff_cases = [DiffCase.generate(seed + i, releases) for i in range(cases)]
+    return [run_engine(engine, diff_cases) for engine in engines]
+
+
+def parse_args_differential(argv: Sequence[str]) -> argparse.Namespace:
+    """
+    Parse differential runner CLI arguments.
+    """
+    parser = argparse.ArgumentParser(
+        "benchmarks.differential", description="Compare optimized paths with reference ones"
+    )
+    parser.add_argument("--cases", type=int, default=200, help="Number of random cases")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first case")
+    parser.add_argument("--releases", type=int, default=20, help="Maximum releases per case")
+    parser.add_argument(
+        "--engine",
+        action="append",
+        default=[],
+        help="Run only engines with this substring, can be used multiple times",
+    )
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    """
+    Main entrypoint, exits with code 1 on divergence.
+    """
+    args = parse_args_differential(sys.argv[1:])
+    engines = [
+        engine
+        for engine in ENGINES
+        if not args.engine or any(i in engine.name for i in args.engine)
+    ]
+    results = run(engines, args.cases, seed=args.seed, releases=args.releases)
+    if args.json:
+        sys.stdout.write(json.dumps([i.as_dict() for i in results], indent=2) + "\n")
+    else:
+        lines = [
+            f"{'Engine':<26} {'Cases':>7} {'Skipped':>7} {'Ref ms':>10} {'New ms':>10} {'Ratio':>7}"
+        ]
+        lines.extend(i.render() for i in results)
+        sys.stdout.write("\n".join(lines) + "\n")
+
+    if any(i.divergence for i in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Deterministic synthetic changelog generator.
+"""
+import datetime
+import random
+from typing import List
+
+from logchange.constants import NEW_CHANGELOG, SECTION_TITLES
+
+WORDS = (
+    "add",
+    "api",
+    "cache",
+    "cli",
+    "config",
+    "docs",
+    "error",
+    "fix",
+    "format",
+    "parser",
+    "release",
+    "section",
+    "support",
+    "test",
+    "update",
+    "version",
+)
+
+
+class ChangeLogGenerator:
+    """
+    Deterministic synthetic changelog generator.
+
+    Arguments:
+        releases -- Number of released versions
+        entries_per_section -- Number of entries in each non-empty section
+        code_fences -- Add a code block to every N-th release, 0 to disable
+        crlf -- Use Windows line endings
+        seed -- Random seed
+    """
+
+    def __init__(
+        self,
+        releases: int,
+        entries_per_section: int = 3,
+        code_fences: int = 0,
+        crlf: bool = False,
+        seed: int = 0,
+    ) -> None:
+        self.releases = releases
+        self.entries_per_section = entries_per_section
+        self.code_fences = code_fences
+        self.crlf = crlf
+        self.seed = seed
+
+    def get_versions(self) -> List[str]:
+        """
+        Get release versions from newest to oldest.
+        """
+        result = []
+        for index in range(self.releases):
+            major, rest = divmod(index, 100)
+            minor, micro = divmod(rest, 10)
+            result.append(f"{major + 1}.{minor}.{micro}")
+
+        return list(reversed(result))
+
+    def _get_entry(self, rnd: random.Random, index: int) -> str:
+        words = " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(3, 10)))
+        return f"- {words.capitalize()} #{index}"
+
+    def _get_body(self, rnd: random.Random, release_index: int) -> str:
+        parts = []
+        section_titles = rnd.sample(SECTION_TITLES, rnd.randint(1, 3))
+        for section_title in SECTION_TITLES:
+            if section_title not in section_titles:
+                continue
+            lines = [f"### {section_title.capitalize()}"]
+            for entry_index in range(self.entries_per_section):
+                lines.append(self._get_entry(rnd, release_index * 1000 + entry_index))
+            parts.append("\n".join(lines))
+
+        if self.code_fences and release_index % self.code_fences == 0:
+            parts.append("```bash\n### Not a section\nlogchange list\n```")
+
+        return "\n\n".join(parts)
+
+    def get_body(self, entries: int) -> str:
+        """
+        Get release body with `entries` entries in every section.
+        """
+        rnd = random.Random(self.seed)
+        parts = []
+        for section_title in SECTION_TITLES:
+            lines = [f"### {section_title.capitalize()}"]
+            for entry_index in range(entries):
+                lines.append(self._get_entry(rnd, entry_index))
+            parts.append("\n".join(lines))
+
+        return "\n\n".join(parts)
+
+    def get_unreleased_body(self) -> str:
+        """
+        Get `Unreleased` section body.
+        """
+        return self._get_body(random.Random(self.seed - 1), 0)
+
+    def generate(self) -> str:
+        """
+        Generate changelog text.
+        """
+        rnd = random.Random(self.seed)
+        date = datetime.date(2000, 1, 1)
+        records = []
+        for index, version in enumerate(reversed(self.get_versions())):
+            date += datetime.timedelta(days=rnd.randint(1, 30))
+            body = self._get_body(rnd, index)
+            records.append(f"## [{version}] - {date.isoformat()}\n{body}")
+
+        text = "\n\n".join([NEW_CHANGELOG.strip(), self.get_unreleased_body(), *reversed(records)])
+        text = f"{text}\n"
+        if self.crlf:
+            return text.replace("\n", "\r\n")
+
+        return text
+
+
+class RandomChangeLogGenerator(ChangeLogGenerator):
+    """
+    Randomized changelog generator for differential testing.
+
+    Release bodies mix sections with odd headers, `Section: text` prefixes,
+    prefix and postfix text, code fences, indentation and blank or whitespace-only lines.
+    Line endings, indentation and release title formats are picked by `seed`.
+
+    Arguments:
+        releases -- Maximum number of released versions
+        seed -- Random seed
+    """
+
+    HEADERS = (
+        "### Added",
+        "### added",
+        "## Fixed",
+        "#### Changed",
+        "# Removed stuff",
+        "### Security",
+        "### Deprecated",
+        "###Added",
+        "### Notes",
+        "### Unknown section",
+    )
+
+    LINES = (
+        "- {words}",
+        "* {words}",
+        "  - {words}",
+        "\t- {words}",
+        "  {words}",
+        "{words}",
+        "Fixed: {words}",
+        "added:  {words} ",
+        "note: {words}",
+        "- {words} ## [",
+        "",
+        "",
+        "   ",
+        "\t",
+        "　",
+        "- {words}  ",
+        "- {words}\x0c",
+    )
+
+    def __init__(self, releases: int, seed: int = 0) -> None:
+        rnd = random.Random(seed)
+        super().__init__(
+            releases=rnd.randint(0, releases),
+            crlf=rnd.random() < 0.2,
+            seed=seed,
+        )
+        self.indent = rnd.choice(("", "", "", "  ", "\t"))
+
+    def _get_words(self, rnd: random.Random) -> str:
+        return " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(1, 6)))
+
+    def _get_code_block(self, rnd: random.Random) -> List[str]:
+        lines = [rnd.choice(("```", "```python", "  ```"))]
+        for _ in range(rnd.randint(0, 3)):
+            lines.append(rnd.choice(("### Not a section", "fixed: not a prefix", "    code", "")))
+        # some code blocks are not closed
+        if rnd.random() < 0.9:
+            lines.append("```")
+        return lines
+
+    def get_random_body(self, rnd: random.Random) -> str:
+        """
+        Get random release body.
+        """
+        lines: List[str] = []
+        for _ in range(rnd.randint(0, 12)):
+            kind = rnd.random()
+            if kind < 0.2:
+                lines.append(rnd.choice(self.HEADERS))
+            elif kind < 0.27:
+                lines.extend(self._get_code_block(rnd))
+            else:
+                lines.append(rnd.choice(self.LINES).format(words=self._get_words(rnd)))
+        return "\n".join(lines)
+
+    def _get_title(self, rnd: random.Random, version: str, date: datetime.date) -> str:
+        return rnd.choice(
+            (
+                f"## [{version}] - {date.isoformat()}",
+                f"## [{version}] - {date.isoformat()}",
+                f"## [{version}]",
+                f"## [{version}]  -  {date.isoformat()}",
+                f"## [{version}] - {date.isoformat()} ",
+            )
+        )
+
+    def generate(self) -> str:
+        """
+        Generate changelog text.
+        """
+        rnd = random.Random(self.seed)
+        date = datetime.date(2000, 1, 1)
+        records = []
+        for version in reversed(self.get_versions()):
+            date += datetime.timedelta(days=rnd.randint(1, 30))
+            title = self._get_title(rnd, version, date)
+            records.append(f"{title}\n{self.get_random_body(rnd)}")
+
+        new_head = NEW_CHANGELOG.split("## [Unreleased]")[0].strip()
+        head = rnd.choice(("# Changelog", new_head, "", "# Changelog\nNotes ## ["))
+        unreleased = "## [Unreleased]"
+        parts = [head, f"{unreleased}\n{self.get_random_body(rnd)}", *reversed(records)]
+        separator = rnd.choice(("\n\n", "\n", "\n \n"))
+        text = separator.join(parts)
+        if self.indent:
+            text = "\n".join(f"{self.indent}{i}" if i else i for i in text.split("\n"))
+        text = f"{text}\n"
+        if self.crlf:
+            return text.replace("\n", "\r\n")
+
+        return text
@@ -0,0 +1,374 @@
+"""
+Run benchmarks and write results to JSON.
+
+Usage:
+    python -m benchmarks.run --sizes 10,100,1000 --output results.json
+    python -m benchmarks.run --compare base.json --output results.json
+"""
+import abc
+import argparse
+import datetime
+import json
+import math
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Sequence
+
+from newversion import Version
+
+from benchmarks.generator import ChangeLogGenerator
+from logchange.changelog import ChangeLog
+from logchange.cli_parser import parse_args
+from logchange.main import main_api
+from logchange.record import Record
+from logchange.record_body import RecordBody
+
+
+class Case(NamedTuple):
+    """
+    Benchmark input of given size.
+    """
+
+    size: int
+    generator: ChangeLogGenerator
+    text: str
+    path: Path
+
+    @property
+    def lf_text(self) -> str:
+        return self.text.replace("\r\n", "\n")
+
+    @property
+    def middle_version(self) -> Version:
+        versions = self.generator.get_versions()
+        return Version(versions[len(versions) // 2])
+
+
+class Benchmark(abc.ABC):
+    """
+    Base benchmark, `run` is timed, `setup` is not.
+    """
+
+    name = ""
+
+    def setup(self, case: Case) -> Any:
+        return None
+
+    @abc.abstractmethod
+    def run(self, case: Case, state: Any) -> None:
+        """
+        Timed benchmark body.
+        """
+
+
+class ChangeLogParse(Benchmark):
+    name = "ChangeLog.parse"
+
+    def setup(self, case: Case) -> Any:
+        return case.lf_text
+
+    def run(self, case: Case, state: Any) -> None:
+        ChangeLog.parse(state)
+
+
+class ChangeLogGetRecord(Benchmark):
+    name = "ChangeLog.get_record"
+
+    def setup(self, case: Case) -> Any:
+        return ChangeLog.parse(case.lf_text), case.middle_version
+
+    def run(self, case: Case, state: Any) -> None:
+        changelog, version = state
+        changelog.get_record(version)
+
+
+class ChangeLogUpdateRelease(Benchmark):
+    name = "ChangeLog.update_release"
+
+    def setup(self, case: Case) -> Any:
+        record = Record(case.middle_version, "### Fixed\n- Updated", "2021-01-01")
+        return ChangeLog.parse(case.lf_text), record
+
+    def run(self, case: Case, state: Any) -> None:
+        changelog, record = state
+        changelog.update_release(record)
+
+
+class ChangeLogFormatReleased(Benchmark):
+    name = "ChangeLog.format_released"
+
+    def setup(self, case: Case) -> Any:
+        return ChangeLog.parse(case.lf_text)
+
+    def run(self, case: Case, state: Any) -> None:
+        state.format_released()
+
+
+class ChangeLogFormatReleasedParallel(ChangeLogFormatReleased):
+    name = "ChangeLog.format_released workers=4"
+
+    def run(self, case: Case, state: Any) -> None:
+        state.format_released(workers=4)
+
+
+class ChangeLogEditUnreleased(Benchmark):
+    """
+    Parse, add an `Unreleased` entry and render, released records are not parsed.
+    """
+
+    name = "ChangeLog unreleased edit"
+
+    def setup(self, case: Case) -> Any:
+        return case.lf_text
+
+    def run(self, case: Case, state: Any) -> None:
+        changelog = ChangeLog.parse(state)
+        changelog.get_unreleased().append_section("fixed", "- Fixed")
+        changelog.render()
+
+
+class RecordBodyParse(Benchmark):
+    name = "RecordBody.parse"
+
+    def setup(self, case: Case) -> Any:
+        return case.generator.get_body(case.size)
+
+    def run(self, case: Case, state: Any) -> None:
+        RecordBody.parse(state)
+
+
+class RecordBodyGetMerged(Benchmark):
+    name = "RecordBody.get_merged"
+
+    def setup(self, case: Case) -> Any:
+        body = RecordBody.parse(case.generator.get_body(case.size))
+        return body, body.clone()
+
+    def run(self, case: Case, state: Any) -> None:
+        body, other = state
+        body.get_merged(other)
+
+
+class CLICommand(Benchmark):
+    """
+    Run CLI command in-process on a fresh changelog file.
+    """
+
+    args: Sequence[str] = ()
+
+    def setup(self, case: Case) -> Any:
+        case.path.write_bytes(case.text.encode())
+        return parse_args([*self.args, "-p", case.path.as_posix()])
+
+    def run(self, case: Case, state: Any) -> None:
+        main_api(state)
+
+
+class CLIAdded(CLICommand):
+    name = "cli added"
+    args = ("added", "New feature")
+
+
+class CLISetUnreleased(CLICommand):
+    name = "cli set unreleased"
+    args = ("set", "unreleased", "-i", "### Fixed\n- Fixed")
+
+
+class CLIGetLatest(CLICommand):
+    name = "cli get latest"
+    args = ("get", "latest")
+
+
+class CLIList(CLICommand):
+    name = "cli list"
+    args = ("list",)
+
+
+class CLIInitFormat(CLICommand):
+    name = "cli init -f"
+    args = ("init", "-f")
+
+
+BENCHMARKS: List[Benchmark] = [
+    ChangeLogParse(),
+    ChangeLogGetRecord(),
+    ChangeLogUpdateRelease(),
+    ChangeLogFormatReleased(),
+    ChangeLogFormatReleasedParallel(),
+    ChangeLogEditUnreleased(),
+    RecordBodyParse(),
+    RecordBodyGetMerged(),
+    CLIAdded(),
+    CLISetUnreleased(),
+    CLIGetLatest(),
+    CLIList(),
+    CLIInitFormat(),
+]
+
+
+def measure(benchmark: Benchmark, case: Case, repeat: int) -> List[float]:
+    """
+    Run `benchmark` `repeat` times with untimed setup before each run.
+
+    Returns:
+        Run times in seconds.
+    """
+    result = []
+    for _ in range(repeat):
+        state = benchmark.setup(case)
+        start = time.perf_counter()
+        benchmark.run(case, state)
+        result.append(time.perf_counter() - start)
+
+    return result
+
+
+def get_exponent(timings: Dict[str, Dict[str, float]]) -> float:
+    """
+    Estimate complexity exponent from smallest and largest size: 1.0 is linear.
+    """
+    sizes = sorted(int(i) for i in timings)
+    if len(sizes) < 2:
+        return 0.0
+
+    small, large = sizes[0], sizes[-1]
+    small_time = max(timings[str(small)]["median"], 1e-9)
+    large_time = max(timings[str(large)]["median"], 1e-9)
+    return math.log(large_time / small_time) / math.log(large / small)
+
+
+def get_commit() -> str:
+    """
+    Get current git commit if available.
+    """
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+    return output.decode().strip()
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Run all selected benchmarks for all sizes.
+    """
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for size in args.sizes:
+            generator = ChangeLogGenerator(
+                releases=size,
+                entries_per_section=args.entries,
+                code_fences=args.code_fences,
+                crlf=args.crlf,
+                seed=args.seed,
+            )
+            case = Case(size, generator, generator.generate(), Path(temp_dir) / "CHANGELOG.md")
+            for benchmark in BENCHMARKS:
+                if args.filter and args.filter not in benchmark.name:
+                    continue
+                timings = measure(benchmark, case, args.repeat)
+                results.setdefault(benchmark.name, {"sizes": {}})["sizes"][str(size)] = {
+                    "min": min(timings),
+                    "median": statistics.median(timings),
+                    "bytes": len(case.text),
+                }
+                sys.stderr.write(
+                    f"{benchmark.name:<26} {size:>7} {statistics.median(timings) * 1000:>10.3f} ms\n"
+                )
+
+    for data in results.values():
+        data["exponent"] = get_exponent(data["sizes"])
+
+    return {
+        "meta": {
+            "commit": get_commit(),
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": {
+                "sizes": args.sizes,
+                "entries": args.entries,
+                "code_fences": args.code_fences,
+                "crlf": args.crlf,
+                "seed": args.seed,
+                "repeat": args.repeat,
+            },
+        },
+        "results": results,
+    }
+
+
+def compare(base: Dict[str, Any], current: Dict[str, Any]) -> str:
+    """
+    Render comparison of two benchmark results.
+    """
+    lines = [f"{'Benchmark':<26} {'Size':>7} {'Base ms':>10} {'New ms':>10} {'Ratio':>7}"]
+    for name, data in current["results"].items():
+        base_data = base["results"].get(name)
+        if not base_data:
+            continue
+        for size, timing in data["sizes"].items():
+            base_timing = base_data["sizes"].get(size)
+            if not base_timing:
+                continue
+            ratio = timing["median"] / max(base_timing["median"], 1e-9)
+            lines.append(
+                f"{name:<26} {size:>7} {base_timing['median'] * 1000:>10.3f}"
+                f" {timing['median'] * 1000:>10.3f} {ratio:>7.2f}"
+            )
+        lines.append(
+            f"{name:<26} {'exp':>7} {base_data['exponent']:>10.2f} {data['exponent']:>10.2f}"
+        )
+
+    return "\n".join(lines)
+
+
+def parse_args_benchmarks(argv: Sequence[str]) -> argparse.Namespace:
+    """
+    Parse benchmark runner CLI arguments.
+    """
+    parser = argparse.ArgumentParser("benchmarks", description="Run logchange benchmarks")
+    parser.add_argument(
+        "--sizes",
+        type=lambda x: [int(i) for i in x.split(",")],
+        default=[10, 100, 1000],
+        help="Comma-separated numbers of releases. Default: 10,100,1000",
+    )
+    parser.add_argument("--entries", type=int, default=3, help="Entries per section")
+    parser.add_argument(
+        "--code-fences", type=int, default=0, help="Add code block to every N-th release"
+    )
+    parser.add_argument("--crlf", action="store_true", help="Use Windows line endings")
+    parser.add_argument("--seed", type=int, default=0, help="Generator random seed")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per benchmark")
+    parser.add_argument("--filter", default="", help="Run only benchmarks with this substring")
+    parser.add_argument("--output", type=Path, help="Write results to JSON file")
+    parser.add_argument("--compare", type=Path, help="Compare with base results JSON file")
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    """
+    Main entrypoint.
+    """
+    args = parse_args_benchmarks(sys.argv[1:])
+    result = run(args)
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2) + "\n")
+    if args.compare:
+        sys.stdout.write(compare(json.loads(args.compare.read_text()), result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
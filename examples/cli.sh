@@ -41,6 +41,9 @@ logchange init
 # create or reformat CHANGELOG.md
 logchange init -f
 
+# reformat CHANGELOG.md using all CPUs
+logchange init -f -j 0
+
 # get suggested version based on release notes
 logchange version 1.2.3 -i `cat NOTE.md`
 
@@ -74,3 +77,74 @@ logchange list
 
 # format release note and output to stdout
 logchange format -i "`cat NOTE.md`"
+# or stream it from a file or a pipe-in
+logchange format --input-file NOTE.md
+cat NOTE.md | logchange format
+
+# combine package changelogs into one, entries are tagged with package folder name
+logchange aggregate packages/*/CHANGELOG.md
+logchange aggregate packages/* --sort version -o CHANGELOG.md
+
+# show changes between two changelogs or git revisions
+logchange diff <old_path> <new_path>
+logchange diff <revision>:CHANGELOG.md CHANGELOG.md
+logchange diff <old_path> <new_path> --json
+
+# move old releases to CHANGELOG-<major>.x.md shards with CHANGELOG.shards.json manifest
+logchange archive --before <version>
+
+# find releases that mention an issue, PR, JIRA key or commit SHA
+# reference index is cached in ~/.cache/logchange/references.json
+logchange where <number>
+logchange where "#<number>" --json
+logchange where <KEY-123>
+logchange where <sha> --pattern "GH-\d+" --pattern "\b[0-9a-f]{7,40}\b"
+
+# show changelog statistics: entries per section, release cadence,
+# actual version bumps compared with bumps suggested by sections, largest releases
+logchange stats
+logchange stats packages/*/CHANGELOG.md --top 10
+logchange stats packages/*/CHANGELOG.md --json
+
+# compressed changelogs are read and written by extension: .gz, .xz, .bz2
+# a folder with CHANGELOG.md.gz and no CHANGELOG.md uses the compressed one
+logchange get latest -p CHANGELOG.md.gz
+logchange list -p <folder>
+logchange added "<change text>" -p CHANGELOG.md.xz
+
+# read changelog from a wheel, sdist, zip or tar archive without extracting it
+# CHANGELOG/CHANGES/HISTORY/NEWS file is used, or long description from package metadata
+logchange get latest --from-archive dist/package-1.0.0-py3-none-any.whl
+logchange list --from-archive dist/package-1.0.0.tar.gz
+
+# latest changelog version of every archive in a folder, in parallel
+logchange scan-archives wheelhouse
+logchange scan-archives wheelhouse --json -j 8
+
+# watch changelogs: only changed release blocks are re-parsed on every save
+# uses inotify if `inotify_simple` is installed, otherwise polls modification times
+logchange watch
+logchange watch packages/*/CHANGELOG.md --json
+# regenerate derived outputs for a docs build
+logchange watch --json-out docs/changelog.json --notes-out docs/latest.md
+# check formatting once, exit code 1 on issues
+logchange watch --once
+
+# check changelogs: duplicate or unordered versions and dates, invalid dates, empty sections,
+# unknown headers, unclosed code blocks and version bumps that do not match sections
+# exits with code 1 if issues are found
+logchange lint
+logchange lint packages/*/CHANGELOG.md --json -j 8
+logchange lint --disable bump-mismatch --disable empty-section
+logchange lint --list-rules
+
+# write a page per release and an index, only new and changed releases are rewritten
+# install `markdown` to render HTML, otherwise release notes are written as preformatted text
+logchange export --format html --out site/changelog
+logchange export --format json --out site/changelog --title "My package" -j 8
+
+# add Unreleased entries from commit subjects since the last tag
+# `Fixed: text` subjects, section aliases and conventional commits (`feat:`, `fix(scope):`)
+# are classified, entries that are already in Unreleased are skipped
+logchange from-git v1.2.0
+logchange from-git v1.2.0 --until release-branch --dry-run
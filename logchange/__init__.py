@@ -0,0 +1,12 @@
+"""
+Keep-a-changelog manager.
+"""
+import time
+
+# package import start, CLI profiler reports time since it as `startup` phase
+IMPORT_START = time.perf_counter()
+
+from logchange.session import ChangeLogSession  # noqa: E402
+from logchange.session import open_changelog as open  # noqa: E402
+
+__all__ = ("ChangeLogSession", "open")
@@ -0,0 +1,374 @@
+"""
+Combined changelog for many packages.
+"""
+import heapq
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, TextIO
+
+from newversion import Version
+from newversion.utils import print_path
+
+from logchange.constants import (
+    AGGREGATE_SORT_DATE,
+    AGGREGATE_SORT_VERSION,
+    LOGGER_NAME,
+    NEW_CHANGELOG,
+    UNRELEASED,
+)
+from logchange.record import Record
+from logchange.record_body import RecordBody
+from logchange.record_section import RecordSection
+from logchange.section_schema import get_schema, use_schema
+from logchange.session import ChangeLogSession
+from logchange.shards import get_fingerprint
+
+
+class AggregateError(Exception):
+    """
+    Aggregation error.
+    """
+
+
+class PackageRelease(NamedTuple):
+    """
+    Package release with entries tagged by package name.
+
+    Arguments:
+        package -- Package name
+        version -- Release version
+        created -- Release date
+        body -- Release body text
+    """
+
+    package: str
+    version: str
+    created: str
+    body: str
+
+    def render(self) -> str:
+        """
+        Render as a release record, package name is added to the title.
+        """
+        title = f"## [{self.version}]"
+        if self.created:
+            title = f"{title} - {self.created}"
+        title = f"{title} ({self.package})"
+        if not self.body:
+            return title
+
+        return f"{title}\n{self.body}"
+
+
+class PackageChangeLog(NamedTuple):
+    """
+    Package changelog data, kept in aggregate cache.
+
+    Arguments:
+        name -- Package name
+        fingerprint -- Source files `mtime`, `size` and `sha256`
+        unreleased -- Tagged `Unreleased` body text
+        releases -- Releases from newest to oldest
+    """
+
+    name: str
+    fingerprint: Dict[str, Any]
+    unreleased: str
+    releases: List[PackageRelease]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Convert to JSON-serializable dict.
+        """
+        return {
+            "name": self.name,
+            "fingerprint": self.fingerprint,
+            "unreleased": self.unreleased,
+            "releases": [i._asdict() for i in self.releases],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PackageChangeLog":
+        """
+        Create from `as_dict` output.
+        """
+        return cls(
+            name=data["name"],
+            fingerprint=data["fingerprint"],
+            unreleased=data["unreleased"],
+            releases=[PackageRelease(**i) for i in data["releases"]],
+        )
+
+
+def _get_package_fingerprint(path: Path, sha256: bool = False) -> Dict[str, Any]:
+    try:
+        return get_fingerprint(path, sha256=sha256)
+    except OSError as e:
+        source_path = Path(e.filename) if e.filename else path
+        raise AggregateError(
+            f"{print_path(path)}: cannot read {print_path(source_path)}: {e.strerror}"
+        ) from None
+
+
+def tag_body(body: RecordBody, package: str) -> str:
+    """
+    Render body sections with every entry prefixed by `package` name.
+
+    Arguments:
+        body -- Release body.
+        package -- Package name.
+
+    Returns:
+        Rendered body.
+    """
+    tag = f"**{package}**: "
+    sections = []
+    for section in body.sections:
+        entries = []
+        for entry in section.entries:
+            if entry.startswith(RecordSection.ENTRY_MARKERS):
+                entries.append(f"{entry[:2]}{tag}{entry[2:]}")
+            else:
+                entries.append(f"{tag}{entry}")
+        sections.append(RecordSection(section.title, "\n".join(entries)))
+
+    return RecordBody(sections, prefix=body.prefix, postfix=body.postfix).render()
+
+
+def load_package(path: Path, name: str) -> PackageChangeLog:
+    """
+    Parse package changelog and tag its entries, runs in worker processes.
+
+    Arguments:
+        path -- Path to changelog file.
+        name -- Package name.
+    """
+    fingerprint = _get_package_fingerprint(path, sha256=True)
+    with use_schema(get_schema(path.parent)):
+        changelog = ChangeLogSession(path).changelog
+        releases = [
+            PackageRelease(
+                package=name,
+                version=record.version.dumps(),
+                created=record.created,
+                body=tag_body(record.body, name),
+            )
+            for record in changelog.iterate_records()
+        ]
+        return PackageChangeLog(
+            name=name,
+            fingerprint=fingerprint,
+            unreleased=tag_body(changelog.get_unreleased().body, name),
+            releases=releases,
+        )
+
+
+class AggregateCache:
+    """
+    Parsed package changelogs cache, keyed by path.
+
+    Entry is valid when source files `mtime` and `size` are the same,
+    or when content `sha256` is the same.
+
+    Arguments:
+        path -- Path to JSON cache file
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.packages: Dict[str, PackageChangeLog] = {}
+        self._logger = logging.getLogger(LOGGER_NAME)
+
+    def load(self) -> None:
+        """
+        Read cache file, invalid cache is ignored.
+        """
+        if not self.path.exists():
+            return
+
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") != self.VERSION:
+                return
+            self.packages = {
+                key: PackageChangeLog.from_dict(value) for key, value in data["packages"].items()
+            }
+        except (ValueError, KeyError, TypeError):
+            self._logger.warning(f"{print_path(self.path)} is invalid, ignoring")
+
+    def save(self) -> None:
+        """
+        Write cache file, write errors are logged and ignored.
+        """
+        data = {
+            "version": self.VERSION,
+            "packages": {key: value.as_dict() for key, value in self.packages.items()},
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(data), encoding="utf-8")
+        except OSError as e:
+            self._logger.warning(f"Cannot write {print_path(self.path)}: {e.strerror}")
+
+    @staticmethod
+    def get_key(path: Path) -> str:
+        """
+        Get cache key for changelog path, cache is shared by all working folders.
+        """
+        return path.resolve().as_posix()
+
+    def get(self, path: Path, name: str) -> Optional[PackageChangeLog]:
+        """
+        Get valid cached package changelog.
+
+        Arguments:
+            path -- Path to changelog file.
+            name -- Package name.
+        """
+        package = self.packages.get(self.get_key(path))
+        if package is None or package.name != name:
+            return None
+
+        fingerprint = _get_package_fingerprint(path)
+        if fingerprint["files"] == package.fingerprint["files"]:
+            return package
+
+        fingerprint = _get_package_fingerprint(path, sha256=True)
+        if fingerprint["sha256"] != package.fingerprint["sha256"]:
+            return None
+
+        package = package._replace(fingerprint=fingerprint)
+        self.packages[self.get_key(path)] = package
+        return package
+
+
+class ChangeLogAggregator:
+    """
+    Combined changelog for many packages.
+
+    Package changelogs are parsed in a process pool, releases are combined with
+    a k-way merge that keeps release order of every package.
+
+    Arguments:
+        paths -- Paths to package changelogs, package name is a parent directory name.
+        cache -- Parsed changelogs cache.
+        workers -- Number of worker processes.
+    """
+
+    SORT_DATE = AGGREGATE_SORT_DATE
+    SORT_VERSION = AGGREGATE_SORT_VERSION
+    SORT_KEYS = (SORT_DATE, SORT_VERSION)
+
+    def __init__(
+        self, paths: Iterable[Path], cache: Optional[AggregateCache] = None, workers: int = 1
+    ) -> None:
+        self.paths = list(paths)
+        self.cache = cache
+        self.workers = workers
+        self._logger = logging.getLogger(LOGGER_NAME)
+
+    @staticmethod
+    def get_package_name(path: Path) -> str:
+        """
+        Get package name from changelog path.
+        """
+        return path.resolve(strict=False).parent.name
+
+    def load(self) -> List[PackageChangeLog]:
+        """
+        Parse package changelogs, cached ones are not re-read.
+
+        Returns:
+            Package changelogs in `paths` order.
+        """
+        for path in self.paths:
+            if not path.exists():
+                raise AggregateError(f"{print_path(path)} does not exist")
+
+        if self.cache:
+            self.cache.load()
+
+        result: Dict[Path, PackageChangeLog] = {}
+        changed_paths = []
+        for path in self.paths:
+            name = self.get_package_name(path)
+            package = self.cache.get(path, name) if self.cache else None
+            if package is None:
+                changed_paths.append(path)
+                continue
+            result[path] = package
+
+        names = [self.get_package_name(i) for i in changed_paths]
+        if self.workers > 1 and len(changed_paths) > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                packages = list(pool.map(load_package, changed_paths, names))
+        else:
+            packages = [load_package(path, name) for path, name in zip(changed_paths, names)]
+
+        self._logger.debug(
+            f"{len(changed_paths)} changelogs parsed, {len(result)} loaded from cache"
+        )
+        for path, package in zip(changed_paths, packages):
+            result[path] = package
+
+        if self.cache:
+            for path, package in result.items():
+                self.cache.packages[self.cache.get_key(path)] = package
+            self.cache.save()
+
+        return [result[i] for i in self.paths]
+
+    @classmethod
+    def _get_sort_key(cls, sort_by: str) -> Callable[[PackageRelease], Any]:
+        if sort_by == cls.SORT_DATE:
+            return lambda x: x.created
+        if sort_by == cls.SORT_VERSION:
+            return lambda x: Version(x.version)
+
+        raise AggregateError(f"Unknown sort key: {sort_by}")
+
+    def iterate_releases(
+        self, packages: Iterable[PackageChangeLog], sort_by: str = SORT_DATE
+    ) -> Iterator[PackageRelease]:
+        """
+        Iterate over releases of all packages from newest to oldest.
+
+        Every package releases are expected to be sorted already,
+        so releases are merged lazily.
+
+        Arguments:
+            packages -- Package changelogs.
+            sort_by -- `date` or `version`.
+
+        Yields:
+            Package release.
+        """
+        key = self._get_sort_key(sort_by)
+        yield from heapq.merge(*(i.releases for i in packages), key=key, reverse=True)
+
+    @staticmethod
+    def _get_unreleased(packages: Iterable[PackageChangeLog]) -> Record:
+        body = RecordBody()
+        for package in packages:
+            body = body.get_merged(RecordBody.parse(package.unreleased))
+        record = Record(Version.zero(), "", "")
+        record.body = body
+        return record
+
+    def write(self, output: TextIO, sort_by: str = SORT_DATE) -> None:
+        """
+        Write combined changelog to `output`.
+
+        Arguments:
+            output -- Text stream.
+            sort_by -- `date` or `version`.
+        """
+        packages = self.load()
+        head = NEW_CHANGELOG.split(f"## [{UNRELEASED.capitalize()}]", 1)[0].strip()
+        output.write(f"{head}\n\n{self._get_unreleased(packages).render()}\n")
+        for release in self.iterate_releases(packages, sort_by):
+            output.write(f"\n{release.render()}\n")
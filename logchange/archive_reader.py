@@ -0,0 +1,265 @@
+"""
+Changelog reader for wheels, sdists and zip/tar archives.
+"""
+import os
+import tarfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from email.parser import HeaderParser
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from newversion.utils import print_path
+
+from logchange.changelog import ChangeLog
+
+
+class ArchiveReaderError(Exception):
+    """
+    Archive reading error.
+    """
+
+
+class ArchiveMember(NamedTuple):
+    """
+    Changelog found in archive.
+
+    Arguments:
+        name -- Member name in archive
+        text -- Changelog text with `\\n` line endings
+    """
+
+    name: str
+    text: str
+
+
+class ScanResult(NamedTuple):
+    """
+    Archive scan result.
+
+    Arguments:
+        archive -- Archive path
+        member -- Changelog member name, empty if not found
+        versions -- Release versions from newest to oldest
+        error -- Error message, empty on success
+    """
+
+    archive: str
+    member: str
+    versions: List[str]
+    error: str
+
+    def render(self) -> str:
+        """
+        Render as `archive member latest` line.
+        """
+        if self.error:
+            return f"{self.archive} error: {self.error}"
+        if not self.member:
+            return f"{self.archive} no changelog"
+
+        latest = self.versions[0] if self.versions else "no releases"
+        return f"{self.archive} {self.member} {latest}"
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Convert to JSON-serializable dict.
+        """
+        return self._asdict()
+
+
+class ArchiveReader:
+    """
+    Changelog reader for wheels, sdists and zip/tar archives.
+
+    Changelog member is picked by name, and only this member is read into memory,
+    archive is never extracted to disk. If there is no changelog file,
+    long description from `*.dist-info/METADATA` or `PKG-INFO` is used.
+
+    Arguments:
+        path -- Path to archive
+    """
+
+    ENCODING = "utf-8"
+
+    ZIP_SUFFIXES = (".whl", ".zip", ".egg")
+    TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+    # Changelog file names in preference order, compared case-insensitively
+    CHANGELOG_NAMES = ("changelog", "changes", "history", "news", "releases")
+    CHANGELOG_SUFFIXES = (".md", ".markdown", ".txt", "")
+
+    METADATA_NAMES = ("METADATA", "PKG-INFO")
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    @classmethod
+    def is_archive(cls, path: Path) -> bool:
+        """
+        Whether `path` looks like a supported archive by its name.
+        """
+        return path.name.lower().endswith((*cls.ZIP_SUFFIXES, *cls.TAR_SUFFIXES))
+
+    @classmethod
+    def _get_changelog_rank(cls, name: str) -> Optional[Tuple[int, int, int]]:
+        path = PurePosixPath(name)
+        stem, suffix = os.path.splitext(path.name.lower())
+        if stem not in cls.CHANGELOG_NAMES or suffix not in cls.CHANGELOG_SUFFIXES:
+            return None
+
+        return (
+            len(path.parts),
+            cls.CHANGELOG_NAMES.index(stem),
+            cls.CHANGELOG_SUFFIXES.index(suffix),
+        )
+
+    @classmethod
+    def _is_metadata(cls, name: str) -> bool:
+        path = PurePosixPath(name)
+        if path.name not in cls.METADATA_NAMES or len(path.parts) > 2:
+            return False
+
+        # `METADATA` is valid only in `.dist-info`, `PKG-INFO` is in sdist root
+        return path.name == "PKG-INFO" or path.parent.name.endswith(".dist-info")
+
+    @classmethod
+    def find_member(cls, names: Iterable[str]) -> str:
+        """
+        Pick changelog member name.
+
+        Arguments:
+            names -- Archive file member names.
+
+        Returns:
+            Best changelog file, metadata file or an empty string.
+        """
+        best_name = ""
+        best_rank: Optional[Tuple[int, int, int]] = None
+        metadata_name = ""
+        for name in names:
+            rank = cls._get_changelog_rank(name)
+            if rank is not None and (best_rank is None or rank < best_rank):
+                best_name, best_rank = name, rank
+            if not metadata_name and cls._is_metadata(name):
+                metadata_name = name
+
+        return best_name or metadata_name
+
+    def _read_zip(self) -> Optional[Tuple[str, bytes]]:
+        with zipfile.ZipFile(self.path) as archive:
+            names = [i.filename for i in archive.infolist() if not i.is_dir()]
+            name = self.find_member(names)
+            if not name:
+                return None
+            with archive.open(name) as member:
+                return name, member.read()
+
+    def _read_tar(self) -> Optional[Tuple[str, bytes]]:
+        with tarfile.open(self.path, "r:*") as archive:
+            members = {i.name: i for i in archive.getmembers() if i.isfile()}
+            name = self.find_member(members)
+            if not name:
+                return None
+            member = archive.extractfile(members[name])
+            if member is None:
+                return None
+            with member:
+                return name, member.read()
+
+    @classmethod
+    def _get_description(cls, text: str) -> str:
+        message = HeaderParser().parsestr(text)
+        payload = message.get_payload()
+        if isinstance(payload, str) and payload.strip():
+            return payload
+
+        return message.get("Description", "")
+
+    def read(self) -> Optional[ArchiveMember]:
+        """
+        Read changelog member.
+
+        Returns:
+            Changelog member or None if archive has no changelog.
+        """
+        if not self.path.exists():
+            raise ArchiveReaderError(f"{print_path(self.path)} does not exist")
+
+        try:
+            if self.path.name.lower().endswith(self.ZIP_SUFFIXES):
+                result = self._read_zip()
+            else:
+                result = self._read_tar()
+        except (OSError, zipfile.BadZipFile, tarfile.TarError) as e:
+            raise ArchiveReaderError(f"Cannot read {print_path(self.path)}: {e}") from None
+
+        if result is None:
+            return None
+
+        name, data = result
+        text = data.decode(self.ENCODING, errors="replace").replace("\r\n", "\n")
+        if PurePosixPath(name).name in self.METADATA_NAMES:
+            text = self._get_description(text)
+        return ArchiveMember(name, text)
+
+    def read_changelog(self) -> ChangeLog:
+        """
+        Read and parse changelog member.
+        """
+        member = self.read()
+        if member is None:
+            raise ArchiveReaderError(f"No changelog found in {print_path(self.path)}")
+
+        return ChangeLog.parse(member.text)
+
+
+def find_archives(path: Path) -> Iterator[Path]:
+    """
+    Find supported archives in `path` recursively, sorted by path.
+    """
+    for archive_path in sorted(path.rglob("*")):
+        if archive_path.is_file() and ArchiveReader.is_archive(archive_path):
+            yield archive_path
+
+
+def scan_archive(path: Path) -> ScanResult:
+    """
+    Read release versions from archive changelog, runs in worker processes.
+
+    Arguments:
+        path -- Path to archive.
+    """
+    archive = print_path(path)
+    try:
+        member = ArchiveReader(path).read()
+        if member is None:
+            return ScanResult(archive, "", [], "")
+        versions = [i.version.dumps() for i in ChangeLog.parse(member.text).iterate_records()]
+    except (ArchiveReaderError, ValueError) as e:
+        return ScanResult(archive, "", [], str(e))
+
+    return ScanResult(archive, member.name, versions, "")
+
+
+def scan_archives(paths: Iterable[Path], workers: int = 1) -> Iterator[ScanResult]:
+    """
+    Scan many archives in a process pool.
+
+    Arguments:
+        paths -- Paths to archives.
+        workers -- Number of worker processes.
+
+    Yields:
+        Scan results in `paths` order.
+    """
+    paths = list(paths)
+    if workers <= 1 or len(paths) < 2:
+        for path in paths:
+            yield scan_archive(path)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # several archives per task to amortize inter-process overhead
+        chunksize = max(1, len(paths) // (workers * 4))
+        yield from pool.map(scan_archive, paths, chunksize=chunksize)
@@ -0,0 +1,252 @@
+"""
+Asyncio API that runs file I/O, parsing and rendering off the event loop.
+"""
+import argparse
+import asyncio
+import functools
+import weakref
+from concurrent.futures import Executor as PoolExecutor
+from pathlib import Path
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from newversion import Version
+
+from logchange.constants import SECTION_ALL
+from logchange.executor import Executor
+from logchange.path_locks import PATH_LOCKS
+from logchange.record import Record
+from logchange.session import ChangeLogSession
+
+_R = TypeVar("_R", bound="AsyncChangeLog")
+_T = TypeVar("_T")
+
+# Default number of changelogs processed at the same time by `map_changelogs`
+DEFAULT_CONCURRENCY = 32
+
+
+class AsyncPathLocks:
+    """
+    Registry of `asyncio.Lock`, one per resolved file path and event loop.
+
+    Locks are kept only while they are in use.
+    """
+
+    def __init__(self) -> None:
+        self._locks: "weakref.WeakValueDictionary[Any, asyncio.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
+
+    def get(self, path: Path) -> asyncio.Lock:
+        """
+        Get async lock for `path` in the current event loop.
+        """
+        key = (id(asyncio.get_event_loop()), path.resolve(strict=False).as_posix())
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[key] = lock
+
+        return lock
+
+
+ASYNC_PATH_LOCKS = AsyncPathLocks()
+
+
+class AsyncChangeLog:
+    """
+    Asyncio wrapper for `ChangeLogSession`.
+
+    Every call runs in `pool` executor, so event loop is never blocked
+    by file I/O or parsing. Used as an async context manager, holds a per-path
+    async lock and saves changelog once on exit if it was changed.
+
+    Arguments:
+        session -- Changelog session.
+        pool -- Executor for blocking calls, default loop executor if not set.
+
+    Examples::
+
+        async with await AsyncChangeLog.open("CHANGELOG.md") as changelog:
+            await changelog.add("unreleased", "New feature", section="added")
+    """
+
+    def __init__(self, session: ChangeLogSession, pool: Optional[PoolExecutor] = None) -> None:
+        self.session = session
+        self._pool = pool
+        self._lock = ASYNC_PATH_LOCKS.get(session.path)
+        self._thread_lock = PATH_LOCKS.get(session.path)
+
+    @property
+    def path(self) -> Path:
+        """
+        Path to changelog file.
+        """
+        return self.session.path
+
+    @classmethod
+    async def open(
+        cls: Type[_R], path: Union[str, Path], pool: Optional[PoolExecutor] = None
+    ) -> _R:
+        """
+        Open changelog.
+
+        Changelog is read and parsed in executor on first call, so used as a context manager
+        it is read only after per-path lock is acquired.
+
+        Arguments:
+            path -- Path to changelog file.
+            pool -- Executor for blocking calls, default loop executor if not set.
+        """
+        return cls(ChangeLogSession(Path(path)), pool)
+
+    async def __aenter__(self: _R) -> _R:
+        await self._lock.acquire()
+        return self
+
+    async def __aexit__(self, exc_type: Optional[Type[BaseException]], *_: Any) -> None:
+        try:
+            if exc_type is None:
+                await self.save()
+        finally:
+            self._lock.release()
+
+    def _call_locked(self, func: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+        with self._thread_lock:
+            return func(*args, **kwargs)
+
+    def _run(self, func: Callable[..., _T], *args: Any, **kwargs: Any) -> Awaitable[_T]:
+        loop = asyncio.get_event_loop()
+        call = functools.partial(self._call_locked, func, *args, **kwargs)
+        return loop.run_in_executor(self._pool, call)
+
+    async def get(self, name: str) -> Optional[Record]:
+        """
+        Get release record.
+
+        Arguments:
+            name -- Release version, `latest` or `unreleased`.
+        """
+        return await self._run(self.session.get, name)
+
+    async def add(
+        self, name: str, text: str, section: str = SECTION_ALL, created: str = ""
+    ) -> Record:
+        """
+        Add notes to a release record.
+
+        Arguments:
+            name -- Release version, `latest` or `unreleased`.
+            text -- Release notes.
+            section -- Section name or `all` to parse sections from `text`.
+            created -- New release date.
+        """
+        return await self._run(self.session.add, name, text, section=section, created=created)
+
+    async def set(
+        self, name: str, text: str, section: str = SECTION_ALL, created: str = ""
+    ) -> Record:
+        """
+        Replace notes of a release record.
+
+        Arguments:
+            name -- Release version, `latest` or `unreleased`.
+            text -- Release notes.
+            section -- Section name or `all` to replace the whole body.
+            created -- New release date.
+        """
+        return await self._run(self.session.set, name, text, section=section, created=created)
+
+    async def release(self, version: Union[str, Version], created: str = "") -> Record:
+        """
+        Move `Unreleased` notes to release `version`.
+
+        Arguments:
+            version -- Release version.
+            created -- Release date.
+        """
+        return await self._run(self.session.release, version, created=created)
+
+    async def render(self) -> str:
+        """
+        Render changelog.
+        """
+        return await self._run(lambda: self.session.changelog.render())
+
+    async def save(self) -> bool:
+        """
+        Write changelog if it was changed.
+
+        Returns:
+            True if changelog was written.
+        """
+        return await self._run(self.session.save)
+
+
+async def execute(config: argparse.Namespace, pool: Optional[PoolExecutor] = None) -> str:
+    """
+    Execute CLI command in executor.
+
+    Arguments:
+        config -- CLI namespace.
+        pool -- Executor for blocking calls, default loop executor if not set.
+
+    Returns:
+        Command output.
+    """
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(pool, Executor(config).execute)
+
+
+async def map_changelogs(
+    paths: Iterable[Union[str, Path]],
+    handler: Callable[[AsyncChangeLog], Awaitable[_T]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    pool: Optional[PoolExecutor] = None,
+) -> List[_T]:
+    """
+    Open every changelog in `paths` and await `handler` for it with bounded concurrency.
+
+    Only `concurrency` changelogs are open at the same time, and `paths` are consumed
+    lazily, so it is safe to pass thousands of paths. Every changelog is saved
+    after `handler` if it was changed.
+
+    Arguments:
+        paths -- Paths to changelog files.
+        handler -- Coroutine function that gets an opened changelog.
+        concurrency -- Maximum number of changelogs processed at the same time.
+        pool -- Executor for blocking calls, default loop executor if not set.
+
+    Returns:
+        Handler results in `paths` order.
+
+    Examples::
+
+        async def add_note(changelog):
+            await changelog.add("unreleased", "Bump dependencies", section="changed")
+
+        await map_changelogs(paths, add_note, concurrency=16)
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency should be positive")
+
+    results: List[Any] = []
+    path_iterator = iter(enumerate(paths))
+
+    async def worker() -> None:
+        for index, path in path_iterator:
+            results.extend([None] * (index + 1 - len(results)))
+            async with await AsyncChangeLog.open(path, pool) as changelog:
+                results[index] = await handler(changelog)
+
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return results
@@ -1,16 +1,36 @@
 """
 Wrapper for full `CHANGELOG.md` content.
 """
-from typing import Iterator, List, Optional, Type, TypeVar
+import itertools
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Sequence, Type, TypeVar
 
 from newversion import Version
 
 from logchange.record import Record
+from logchange.reference_index import ReferenceIndex
+from logchange.section_schema import SectionSchema, get_schema, use_schema
 from logchange.utils import dedent
 
+if TYPE_CHECKING:
+    from logchange.shards import ChangeLogShard
+
 _R = TypeVar("_R", bound="ChangeLog")
 
 
+class ChangeLogStreamError(Exception):
+    """
+    Changelog layout can not be read line by line, full parse is needed.
+    """
+
+
+def _format_record_texts(record_texts: List[str], schema: SectionSchema) -> List[str]:
+    """
+    Parse and render release records, runs in worker processes.
+    """
+    with use_schema(schema):
+        return [Record.parse(i).render() for i in record_texts]
+
+
 class ChangeLog:
     """
     Wrapper for full `CHANGELOG.md` content.
@@ -29,16 +49,23 @@ class ChangeLog:
     # Unreleased section title in CHANGELOG.md
     UNRELEASED_MARKER = "## [Unreleased]"
 
+    # Minimal number of release records formatted by a worker process at once
+    FORMAT_CHUNK_SIZE = 64
+
     def __init__(self, head: str, released: str, unreleased: str) -> None:
         self.head: str = head
         self._released = released.strip()
         self._released_records: List[Record] = []
         self._unreleased = Record(Version.zero(), created="", text=unreleased)
+        self.shards: List["ChangeLogShard"] = []
 
     @property
     def released(self) -> List[Record]:
+        """
+        Release records from the changelog itself, without archived shards.
+        """
         if not self._released_records:
-            self._released_records = list(self.iterate_records())
+            self._released_records = list(self._iterate_own_records())
 
         return self._released_records
 
@@ -54,22 +81,91 @@ class ChangeLog:
         released = ""
         unreleased = ""
 
-        if cls.UNRELEASED_MARKER in head:
-            head, unreleased = head.split(cls.UNRELEASED_MARKER, 1)
-            if cls.RELEASED_MARKER in unreleased:
-                unreleased, rest = unreleased.split(cls.RELEASED_MARKER, 1)
-                released = f"{cls.RELEASED_MARKER}{rest}"
-
-        if cls.RELEASED_MARKER in head:
-            head, rest = head.split(cls.RELEASED_MARKER, 1)
-            released = f"{cls.RELEASED_MARKER}{rest}"
-
+        # released part is sliced as it is and parsed only on demand
+        unreleased_index = head.find(cls.UNRELEASED_MARKER)
+        if unreleased_index != -1:
+            unreleased_start = unreleased_index + len(cls.UNRELEASED_MARKER)
+            released_index = head.find(cls.RELEASED_MARKER, unreleased_start)
+            if released_index == -1:
+                unreleased = head[unreleased_start:]
+            else:
+                unreleased = head[unreleased_start:released_index]
+                released = head[released_index:]
+            head = head[:unreleased_index]
+
+        released_index = head.find(cls.RELEASED_MARKER)
+        if released_index != -1:
+            released = head[released_index:]
+            head = head[:released_index]
+
+        # released part starts with a not indented marker and is a slice of
+        # dedented text, so dedenting it again would not change it
         return cls(
             head=dedent(head),
             unreleased=dedent(unreleased),
-            released=dedent(released),
+            released=released,
         )
 
+    @classmethod
+    def iterate_stream_record_texts(cls, lines: Iterable[str]) -> Iterator[str]:
+        """
+        Iterate over raw release record texts of changelog `lines`, read only as far as needed.
+
+        `Record.parse` gives the same records as for `parse` + `iterate_record_texts`.
+        It is possible only if the first non-empty line is not indented,
+        so `dedent` margin is empty and lines can be used as they are,
+        and `Unreleased` goes before releases.
+
+        Arguments:
+            lines -- Changelog lines without line breaks.
+
+        Yields:
+            Release record text.
+
+        Raises:
+            ChangeLogStreamError -- Before any record if changelog needs a full parse.
+        """
+        is_started = False
+        is_unreleased_found = False
+        # None while in head or `Unreleased`
+        record_lines: Optional[List[str]] = None
+        for line in lines:
+            if not is_started:
+                if not line.strip():
+                    continue
+                if line[0].isspace():
+                    raise ChangeLogStreamError("Changelog is indented")
+                is_started = True
+
+            if not is_unreleased_found:
+                released_index = line.find(cls.RELEASED_MARKER)
+                if released_index == -1:
+                    continue
+                if released_index != line.find(cls.UNRELEASED_MARKER):
+                    raise ChangeLogStreamError("Releases go before Unreleased")
+                is_unreleased_found = True
+                line = line[released_index + len(cls.UNRELEASED_MARKER) :]
+
+            # markers are found anywhere in the line, like `parse` does
+            index = line.find(cls.RELEASED_MARKER)
+            while index != -1:
+                if record_lines is not None:
+                    record_lines.append(line[:index])
+                    record_text = "\n".join(record_lines)
+                    if record_text[len(cls.RELEASED_MARKER) :].strip():
+                        yield record_text
+                record_lines = []
+                line = line[index:]
+                index = line.find(cls.RELEASED_MARKER, len(cls.RELEASED_MARKER))
+
+            if record_lines is not None:
+                record_lines.append(line)
+
+        if record_lines is not None:
+            record_text = "\n".join(record_lines).strip()
+            if record_text[len(cls.RELEASED_MARKER) :].strip():
+                yield record_text
+
     def _render_released(self) -> str:
         return self._released
 
@@ -79,7 +175,7 @@ class ChangeLog:
         """
         parts = [self.head]
         parts.append(self._unreleased.render())
-        if self.released:
+        if self._released:
             parts.append(self._render_released())
 
         return self.PARTS_DELIM.join(parts).strip() + "\n"
@@ -115,34 +211,163 @@ class ChangeLog:
         Returns:
             Release record or None.
         """
-        for record in self.iterate_records():
+        for record in self._iterate_own_records():
             if record.version == version:
                 return record
 
+        for shard in self.shards:
+            if shard.contains(version):
+                return shard.changelog.get_record(version)
+
         return None
 
+    def iterate_record_texts(self) -> Iterator[str]:
+        """
+        Iterate over raw release record texts from newest to oldest.
+
+        Yields:
+            Release record text.
+        """
+        for record_text in self._released.split(self.RELEASED_MARKER):
+            if not record_text.strip():
+                continue
+            yield f"{self.RELEASED_MARKER}{record_text}"
+
+    def _iterate_own_records(self) -> Iterator[Record]:
+        for record_text in self.iterate_record_texts():
+            yield Record.parse(record_text)
+
     def iterate_records(self) -> Iterator[Record]:
         """
         Iterate over release records from newest to oldest.
 
+        Archived shards are opened only when iteration reaches them.
+
         Yields:
             Release record.
         """
-        for record_text in self._released.split(self.RELEASED_MARKER):
-            if not record_text.strip():
+        yield from self._iterate_own_records()
+        for shard in self.shards:
+            yield from shard.changelog.iterate_records()
+
+    def get_reference_index(
+        self, patterns: Sequence[str] = ReferenceIndex.DEFAULT_PATTERNS
+    ) -> ReferenceIndex:
+        """
+        Build reference index for `Unreleased` and all release records, including archived.
+
+        Arguments:
+            patterns -- Reference regular expressions.
+
+        Returns:
+            Reference index.
+        """
+        return ReferenceIndex.build(
+            itertools.chain([self._unreleased], self.iterate_records()), patterns
+        )
+
+    def iterate_range(self, oldest: Version, newest: Version) -> Iterator[Record]:
+        """
+        Iterate over release records between `oldest` and `newest` inclusive.
+
+        Archived shards out of range are not opened.
+
+        Arguments:
+            oldest -- Minimal release version.
+            newest -- Maximal release version.
+
+        Yields:
+            Release record.
+        """
+        for record in self._iterate_own_records():
+            if oldest <= record.version <= newest:
+                yield record
+
+        for shard in self.shards:
+            if not shard.overlaps(oldest, newest):
+                continue
+            for record in shard.changelog.iterate_records():
+                if oldest <= record.version <= newest:
+                    yield record
+
+    def extract_releases(self, before: Version) -> List[Record]:
+        """
+        Remove release records older than `before`.
+
+        Kept records text is left as it is.
+
+        Arguments:
+            before -- Version to compare with.
+
+        Returns:
+            Removed release records from newest to oldest.
+        """
+        result: List[Record] = []
+        kept_texts: List[str] = []
+        for record_text in self.iterate_record_texts():
+            record = Record.parse(record_text)
+            if record.version < before:
+                result.append(record)
                 continue
-            record = Record.parse(f"{self.RELEASED_MARKER}{record_text}")
-            yield record
+            kept_texts.append(record_text)
+
+        if result:
+            self._released = "".join(kept_texts).strip()
+            self._released_records = []
+
+        return result
+
+    def set_record_texts(self, record_texts: Iterable[str]) -> None:
+        """
+        Replace release records with raw record texts, texts are kept as they are.
+
+        Arguments:
+            record_texts -- Release record texts from newest to oldest.
+        """
+        parts = []
+        for record_text in record_texts:
+            if not record_text.endswith(self.PARTS_DELIM):
+                record_text = f"{record_text.rstrip()}{self.PARTS_DELIM}"
+            parts.append(record_text)
+
+        self._released = "".join(parts).strip()
+        self._released_records = []
 
-    def format_released(self) -> None:
+    def format_released(self, workers: int = 1) -> None:
         """
         Format all released records.
+
+        Arguments:
+            workers -- Number of worker processes, records are formatted in chunks.
         """
+        # parsed records can be edited, so they are rendered as they are instead of raw text
+        if workers <= 1 or self._released_records:
+            record_rendered = []
+            for record in self.released:
+                record_rendered.append(record.render())
+
+            self._released = "\n\n".join(record_rendered)
+            return
+
+        record_texts = list(self.iterate_record_texts())
+        if len(record_texts) < self.FORMAT_CHUNK_SIZE * 2:
+            self.format_released()
+            return
+
+        # multiprocessing is slow to import and only needed here
+        from concurrent.futures import ProcessPoolExecutor
+
+        # several chunks per worker to even out uneven record sizes
+        chunk_size = max(self.FORMAT_CHUNK_SIZE, len(record_texts) // (workers * 4) + 1)
+        chunks = [record_texts[i : i + chunk_size] for i in range(0, len(record_texts), chunk_size)]
         record_rendered = []
-        for record in self.released:
-            record_rendered.append(record.render())
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            schemas = [get_schema()] * len(chunks)
+            for chunk_rendered in pool.map(_format_record_texts, chunks, schemas):
+                record_rendered.extend(chunk_rendered)
 
         self._released = "\n\n".join(record_rendered)
+        self._released_records = []
 
     def add_release(self, record: Record) -> None:
         """
@@ -175,4 +400,9 @@ class ChangeLog:
                 self.format_released()
                 return
 
+        for shard in self.shards:
+            if shard.contains(record.version):
+                shard.update_release(record)
+                return
+
         self.add_release(record)
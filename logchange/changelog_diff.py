@@ -0,0 +1,244 @@
+"""
+Structural diff between two changelogs.
+"""
+import difflib
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+from logchange.changelog import ChangeLog
+from logchange.record import Record
+from logchange.section_schema import get_schema
+
+
+class EntryChange(NamedTuple):
+    """
+    Single entry change.
+
+    Arguments:
+        kind -- `added`, `removed` or `changed`
+        old -- Old entry text
+        new -- New entry text
+    """
+
+    kind: str
+    old: str
+    new: str
+
+    ADDED = "added"
+    REMOVED = "removed"
+    CHANGED = "changed"
+
+    @property
+    def text(self) -> str:
+        """
+        Most recent entry text.
+        """
+        return self.old if self.kind == self.REMOVED else self.new
+
+    def render(self) -> str:
+        """
+        Render as diff line.
+        """
+        marker = {self.ADDED: "+", self.REMOVED: "-", self.CHANGED: "~"}[self.kind]
+        return f"{marker} {self.text}"
+
+
+class SectionDiff(NamedTuple):
+    """
+    Changes in one section of a release.
+
+    Arguments:
+        title -- Section title
+        changes -- Entry changes
+    """
+
+    title: str
+    changes: List[EntryChange]
+
+    def render(self) -> str:
+        """
+        Render as text.
+        """
+        lines = [f"### {self.title.capitalize()}"]
+        lines.extend(i.render() for i in self.changes)
+        return "\n".join(lines)
+
+
+class RecordDiff(NamedTuple):
+    """
+    Changes in one release.
+
+    Arguments:
+        name -- Release name
+        kind -- `added`, `removed` or `changed`
+        old_created -- Old release date
+        new_created -- New release date
+        sections -- Section changes
+    """
+
+    name: str
+    kind: str
+    old_created: str
+    new_created: str
+    sections: List[SectionDiff]
+
+    def render(self) -> str:
+        """
+        Render as text.
+        """
+        parts = [f"## {self.name} {self.kind}"]
+        if self.old_created != self.new_created and self.kind == EntryChange.CHANGED:
+            parts.append(f"Date: {self.old_created or '-'} -> {self.new_created or '-'}")
+        parts.extend(i.render() for i in self.sections)
+        return "\n".join(parts)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Convert to JSON-serializable dict.
+        """
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "old_created": self.old_created,
+            "new_created": self.new_created,
+            "sections": {
+                section.title: [change._asdict() for change in section.changes]
+                for section in self.sections
+            },
+        }
+
+
+class ChangeLogDiff:
+    """
+    Structural diff between two changelogs.
+
+    Releases are matched by raw text first, so unchanged releases are skipped
+    without parsing their bodies.
+
+    Arguments:
+        old -- Old changelog
+        new -- New changelog
+    """
+
+    # Pseudo-section for release text outside of Keep a Changelog sections
+    NOTES_TITLE = "notes"
+
+    def __init__(self, old: ChangeLog, new: ChangeLog) -> None:
+        self.old = old
+        self.new = new
+
+    @staticmethod
+    def _get_entry_changes(old_entries: List[str], new_entries: List[str]) -> List[EntryChange]:
+        if old_entries == new_entries:
+            return []
+
+        result: List[EntryChange] = []
+        matcher = difflib.SequenceMatcher(None, old_entries, new_entries, autojunk=False)
+        for tag, old_start, old_end, new_start, new_end in matcher.get_opcodes():
+            if tag == "equal":
+                continue
+            old_chunk = old_entries[old_start:old_end]
+            new_chunk = new_entries[new_start:new_end]
+            for old_entry, new_entry in zip(old_chunk, new_chunk):
+                result.append(EntryChange(EntryChange.CHANGED, old_entry, new_entry))
+            for old_entry in old_chunk[len(new_chunk) :]:
+                result.append(EntryChange(EntryChange.REMOVED, old_entry, ""))
+            for new_entry in new_chunk[len(old_chunk) :]:
+                result.append(EntryChange(EntryChange.ADDED, "", new_entry))
+
+        return result
+
+    @staticmethod
+    def _get_notes(record: Record) -> List[str]:
+        return [i for i in (record.body.prefix, record.body.postfix) if i]
+
+    def _get_section_diffs(self, old: Optional[Record], new: Optional[Record]) -> List[SectionDiff]:
+        result: List[SectionDiff] = []
+        for section_title in get_schema().titles:
+            old_entries = old.body.get_section(section_title).entries if old else []
+            new_entries = new.body.get_section(section_title).entries if new else []
+            changes = self._get_entry_changes(old_entries, new_entries)
+            if changes:
+                result.append(SectionDiff(section_title, changes))
+
+        old_notes = self._get_notes(old) if old else []
+        new_notes = self._get_notes(new) if new else []
+        changes = self._get_entry_changes(old_notes, new_notes)
+        if changes:
+            result.append(SectionDiff(self.NOTES_TITLE, changes))
+
+        return result
+
+    def _get_record_diff(
+        self, old: Optional[Record], new: Optional[Record]
+    ) -> Optional[RecordDiff]:
+        kind = EntryChange.CHANGED
+        if old is None:
+            kind = EntryChange.ADDED
+        if new is None:
+            kind = EntryChange.REMOVED
+
+        sections = self._get_section_diffs(old, new)
+        old_created = old.created if old else ""
+        new_created = new.created if new else ""
+        if kind == EntryChange.CHANGED and not sections and old_created == new_created:
+            return None
+
+        record = new or old
+        if record is None:
+            return None
+
+        return RecordDiff(
+            name=record.name,
+            kind=kind,
+            old_created=old_created,
+            new_created=new_created,
+            sections=sections,
+        )
+
+    def iterate_record_diffs(self) -> Iterator[RecordDiff]:
+        """
+        Iterate over changed releases, `Unreleased` first.
+
+        Yields:
+            Release changes.
+        """
+        unreleased_diff = self._get_record_diff(
+            self.old.get_unreleased(), self.new.get_unreleased()
+        )
+        if unreleased_diff:
+            yield unreleased_diff
+
+        old_texts = set(self.old.iterate_record_texts())
+        new_texts = set()
+        new_records: Dict[str, Record] = {}
+        for record_text in self.new.iterate_record_texts():
+            new_texts.add(record_text)
+            if record_text in old_texts:
+                continue
+            record = Record.parse(record_text)
+            new_records[record.name] = record
+
+        old_records: Dict[str, Record] = {}
+        for record_text in self.old.iterate_record_texts():
+            if record_text in new_texts:
+                continue
+            record = Record.parse(record_text)
+            old_records[record.name] = record
+
+        for name, new_record in new_records.items():
+            record_diff = self._get_record_diff(old_records.get(name), new_record)
+            if record_diff:
+                yield record_diff
+
+        for name, old_record in old_records.items():
+            if name in new_records:
+                continue
+            record_diff = self._get_record_diff(old_record, None)
+            if record_diff:
+                yield record_diff
+
+    def render(self) -> str:
+        """
+        Render all changes as text.
+        """
+        return "\n\n".join(i.render() for i in self.iterate_record_diffs())
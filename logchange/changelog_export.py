@@ -0,0 +1,295 @@
+"""
+Incremental static export of release notes to HTML or JSON pages.
+"""
+import hashlib
+import html
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple
+
+from newversion.utils import print_path
+
+from logchange.changelog import ChangeLog
+from logchange.constants import EXPORT_FORMAT_HTML, EXPORT_FORMAT_JSON, LOGGER_NAME
+from logchange.record import Record
+from logchange.section_schema import SectionSchema, get_schema, use_schema
+
+try:
+    import markdown
+except ImportError:
+    markdown = None
+
+FORMAT_HTML = EXPORT_FORMAT_HTML
+FORMAT_JSON = EXPORT_FORMAT_JSON
+EXPORT_FORMATS = (FORMAT_HTML, FORMAT_JSON)
+
+HTML_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+class ChangeLogExportError(Exception):
+    """
+    Changelog export error.
+    """
+
+
+class ExportResult(NamedTuple):
+    """
+    Export summary.
+
+    Arguments:
+        written -- Written page file names, index included
+        removed -- Removed page file names of deleted releases
+        unchanged -- Number of pages that were not rewritten
+    """
+
+    written: List[str]
+    removed: List[str]
+    unchanged: int
+
+    def render(self) -> str:
+        """
+        Render as summary line.
+        """
+        return (
+            f"{len(self.written)} pages written, {self.unchanged} unchanged,"
+            f" {len(self.removed)} removed"
+        )
+
+
+def _render_html_body(text: str) -> str:
+    if markdown is None:
+        return f"<pre>{html.escape(text)}</pre>"
+
+    return markdown.markdown(text)
+
+
+def render_page(export_format: str, title: str, record_text: str) -> str:
+    """
+    Render release page.
+
+    Arguments:
+        export_format -- `html` or `json`.
+        title -- Changelog title.
+        record_text -- Release record text.
+    """
+    record = Record.parse(record_text)
+    if export_format == FORMAT_JSON:
+        return json.dumps(record.as_dict(), indent=2)
+
+    version = html.escape(record.version.dumps())
+    parts = [f"<h1>{html.escape(title)} {version}</h1>"]
+    if record.created:
+        parts.append(f"<p>Released {html.escape(record.created)}</p>")
+    parts.append(_render_html_body(record.body.render()))
+    return HTML_PAGE.format(title=f"{html.escape(title)} {version}", body="\n".join(parts))
+
+
+def _render_pages(
+    export_format: str, title: str, record_texts: List[str], schema: SectionSchema
+) -> List[str]:
+    """
+    Render release pages, runs in worker processes.
+    """
+    with use_schema(schema):
+        return [render_page(export_format, title, i) for i in record_texts]
+
+
+class _Page(NamedTuple):
+    name: str
+    key: str
+    version: str
+    created: str
+    text: str
+
+
+class ChangeLogExporter:
+    """
+    Incremental static export of release notes, one page per release and an index.
+
+    Manifest in output folder keeps per-page content hashes, so only new or changed
+    releases are parsed and rewritten, and pages of removed releases are deleted.
+    Cold builds are rendered in a process pool.
+
+    Arguments:
+        path -- Output folder.
+        export_format -- `html` or `json`.
+        title -- Changelog title for pages.
+        workers -- Number of worker processes.
+    """
+
+    # `.logchange-export-<format>.json`, so both formats can share a folder
+    MANIFEST_NAME = ".logchange-export-{}.json"
+    MANIFEST_VERSION = 1
+
+    # Minimal number of pages rendered by a worker process at once
+    CHUNK_SIZE = 64
+
+    def __init__(
+        self, path: Path, export_format: str, title: str = "Changelog", workers: int = 1
+    ) -> None:
+        if export_format not in EXPORT_FORMATS:
+            raise ChangeLogExportError(f"Unknown export format: {export_format}")
+
+        self.path = path
+        self.export_format = export_format
+        self.title = title
+        self.workers = workers
+        self._logger = logging.getLogger(LOGGER_NAME)
+
+    @property
+    def manifest_path(self) -> Path:
+        """
+        Path to manifest with page hashes.
+        """
+        return self.path / self.MANIFEST_NAME.format(self.export_format)
+
+    @property
+    def renderer(self) -> str:
+        """
+        Renderer name, pages are rewritten when it changes.
+        """
+        if self.export_format == FORMAT_HTML and markdown is not None:
+            return f"{FORMAT_HTML}-markdown"
+
+        return self.export_format
+
+    def _get_key(self, text: str) -> str:
+        digest = hashlib.sha256()
+        # section titles and aliases change rendered sections
+        schema_key = get_schema().get_key()
+        for part in (str(self.MANIFEST_VERSION), self.renderer, self.title, schema_key, text):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _load_manifest(self) -> Dict[str, str]:
+        if not self.manifest_path.exists():
+            return {}
+
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            if data.get("version") != self.MANIFEST_VERSION:
+                return {}
+            return dict(data["pages"])
+        except (ValueError, KeyError, TypeError, AttributeError):
+            self._logger.warning(f"{print_path(self.manifest_path)} is invalid, ignoring")
+            return {}
+
+    def _save_manifest(self, pages: Dict[str, str]) -> None:
+        data = {"version": self.MANIFEST_VERSION, "pages": pages}
+        self.manifest_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+    @classmethod
+    def _iterate_record_texts(cls, changelog: ChangeLog) -> Iterator[str]:
+        yield from changelog.iterate_record_texts()
+        for shard in changelog.shards:
+            yield from cls._iterate_record_texts(shard.changelog)
+
+    def _get_pages(self, changelog: ChangeLog) -> List[_Page]:
+        result: List[_Page] = []
+        names = set()
+        for record_text in self._iterate_record_texts(changelog):
+            record_text = record_text.strip()
+            try:
+                # title is parsed, body is parsed only for rendered pages
+                record = Record.parse(record_text)
+            except ValueError as e:
+                raise ChangeLogExportError(f"Invalid release: {e}") from None
+            version = record.version.dumps()
+            name = f"{version}.{self.export_format}"
+            # the newest one of duplicate releases is exported
+            if name in names:
+                continue
+            names.add(name)
+            key = self._get_key(record_text)
+            result.append(_Page(name, key, version, record.created, record_text))
+        return result
+
+    def _render(self, pages: List[_Page]) -> List[str]:
+        record_texts = [i.text for i in pages]
+        if self.workers <= 1 or len(record_texts) < self.CHUNK_SIZE * 2:
+            return _render_pages(self.export_format, self.title, record_texts, get_schema())
+
+        # several chunks per worker to even out uneven release sizes
+        chunk_size = max(self.CHUNK_SIZE, len(record_texts) // (self.workers * 4) + 1)
+        chunks = [record_texts[i : i + chunk_size] for i in range(0, len(record_texts), chunk_size)]
+        result: List[str] = []
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for rendered in pool.map(
+                _render_pages,
+                [self.export_format] * len(chunks),
+                [self.title] * len(chunks),
+                chunks,
+                [get_schema()] * len(chunks),
+            ):
+                result.extend(rendered)
+        return result
+
+    def _render_index(self, pages: List[_Page]) -> str:
+        """
+        Render index page with links to release pages.
+        """
+        if self.export_format == FORMAT_JSON:
+            data: List[Dict[str, Any]] = [
+                {"version": i.version, "created": i.created, "page": i.name} for i in pages
+            ]
+            return json.dumps({"title": self.title, "releases": data}, indent=2)
+
+        items = []
+        for page in pages:
+            created = f" - {html.escape(page.created)}" if page.created else ""
+            items.append(
+                f'<li><a href="{html.escape(page.name)}">{html.escape(page.version)}</a>'
+                f"{created}</li>"
+            )
+        body = "\n".join([f"<h1>{html.escape(self.title)}</h1>", "<ul>", *items, "</ul>"])
+        return HTML_PAGE.format(title=html.escape(self.title), body=body)
+
+    def export(self, changelog: ChangeLog) -> ExportResult:
+        """
+        Write new and changed release pages, index, and delete pages of removed releases.
+
+        Arguments:
+            changelog -- Changelog, archived shards are included.
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        old_keys = self._load_manifest()
+        pages = self._get_pages(changelog)
+        stale_pages = [
+            i for i in pages if old_keys.get(i.name) != i.key or not (self.path / i.name).exists()
+        ]
+        written: List[str] = []
+        for page, text in zip(stale_pages, self._render(stale_pages)):
+            (self.path / page.name).write_text(f"{text.rstrip()}\n", encoding="utf-8")
+            written.append(page.name)
+
+        keys = {i.name: i.key for i in pages}
+        index_name = f"index.{self.export_format}"
+        index_text = self._render_index(pages)
+        keys[index_name] = self._get_key(index_text)
+        index_path = self.path / index_name
+        if old_keys.get(index_name) != keys[index_name] or not index_path.exists():
+            index_path.write_text(f"{index_text.rstrip()}\n", encoding="utf-8")
+            written.append(index_name)
+
+        # only pages written by export are deleted
+        removed = [i for i in old_keys if i not in keys]
+        for name in removed:
+            page_path = self.path / name
+            if page_path.exists():
+                page_path.unlink()
+
+        self._save_manifest(keys)
+        return ExportResult(written, removed, len(keys) - len(written))
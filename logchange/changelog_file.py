@@ -0,0 +1,188 @@
+"""
+Changelog file reader and writer that keeps original line endings.
+"""
+import bisect
+import importlib
+from pathlib import Path
+from typing import IO, Dict, Iterator, List
+
+from logchange.constants import COMPRESSED_SUFFIXES
+
+
+class ChangeLogFile:
+    """
+    Changelog file reader and writer that keeps original line endings.
+
+    File is read as bytes once and line endings are detected once.
+    On write, leading and trailing regions equal to the original content are written
+    as slices of the original buffer, so untouched lines keep their line endings
+    byte-for-byte, even mixed ones. Changed lines get the dominant line ending.
+
+    Files with `.gz`, `.xz` and `.bz2` extensions are decompressed on read
+    and compressed on write.
+
+    Arguments:
+        path -- Path to changelog file
+    """
+
+    ENCODING = "utf-8"
+    CRLF = b"\r\n"
+    LF = b"\n"
+
+    # Chunk size for comparing old and new content
+    CHUNK_SIZE = 64 * 1024
+
+    # Compression module names by file extension, imported only for compressed files
+    COMPRESSOR_MODULES: Dict[str, str] = {".gz": "gzip", ".xz": "lzma", ".bz2": "bz2"}
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.is_crlf = False
+        self._data = b""
+        self._lf_data = b""
+        self._crlf_offsets: List[int] = []
+        self._is_stale = False
+
+    def exists(self) -> bool:
+        """
+        Whether file exists.
+        """
+        return self.path.exists()
+
+    @property
+    def is_compressed(self) -> bool:
+        """
+        Whether file is compressed.
+        """
+        return self.path.suffix in COMPRESSED_SUFFIXES
+
+    def _open(self, mode: str) -> IO[bytes]:
+        if self.is_compressed:
+            compressor = importlib.import_module(self.COMPRESSOR_MODULES[self.path.suffix])
+            return compressor.open(self.path, mode)  # type: ignore
+
+        return self.path.open(mode)
+
+    def _read_bytes(self) -> bytes:
+        with self._open("rb") as f:
+            return f.read()
+
+    def _load(self, data: bytes) -> None:
+        self._data = data
+        self._lf_data = data
+        self._crlf_offsets = []
+        self._is_stale = False
+        self.is_crlf = False
+        if self.CRLF not in data:
+            return
+
+        # positions of CRLF line breaks in LF-converted data
+        position = data.find(self.CRLF)
+        while position != -1:
+            self._crlf_offsets.append(position - len(self._crlf_offsets))
+            position = data.find(self.CRLF, position + 2)
+
+        self._lf_data = data.replace(self.CRLF, self.LF)
+        self.is_crlf = len(self._crlf_offsets) * 2 >= self._lf_data.count(self.LF)
+
+    def read(self) -> str:
+        """
+        Read file content with `\\n` line endings.
+        """
+        self._load(self._read_bytes())
+        return self._lf_data.decode(self.ENCODING)
+
+    def iterate_lines(self) -> Iterator[str]:
+        """
+        Read file line by line, compressed files are decompressed in a stream.
+
+        File is read only as far as lines are consumed, and is closed
+        when iteration is stopped.
+
+        Yields:
+            Line without line break.
+        """
+        with self._open("rb") as f:
+            for line in f:
+                if line.endswith(self.CRLF):
+                    line = line[:-2]
+                elif line.endswith(self.LF):
+                    line = line[:-1]
+                yield line.decode(self.ENCODING)
+
+    def _get_original_offset(self, lf_offset: int) -> int:
+        return lf_offset + bisect.bisect_left(self._crlf_offsets, lf_offset)
+
+    @classmethod
+    def _get_prefix_size(cls, old: bytes, new: bytes) -> int:
+        size = min(len(old), len(new))
+        start = 0
+        while start < size:
+            end = min(start + cls.CHUNK_SIZE, size)
+            if old[start:end] != new[start:end]:
+                break
+            start = end
+        else:
+            return size
+
+        while start < end and old[start] == new[start]:
+            start += 1
+
+        return start
+
+    @classmethod
+    def _get_suffix_size(cls, old: bytes, new: bytes, max_size: int) -> int:
+        old_size = len(old)
+        new_size = len(new)
+        result = 0
+        while result < max_size:
+            chunk_size = min(cls.CHUNK_SIZE, max_size - result)
+            old_chunk = old[old_size - result - chunk_size : old_size - result]
+            new_chunk = new[new_size - result - chunk_size : new_size - result]
+            if old_chunk != new_chunk:
+                break
+            result += chunk_size
+        else:
+            return max_size
+
+        while result < max_size and old[old_size - result - 1] == new[new_size - result - 1]:
+            result += 1
+
+        return result
+
+    def write(self, text: str) -> None:
+        """
+        Write `text` with `\\n` line endings to file, keeping original line endings.
+        """
+        new_data = text.encode(self.ENCODING)
+        if self._is_stale:
+            self._load(self._read_bytes())
+
+        if not self._data:
+            with self._open("wb") as f:
+                f.write(new_data)
+            self._is_stale = True
+            return
+
+        old_data = self._lf_data
+        prefix_size = self._get_prefix_size(old_data, new_data)
+        prefix_size = new_data.rfind(self.LF, 0, prefix_size) + 1
+        max_suffix_size = min(len(old_data), len(new_data)) - prefix_size
+        suffix_start = len(new_data) - self._get_suffix_size(old_data, new_data, max_suffix_size)
+        if suffix_start and new_data[suffix_start - 1 : suffix_start] != self.LF:
+            suffix_start = new_data.find(self.LF, suffix_start)
+            suffix_start = len(new_data) if suffix_start == -1 else suffix_start + 1
+        suffix_size = len(new_data) - suffix_start
+
+        middle = new_data[prefix_size:suffix_start]
+        if self.is_crlf:
+            middle = middle.replace(self.LF, self.CRLF)
+
+        data_view = memoryview(self._data)
+        with self._open("wb") as f:
+            f.write(data_view[: self._get_original_offset(prefix_size)])
+            f.write(middle)
+            f.write(data_view[self._get_original_offset(len(old_data) - suffix_size) :])
+
+        data_view.release()
+        self._is_stale = True
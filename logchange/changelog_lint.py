@@ -0,0 +1,446 @@
+"""
+Changelog linter with pluggable rules, all rules share one pass over release records.
+"""
+import datetime
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+)
+
+import pkg_resources
+from newversion import Version
+from newversion.utils import print_path
+
+from logchange.changelog import ChangeLog
+from logchange.constants import UNRELEASED
+from logchange.record import Record
+from logchange.section_schema import get_schema, use_schema
+from logchange.session import ChangeLogSession
+from logchange.version_bump import BUMP_PRERELEASE, get_bump_type, get_expected_bump_type
+
+# Entry point group for third-party `LintRule` subclasses
+LINT_RULES_ENTRY_POINT = "logchange.lint_rules"
+
+# Pseudo-rule for release titles that cannot be parsed, it can not be disabled
+INVALID_VERSION = "invalid-version"
+
+DATE_FORMAT = "%Y-%m-%d"
+
+
+class ChangeLogLintError(Exception):
+    """
+    Changelog linter error.
+    """
+
+
+class LintIssue(NamedTuple):
+    """
+    Lint rule violation.
+
+    Arguments:
+        path -- Changelog path
+        version -- Release version or `unreleased`
+        rule -- Rule name
+        message -- Issue description
+    """
+
+    path: str
+    version: str
+    rule: str
+    message: str
+
+    def render(self) -> str:
+        """
+        Render as `path: version: message [rule]` line.
+        """
+        return f"{self.path}: {self.version}: {self.message} [{self.rule}]"
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Convert to JSON-serializable dict.
+        """
+        return self._asdict()
+
+
+class Header(NamedTuple):
+    """
+    Header found in release text.
+
+    Arguments:
+        line -- Header line
+        title -- Section title, empty for unknown headers
+        is_empty -- Whether header has no text until the next header
+    """
+
+    line: str
+    title: str
+    is_empty: bool
+
+
+class LintRecord(NamedTuple):
+    """
+    Release record with its text scanned once for all rules.
+
+    Arguments:
+        record -- Release record
+        name -- Release version or `unreleased`
+        created -- Release date, None if it is missing or invalid
+        headers -- Headers outside of code blocks
+        is_fence_closed -- Whether all code blocks are closed
+    """
+
+    record: Record
+    name: str
+    created: Optional[datetime.date]
+    headers: List[Header]
+    is_fence_closed: bool
+
+    @property
+    def is_unreleased(self) -> bool:
+        """
+        Whether record is `Unreleased`.
+        """
+        return self.name == UNRELEASED
+
+    @staticmethod
+    def _parse_date(created: str) -> Optional[datetime.date]:
+        try:
+            return datetime.datetime.strptime(created, DATE_FORMAT).date()
+        except ValueError:
+            return None
+
+    @classmethod
+    def create(cls, record: Record) -> "LintRecord":
+        """
+        Scan `record` text, it is taken as it is before record body is parsed.
+        """
+        schema = get_schema()
+        headers: List[Header] = []
+        codeblock = False
+        header_line = ""
+        header_title = ""
+        is_header_empty = True
+        # the first line is the release title
+        for line in record.render().splitlines()[1:]:
+            if line.startswith("```"):
+                codeblock = not codeblock
+            if not codeblock and line.startswith("#") and " " in line:
+                if header_line:
+                    headers.append(Header(header_line, header_title, is_header_empty))
+                header_line = line
+                header_title = schema.get_title(line.split()[1])
+                is_header_empty = True
+                continue
+            if line.strip():
+                is_header_empty = False
+        if header_line:
+            headers.append(Header(header_line, header_title, is_header_empty))
+
+        is_unreleased = record.version == Version.zero()
+        return cls(
+            record=record,
+            name=UNRELEASED if is_unreleased else record.version.dumps(),
+            created=cls._parse_date(record.created),
+            headers=headers,
+            is_fence_closed=not codeblock,
+        )
+
+
+class LintRule:
+    """
+    Base changelog lint rule.
+
+    A new rule instance is created for every changelog, so rules can keep state.
+    Records are checked from newest to oldest, `Unreleased` goes first.
+    Third-party rules are registered in `logchange.lint_rules` entry point group.
+    """
+
+    name = ""
+    description = ""
+
+    def check(self, record: LintRecord, older: Optional[LintRecord]) -> Iterator[str]:
+        """
+        Check release `record`.
+
+        Arguments:
+            record -- Checked record.
+            older -- Previous release record, None for the oldest release and `Unreleased`.
+
+        Yields:
+            Issue messages.
+        """
+        yield from ()
+
+
+class DuplicateVersionRule(LintRule):
+    """
+    Release version appears more than once.
+    """
+
+    name = "duplicate-version"
+    description = "Release versions are unique"
+
+    def __init__(self) -> None:
+        self._versions: Set[Version] = set()
+
+    def check(self, record: LintRecord, older: Optional[LintRecord]) -> Iterator[str]:
+        if record.is_unreleased:
+            return
+        if record.record.version in self._versions:
+            yield f"duplicate release {record.name}"
+        self._versions.add(record.record.version)
+
+
+class VersionOrderRule(LintRule):
+    """
+    Releases are not ordered from newest to oldest version.
+    """
+
+    name = "version-order"
+    description = "Releases go from newest to oldest version"
+
+    def check(self, record: LintRecord, older: Optional[LintRecord]) -> Iterator[str]:
+        if older is None or record.is_unreleased:
+            return
+        # equal versions are reported by `duplicate-version`
+        if record.record.version < older.record.version:
+            yield f"goes before newer release {older.name}"
+
+
+class DateOrderRule(LintRule):
+    """
+    Release date is earlier than the date of the previous release.
+    """
+
+    name = "date-order"
+    description = "Release dates go from newest to oldest"
+
+    def check(self, record: LintRecord, older: Optional[LintRecord]) -> Iterator[str]:
+        if older is None or record.created is None or older.created is None:
+            return
+        if record.created < older.created:
+            yield f"released {record.created}, before {older.name} released {older.created}"
+
+
+class InvalidDateRule(LintRule):
+    """
+    Release date is missing or is not in `YYYY-MM-DD` format.
+    """
+
+    name = "invalid-date"
+    description = "Release date is set in YYYY-MM-DD format"
+
+    def check(self, record: LintRecord, older: Optional[LintRecord]) -> Iterator[str]:
+        if record.is_unreleased or record.created is not None:
+            return
+        if not record.record.created:
+            yield "release date is missing"
+            return
+        yield f"invalid release date {record.record.created}, expected YYYY-MM-DD"
+
+
+class EmptySectionRule(LintRule):
+    """
+    Section has no entries.
+    """
+
+    name = "empty-section"
+    description = "Sections have entries"
+
+    def check(self, record: LintRecord, older: Optional[LintRecord]) -> Iterator[str]:
+        for header in record.headers:
+            if header.title and header.is_empty:
+                yield f"empty section `{header.line}`"
+
+
+class UnknownHeaderRule(LintRule):
+    """
+    Header is not a known section, so it and its text go to release prefix or postfix.
+    """
+
+    name = "unknown-header"
+    description = "Headers are known sections"
+
+    def check(self, record: LintRecord, older: Optional[LintRecord]) -> Iterator[str]:
+        for header in record.headers:
+            if not header.title:
+                yield f"unknown header `{header.line}` is not a section"
+
+
+class UnclosedFenceRule(LintRule):
+    """
+    Code block is not closed.
+    """
+
+    name = "unclosed-fence"
+    description = "Code blocks are closed"
+
+    def check(self, record: LintRecord, older: Optional[LintRecord]) -> Iterator[str]:
+        if not record.is_fence_closed:
+            yield "code block is not closed"
+
+
+class BumpMismatchRule(LintRule):
+    """
+    Release version bump does not match the one suggested by release sections.
+    """
+
+    name = "bump-mismatch"
+    description = "Version bumps match release sections"
+
+    def check(self, record: LintRecord, older: Optional[LintRecord]) -> Iterator[str]:
+        if older is None or record.is_unreleased:
+            return
+        old_version = older.record.version
+        if record.record.version <= old_version:
+            return
+
+        bump = get_bump_type(old_version, record.record.version)
+        if bump == BUMP_PRERELEASE:
+            return
+        expected_bump = get_expected_bump_type(record.record.body, old_version)
+        if bump != expected_bump:
+            yield f"{bump} bump from {older.name}, but sections suggest {expected_bump}"
+
+
+BUILTIN_RULES: Tuple[Type[LintRule], ...] = (
+    DuplicateVersionRule,
+    VersionOrderRule,
+    DateOrderRule,
+    InvalidDateRule,
+    EmptySectionRule,
+    UnknownHeaderRule,
+    UnclosedFenceRule,
+    BumpMismatchRule,
+)
+
+_lint_rules: Dict[str, Type[LintRule]] = {}
+
+
+def get_lint_rules() -> Dict[str, Type[LintRule]]:
+    """
+    Get built-in and installed lint rules by name, loaded once per process.
+    """
+    if _lint_rules:
+        return _lint_rules
+
+    result = {i.name: i for i in BUILTIN_RULES}
+    for entry_point in pkg_resources.iter_entry_points(LINT_RULES_ENTRY_POINT):
+        try:
+            rule = entry_point.load()
+        except (ImportError, AttributeError) as e:
+            raise ChangeLogLintError(f"Cannot load lint rule {entry_point.name}: {e}") from None
+        if not isinstance(rule, type) or not issubclass(rule, LintRule):
+            raise ChangeLogLintError(f"Lint rule {entry_point.name} is not a LintRule subclass")
+        result[rule.name or entry_point.name] = rule
+
+    _lint_rules.update(result)
+    return _lint_rules
+
+
+class ChangeLogLinter:
+    """
+    Changelog linter, every record is parsed and scanned once and checked by all rules.
+
+    Arguments:
+        rules -- Lint rule classes.
+    """
+
+    def __init__(self, rules: Iterable[Type[LintRule]]) -> None:
+        self.rules = list(rules)
+
+    @classmethod
+    def _iterate_records(cls, changelog: ChangeLog) -> Iterator[Tuple[Optional[Record], str]]:
+        # invalid titles are reported instead of stopping at the first one
+        for record_text in changelog.iterate_record_texts():
+            try:
+                yield Record.parse(record_text), ""
+            except ValueError:
+                yield None, record_text.strip().split("\n", 1)[0]
+        for shard in changelog.shards:
+            yield from cls._iterate_records(shard.changelog)
+
+    def lint(self, changelog: ChangeLog, name: str = "") -> List[LintIssue]:
+        """
+        Check `changelog` and its archived shards.
+
+        Arguments:
+            changelog -- Changelog to check.
+            name -- Changelog name for issues.
+
+        Returns:
+            Issues from newest to oldest release.
+        """
+        rules = [i() for i in self.rules]
+        result: List[LintIssue] = []
+
+        def check(record: LintRecord, older: Optional[LintRecord]) -> None:
+            for rule in rules:
+                for message in rule.check(record, older):
+                    result.append(LintIssue(name, record.name, rule.name, message))
+
+        check(LintRecord.create(changelog.get_unreleased()), None)
+        newer: Optional[LintRecord] = None
+        for record, title in self._iterate_records(changelog):
+            if record is None:
+                version = title.split("[", 1)[-1].split("]", 1)[0]
+                result.append(LintIssue(name, version, INVALID_VERSION, f"invalid title `{title}`"))
+                continue
+            lint_record = LintRecord.create(record)
+            if newer is not None:
+                check(newer, lint_record)
+            newer = lint_record
+        if newer is not None:
+            check(newer, None)
+
+        return result
+
+
+def lint_path(path: Path, disabled: Sequence[str] = ()) -> List[LintIssue]:
+    """
+    Check changelog file, runs in worker processes.
+
+    Arguments:
+        path -- Path to changelog file, archived shards are included.
+        disabled -- Names of disabled rules.
+    """
+    rules = [rule for name, rule in get_lint_rules().items() if name not in disabled]
+    with use_schema(get_schema(path.parent)):
+        changelog = ChangeLogSession(path).changelog
+        return ChangeLogLinter(rules).lint(changelog, print_path(path))
+
+
+def lint_paths(
+    paths: Iterable[Path], disabled: Sequence[str] = (), workers: int = 1
+) -> List[LintIssue]:
+    """
+    Check many changelogs.
+
+    Arguments:
+        paths -- Paths to changelog files.
+        disabled -- Names of disabled rules.
+        workers -- Number of worker processes.
+
+    Returns:
+        Issues in `paths` order.
+    """
+    paths = list(paths)
+    disabled_list = [list(disabled)] * len(paths)
+    if workers > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lint_path, paths, disabled_list))
+    else:
+        results = [lint_path(path, disabled) for path in paths]
+
+    return [issue for issues in results for issue in issues]
@@ -0,0 +1,317 @@
+"""
+Structural three-way merge of changelogs.
+"""
+import difflib
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+from newversion import Version
+
+from logchange.changelog import ChangeLog
+from logchange.record import Record
+from logchange.record_body import RecordBody
+from logchange.record_section import RecordSection
+from logchange.section_schema import get_schema
+
+
+class MergeResult(NamedTuple):
+    """
+    Three-way merge result.
+
+    Arguments:
+        text -- Merged changelog text, with conflict markers if there are conflicts
+        conflicts -- Names of conflicted parts
+    """
+
+    text: str
+    conflicts: List[str]
+
+
+class _Hunk(NamedTuple):
+    start: int
+    end: int
+    entries: List[str]
+
+
+class ChangeLogMerge:
+    """
+    Structural three-way merge of changelogs.
+
+    Releases are matched by version. Releases with the same raw text on both sides,
+    or changed only on one side, are carried over as they are without parsing
+    their bodies. Releases changed on both sides are merged per section on entry level:
+    entries added on both sides at the same place are kept, ours first,
+    like `RecordBody.get_merged` does. Releases of a duplicate version
+    changed on both sides are a conflict.
+
+    Arguments:
+        base -- Common ancestor changelog
+        ours -- Current branch changelog
+        theirs -- Merged branch changelog
+        marker_size -- Conflict marker size
+    """
+
+    OURS = "ours"
+    THEIRS = "theirs"
+
+    def __init__(
+        self, base: ChangeLog, ours: ChangeLog, theirs: ChangeLog, marker_size: int = 7
+    ) -> None:
+        self.base = base
+        self.ours = ours
+        self.theirs = theirs
+        self.marker_size = marker_size
+        self._conflicts: List[str] = []
+        self._duplicates: Set[str] = set()
+
+    def _render_conflict(self, name: str, ours: str, theirs: str) -> str:
+        self._conflicts.append(name)
+        return "\n".join(
+            (
+                f"{'<' * self.marker_size} {self.OURS}",
+                ours,
+                "=" * self.marker_size,
+                theirs,
+                f"{'>' * self.marker_size} {self.THEIRS}",
+            )
+        )
+
+    def _merge_text(self, name: str, base: str, ours: str, theirs: str) -> str:
+        if ours == theirs or base == theirs:
+            return ours
+        if base == ours:
+            return theirs
+
+        return self._render_conflict(name, ours, theirs)
+
+    @staticmethod
+    def _get_hunks(base: List[str], other: List[str]) -> List[_Hunk]:
+        matcher = difflib.SequenceMatcher(None, base, other, autojunk=False)
+        return [
+            _Hunk(base_start, base_end, other[other_start:other_end])
+            for tag, base_start, base_end, other_start, other_end in matcher.get_opcodes()
+            if tag != "equal"
+        ]
+
+    @staticmethod
+    def _apply_hunks(base: List[str], start: int, end: int, hunks: Iterable[_Hunk]) -> List[str]:
+        result: List[str] = []
+        position = start
+        for hunk in hunks:
+            result.extend(base[position : hunk.start])
+            result.extend(hunk.entries)
+            position = hunk.end
+        result.extend(base[position:end])
+        return result
+
+    def merge_entries(
+        self, name: str, base: List[str], ours: List[str], theirs: List[str]
+    ) -> List[str]:
+        """
+        Three-way merge of section entries.
+
+        Arguments:
+            name -- Section name for conflict report.
+            base -- Common ancestor entries.
+            ours -- Current branch entries.
+            theirs -- Merged branch entries.
+
+        Returns:
+            Merged entries, conflicts are added as entries with conflict markers.
+        """
+        if ours == theirs or base == theirs:
+            return ours
+        if base == ours:
+            return theirs
+
+        hunks = sorted(
+            [(i, self.OURS) for i in self._get_hunks(base, ours)]
+            + [(i, self.THEIRS) for i in self._get_hunks(base, theirs)],
+            key=lambda x: (x[0].start, x[0].end),
+        )
+        result: List[str] = []
+        position = 0
+        index = 0
+        while index < len(hunks):
+            group = [hunks[index]]
+            group_start, group_end = hunks[index][0].start, hunks[index][0].end
+            index += 1
+            while index < len(hunks):
+                hunk = hunks[index][0]
+                if hunk.start >= group_end and hunk.start != group_start:
+                    break
+                group.append(hunks[index])
+                group_end = max(group_end, hunk.end)
+                index += 1
+
+            result.extend(base[position:group_start])
+            position = group_end
+            ours_hunks = [hunk for hunk, side in group if side == self.OURS]
+            theirs_hunks = [hunk for hunk, side in group if side == self.THEIRS]
+            ours_entries = self._apply_hunks(base, group_start, group_end, ours_hunks)
+            theirs_entries = self._apply_hunks(base, group_start, group_end, theirs_hunks)
+            if not theirs_hunks or ours_entries == theirs_entries:
+                result.extend(ours_entries)
+                continue
+            if not ours_hunks:
+                result.extend(theirs_entries)
+                continue
+            if group_start == group_end:
+                # both sides added entries at the same place
+                result.extend(ours_entries)
+                result.extend(i for i in theirs_entries if i not in ours_entries)
+                continue
+
+            result.append(
+                self._render_conflict(name, "\n".join(ours_entries), "\n".join(theirs_entries))
+            )
+
+        result.extend(base[position:])
+        return result
+
+    def _merge_bodies(
+        self, name: str, base: RecordBody, ours: RecordBody, theirs: RecordBody
+    ) -> RecordBody:
+        sections = []
+        for section_title in get_schema().titles:
+            entries = self.merge_entries(
+                f"{name} {section_title}",
+                base.get_section(section_title).entries,
+                ours.get_section(section_title).entries,
+                theirs.get_section(section_title).entries,
+            )
+            sections.append(RecordSection(section_title, "\n".join(entries)))
+
+        result = RecordBody(sections)
+        result.prefix = self._merge_text(f"{name} prefix", base.prefix, ours.prefix, theirs.prefix)
+        result.postfix = self._merge_text(
+            f"{name} postfix", base.postfix, ours.postfix, theirs.postfix
+        )
+        return result
+
+    def _merge_records(self, base: Optional[Record], ours: Record, theirs: Record) -> str:
+        base_body = base.body if base else RecordBody()
+        base_created = base.created if base else ""
+        name = ours.name
+        record = Record(ours.version, "", ours.created)
+        if ours.created == base_created:
+            record.created = theirs.created
+        record.body = self._merge_bodies(name, base_body, ours.body, theirs.body)
+        text = record.render()
+        if ours.created in (base_created, theirs.created) or theirs.created == base_created:
+            return text
+
+        # dates changed on both sides
+        title, body = f"{text}\n".split("\n", 1)
+        theirs_record = Record(ours.version, "", theirs.created)
+        conflict = self._render_conflict(f"{name} date", title, theirs_record.render())
+        return f"{conflict}\n{body}".strip()
+
+    def _get_record_texts(self, changelog: ChangeLog) -> Dict[str, str]:
+        result: Dict[str, str] = {}
+        for record_text in changelog.iterate_record_texts():
+            title = record_text.split("\n", 1)[0]
+            version = Record.parse(title).version.dumps()
+            if version in result:
+                # all releases of a duplicate version are kept together
+                self._duplicates.add(version)
+                record_text = f"{result[version].strip()}\n\n{record_text}"
+            result[version] = record_text
+        return result
+
+    def _merge_record_texts(
+        self, version: str, base: Optional[str], ours: Optional[str], theirs: Optional[str]
+    ) -> Optional[str]:
+        if ours == theirs or base == theirs:
+            return ours
+        if base == ours:
+            return theirs
+        if version in self._duplicates:
+            # duplicate releases cannot be matched to each other
+            return self._render_conflict(
+                f"[{version}] duplicate", (ours or "").strip(), (theirs or "").strip()
+            )
+        if ours is None or theirs is None:
+            # deleted on one side and changed on the other
+            return self._render_conflict(
+                f"[{version}]", (ours or "").strip(), (theirs or "").strip()
+            )
+
+        return self._merge_records(
+            Record.parse(base) if base else None, Record.parse(ours), Record.parse(theirs)
+        )
+
+    @staticmethod
+    def _get_order(ours: Iterable[str], theirs: Iterable[str]) -> List[str]:
+        result = list(ours)
+        known = set(result)
+        for version in theirs:
+            if version in known:
+                continue
+            known.add(version)
+            for index, ours_version in enumerate(result):
+                if Version(ours_version) < Version(version):
+                    result.insert(index, version)
+                    break
+            else:
+                result.append(version)
+
+        return result
+
+    def merge(self) -> MergeResult:
+        """
+        Merge changelogs.
+
+        Returns:
+            Merged text and conflicts.
+        """
+        self._conflicts = []
+        self._duplicates = set()
+        head = self._merge_text("head", self.base.head, self.ours.head, self.theirs.head)
+
+        base_unreleased = self.base.get_unreleased().render()
+        ours_unreleased = self.ours.get_unreleased().render()
+        theirs_unreleased = self.theirs.get_unreleased().render()
+        unreleased = ours_unreleased
+        if theirs_unreleased not in (base_unreleased, ours_unreleased):
+            unreleased = theirs_unreleased
+            if base_unreleased != ours_unreleased:
+                unreleased = self._merge_records(
+                    self.base.get_unreleased(),
+                    self.ours.get_unreleased(),
+                    self.theirs.get_unreleased(),
+                )
+        # title is added back by `ChangeLog`
+        unreleased_body = f"{unreleased}\n".split("\n", 1)[1]
+        result = ChangeLog(head=head, released="", unreleased=unreleased_body.strip())
+
+        base_texts = self._get_record_texts(self.base)
+        ours_texts = self._get_record_texts(self.ours)
+        theirs_texts = self._get_record_texts(self.theirs)
+        record_texts = []
+        for version in self._get_order(ours_texts, theirs_texts):
+            record_text = self._merge_record_texts(
+                version, base_texts.get(version), ours_texts.get(version), theirs_texts.get(version)
+            )
+            if record_text is not None:
+                record_texts.append(record_text)
+        result.set_record_texts(record_texts)
+
+        return MergeResult(result.render(), list(dict.fromkeys(self._conflicts)))
+
+
+def merge_texts(base: str, ours: str, theirs: str, marker_size: int = 7) -> MergeResult:
+    """
+    Three-way merge of changelog texts.
+
+    Arguments:
+        base -- Common ancestor changelog text.
+        ours -- Current branch changelog text.
+        theirs -- Merged branch changelog text.
+        marker_size -- Conflict marker size.
+
+    Returns:
+        Merged text and conflicts.
+    """
+    return ChangeLogMerge(
+        ChangeLog.parse(base), ChangeLog.parse(ours), ChangeLog.parse(theirs), marker_size
+    ).merge()
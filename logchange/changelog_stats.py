@@ -0,0 +1,274 @@
+"""
+Changelog statistics collected in one pass over release records.
+"""
+import datetime
+import heapq
+import statistics
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from newversion.utils import print_path
+
+from logchange.record import Record
+from logchange.section_schema import get_schema, use_schema
+from logchange.session import ChangeLogSession
+from logchange.version_bump import (
+    BUMP_PRERELEASE,
+    BUMP_TYPES,
+    get_bump_type,
+    get_expected_bump_type,
+)
+
+
+class ReleaseStats(NamedTuple):
+    """
+    Single release statistics.
+
+    Arguments:
+        version -- Release version
+        created -- Release date
+        entries -- Number of entries per section
+        bump -- Bump type from the previous release, empty for the oldest one
+        expected_bump -- Bump type suggested by release sections, empty for the oldest one
+    """
+
+    version: str
+    created: str
+    entries: Dict[str, int]
+    bump: str
+    expected_bump: str
+
+    @property
+    def total(self) -> int:
+        """
+        Number of entries in all sections.
+        """
+        return sum(self.entries.values())
+
+
+class ChangeLogStats:
+    """
+    Changelog statistics collected in one pass over release records.
+
+    Records are expected from newest to oldest, as `ChangeLog.iterate_records` yields them,
+    and are not kept: release bump is known only when the previous release is added,
+    so only the last added record is held.
+
+    Arguments:
+        name -- Changelog name for output
+        top -- Number of largest releases to keep
+    """
+
+    DATE_FORMAT = "%Y-%m-%d"
+
+    def __init__(self, name: str = "", top: int = 5) -> None:
+        self.name = name
+        self.top = top
+        self.releases: List[ReleaseStats] = []
+        self.section_entries: Counter = Counter()
+        self.bumps: Counter = Counter()
+        self.expected_bumps: Counter = Counter()
+        self.matched_bumps: Counter = Counter()
+        self.intervals: List[int] = []
+        # rendered in the order of the changelog's project schema, render runs outside of it
+        self.section_titles = [*get_schema().titles]
+        self._last_record: Optional[Record] = None
+        self._last_date: Optional[datetime.date] = None
+
+    def _parse_date(self, created: str) -> Optional[datetime.date]:
+        try:
+            return datetime.datetime.strptime(created, self.DATE_FORMAT).date()
+        except ValueError:
+            return None
+
+    def _add_release(self, record: Record, bump: str, expected_bump: str) -> None:
+        entries = {i.title: len(i.entries) for i in record.body.sections}
+        self.section_entries.update(entries)
+        self.releases.append(
+            ReleaseStats(record.version.dumps(), record.created, entries, bump, expected_bump)
+        )
+        if not bump:
+            return
+
+        self.bumps[bump] += 1
+        if bump == BUMP_PRERELEASE:
+            return
+        self.expected_bumps[expected_bump] += 1
+        if bump == expected_bump:
+            self.matched_bumps[bump] += 1
+
+    def add_record(self, record: Record) -> None:
+        """
+        Add release record older than all added ones.
+        """
+        date = self._parse_date(record.created)
+        if date and self._last_date:
+            self.intervals.append((self._last_date - date).days)
+        if date:
+            self._last_date = date
+
+        last_record = self._last_record
+        self._last_record = record
+        if last_record is None:
+            return
+
+        self._add_release(
+            last_record,
+            get_bump_type(record.version, last_record.version),
+            get_expected_bump_type(last_record.body, record.version),
+        )
+
+    def finish(self) -> None:
+        """
+        Add the oldest release, it has no bump.
+        """
+        if self._last_record is not None:
+            self._add_release(self._last_record, "", "")
+        self._last_record = None
+
+    def collect(self, records: Iterable[Record]) -> None:
+        """
+        Add release records from newest to oldest and finish.
+        """
+        for record in records:
+            self.add_record(record)
+        self.finish()
+
+    @property
+    def total(self) -> int:
+        """
+        Number of entries in all releases.
+        """
+        return sum(self.section_entries.values())
+
+    def get_largest(self) -> List[ReleaseStats]:
+        """
+        Get `top` releases with most entries, largest first.
+        """
+        return heapq.nlargest(self.top, self.releases, key=lambda x: x.total)
+
+    def get_cadence(self) -> Dict[str, Any]:
+        """
+        Get days between releases: `mean`, `median`, `min` and `max`.
+        """
+        if not self.intervals:
+            return {}
+
+        return {
+            "mean": round(statistics.mean(self.intervals), 1),
+            "median": statistics.median(self.intervals),
+            "min": min(self.intervals),
+            "max": max(self.intervals),
+        }
+
+    def _get_date_range(self) -> Tuple[str, str]:
+        dates = [i.created for i in self.releases if self._parse_date(i.created)]
+        if not dates:
+            return "", ""
+        return dates[-1], dates[0]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Convert to JSON-serializable dict.
+        """
+        first_date, last_date = self._get_date_range()
+        return {
+            "name": self.name,
+            "releases": len(self.releases),
+            "entries": self.total,
+            "first_date": first_date,
+            "last_date": last_date,
+            "sections": dict(self.section_entries),
+            "cadence": self.get_cadence(),
+            "bumps": {
+                bump: {
+                    "actual": self.bumps[bump],
+                    "expected": self.expected_bumps[bump],
+                    "matched": self.matched_bumps[bump],
+                }
+                for bump in BUMP_TYPES
+            },
+            "largest": [i.version for i in self.get_largest()],
+            "release_stats": [{**i._asdict(), "total": i.total} for i in self.releases],
+        }
+
+    def render(self) -> str:
+        """
+        Render as text tables.
+        """
+        releases = len(self.releases)
+        first_date, last_date = self._get_date_range()
+        lines = [self.name] if self.name else []
+        date_range = f" ({first_date} - {last_date})" if first_date else ""
+        lines.append(f"Releases: {releases}{date_range}")
+        per_release = self.total / releases if releases else 0.0
+        lines.append(f"Entries: {self.total}, {per_release:.1f} per release")
+        cadence = self.get_cadence()
+        if cadence:
+            lines.append(
+                f"Cadence: {cadence['median']} days median, {cadence['mean']} days mean,"
+                f" {cadence['min']}-{cadence['max']} days range"
+            )
+
+        lines.append("")
+        lines.append(f"{'Section':<16}{'Entries':>8}{'Per release':>13}")
+        section_titles = [*self.section_titles]
+        section_titles.extend(i for i in self.section_entries if i not in section_titles)
+        for title in section_titles:
+            count = self.section_entries[title]
+            if count:
+                lines.append(f"{title:<16}{count:>8}{count / releases:>13.1f}")
+
+        lines.append("")
+        lines.append(f"{'Bump':<16}{'Actual':>8}{'Expected':>10}{'Matched':>9}")
+        for bump in BUMP_TYPES:
+            lines.append(
+                f"{bump:<16}{self.bumps[bump]:>8}{self.expected_bumps[bump]:>10}"
+                f"{self.matched_bumps[bump]:>9}"
+            )
+
+        largest = self.get_largest()
+        if largest:
+            lines.append("")
+            lines.append(f"{'Largest release':<16}{'Entries':>8}  Date")
+            for release in largest:
+                lines.append(f"{release.version:<16}{release.total:>8}  {release.created}")
+
+        return "\n".join(lines)
+
+
+def get_stats(path: Path, top: int = 5) -> ChangeLogStats:
+    """
+    Collect changelog statistics, runs in worker processes.
+
+    Arguments:
+        path -- Path to changelog file, archived shards are included.
+        top -- Number of largest releases to keep.
+    """
+    with use_schema(get_schema(path.parent)):
+        result = ChangeLogStats(print_path(path), top)
+        result.collect(ChangeLogSession(path).changelog.iterate_records())
+    return result
+
+
+def collect_stats(paths: Iterable[Path], top: int = 5, workers: int = 1) -> List[ChangeLogStats]:
+    """
+    Collect statistics for many changelogs.
+
+    Arguments:
+        paths -- Paths to changelog files.
+        top -- Number of largest releases to keep.
+        workers -- Number of worker processes.
+
+    Returns:
+        Statistics in `paths` order.
+    """
+    paths = list(paths)
+    tops = [top] * len(paths)
+    if workers > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(get_stats, paths, tops))
+
+    return [get_stats(path, top) for path, top in zip(paths, tops)]
@@ -9,7 +9,16 @@ from typing import Sequence
 import pkg_resources
 from newversion import Version, VersionError
 
-from logchange.constants import LATEST, SECTION_ALL, SECTION_TITLES, UNRELEASED
+from logchange.constants import (
+    AGGREGATE_SORT_DATE,
+    AGGREGATE_SORT_VERSION,
+    COMPRESSED_SUFFIXES,
+    EXPORT_FORMAT_HTML,
+    EXPORT_FORMAT_JSON,
+    LATEST,
+    SECTION_ALL,
+    UNRELEASED,
+)
 from logchange.utils import dedent
 
 
@@ -17,6 +26,9 @@ def get_changelog_path(value: str) -> Path:
     """
     Get existing path to "CHANGELOG.md" or to its parent folder.
 
+    If folder has no "CHANGELOG.md", but has a compressed one, e.g. "CHANGELOG.md.gz",
+    the compressed one is used.
+
     Arguments:
         value -- String path.
 
@@ -27,6 +39,11 @@ def get_changelog_path(value: str) -> Path:
 
     if path.exists() and path.is_dir():
         path = path / "CHANGELOG.md"
+        if not path.exists():
+            for suffix in COMPRESSED_SUFFIXES:
+                compressed_path = path.with_name(f"{path.name}{suffix}")
+                if compressed_path.exists():
+                    return compressed_path
 
     return path
 
@@ -48,6 +65,15 @@ def get_version_latest_or_unreleased(value: str) -> str:
         raise argparse.ArgumentTypeError(e) from None
 
 
+def get_section_title(value: str) -> str:
+    """
+    Get lowercased section title or alias.
+
+    Aliases are resolved by `Executor` with the schema of the changelog's project.
+    """
+    return value.lower()
+
+
 def get_stdin() -> str:
     """
     Get input from stdin.
@@ -78,6 +104,22 @@ def parse_args(args: Sequence[str]) -> argparse.Namespace:
         description="Keep-a-changelog manager",
     )
     parser.add_argument("-V", "--version", action="version", version=version, help="Show version")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print per-phase timings to stderr",
+    )
+    parser.add_argument(
+        "--profile-format",
+        default="text",
+        choices=["text", "json"],
+        help="Per-phase timings format. Default: text",
+    )
+    parser.add_argument(
+        "--profile-dump",
+        default="",
+        help="Write cProfile stats to this path",
+    )
     subparsers = parser.add_subparsers(help="Available subcommands", dest="command", required=True)
 
     parser_init = subparsers.add_parser("init", help="Create CHANGELOG.md")
@@ -94,6 +136,13 @@ def parse_args(args: Sequence[str]) -> argparse.Namespace:
         action="store_true",
         help="Format existing changelog and write back",
     )
+    parser_init.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes for `-f`, 0 to use all CPUs. Default: 1",
+    )
 
     parser_add = subparsers.add_parser("add", help="Add or update a record in CHANGELOG.md")
     parser_add.add_argument(
@@ -104,11 +153,10 @@ def parse_args(args: Sequence[str]) -> argparse.Namespace:
     )
     parser_add.add_argument(
         "section",
-        help="Section name or `All`",
+        help="Section name, alias or `All`",
         nargs="?",
-        type=lambda x: x.lower(),
+        type=get_section_title,
         default=SECTION_ALL,
-        choices=[SECTION_ALL, *SECTION_TITLES],
     )
     parser_add.add_argument(
         "-i",
@@ -138,11 +186,10 @@ def parse_args(args: Sequence[str]) -> argparse.Namespace:
     )
     parser_set.add_argument(
         "section",
-        help="Section name or `All`",
+        help="Section name, alias or `All`",
         nargs="?",
-        type=lambda x: x.lower(),
+        type=get_section_title,
         default=SECTION_ALL,
-        choices=[SECTION_ALL, *SECTION_TITLES],
     )
     parser_set.add_argument(
         "-i",
@@ -173,11 +220,10 @@ def parse_args(args: Sequence[str]) -> argparse.Namespace:
     )
     parser_get.add_argument(
         "section",
-        help="Section name or `All`",
+        help="Section name, alias or `All`",
         nargs="?",
-        type=lambda x: x.lower(),
+        type=get_section_title,
         default=SECTION_ALL,
-        choices=[SECTION_ALL, *SECTION_TITLES],
     )
     parser_get.add_argument(
         "-p",
@@ -186,6 +232,12 @@ def parse_args(args: Sequence[str]) -> argparse.Namespace:
         default=Path.cwd() / "CHANGELOG.md",
         help="Full path to changelog file. Default: ./CHANGELOG.md",
     )
+    parser_get.add_argument(
+        "--from-archive",
+        type=Path,
+        default=None,
+        help="Read changelog from a wheel, sdist, zip or tar archive instead",
+    )
 
     parser_format = subparsers.add_parser("format", help="Format release notes")
     parser_format.add_argument(
@@ -194,6 +246,14 @@ def parse_args(args: Sequence[str]) -> argparse.Namespace:
         default=None,
         help="Change notes, can be provided as a pipe-in as well.",
     )
+    parser_format.add_argument(
+        "--input-file",
+        type=Path,
+        default=None,
+        help="Path to a file with change notes.",
+    )
+    # pipe-in is streamed by `StreamFormatter` instead of being read at once
+    parser_format.set_defaults(input_stream=None)
 
     parser_list = subparsers.add_parser("list", help="List versions")
     parser_list.add_argument(
@@ -203,6 +263,12 @@ def parse_args(args: Sequence[str]) -> argparse.Namespace:
         default=Path.cwd() / "CHANGELOG.md",
         help="Full path to changelog file. Default: ./CHANGELOG.md",
     )
+    parser_list.add_argument(
+        "--from-archive",
+        type=Path,
+        default=None,
+        help="Read changelog from a wheel, sdist, zip or tar archive instead",
+    )
 
     parser_version = subparsers.add_parser(
         "version", help="Bump version according to release notes"
@@ -361,11 +427,292 @@ def parse_args(args: Sequence[str]) -> argparse.Namespace:
         help="Created date in `YYYY-MM-DD` format.",
     )
 
+    parser_diff = subparsers.add_parser(
+        "diff", help="Show added, removed and changed entries between two changelogs"
+    )
+    parser_diff.add_argument(
+        "old",
+        help="Old changelog path or `<revision>:<path>`",
+    )
+    parser_diff.add_argument(
+        "new",
+        help="New changelog path or `<revision>:<path>`",
+    )
+    parser_diff.add_argument(
+        "--json",
+        action="store_true",
+        help="Output changes as JSON",
+    )
+
+    parser_archive = subparsers.add_parser(
+        "archive", help="Move old releases to `CHANGELOG-<major>.x.md` shards"
+    )
+    parser_archive.add_argument(
+        "--before",
+        type=Version,
+        required=True,
+        help="Archive releases older than this version",
+    )
+    parser_archive.add_argument(
+        "-p",
+        "--changelog-path",
+        type=get_changelog_path,
+        default=Path.cwd() / "CHANGELOG.md",
+        help="Full path to changelog file. Default: ./CHANGELOG.md",
+    )
+
+    parser_aggregate = subparsers.add_parser(
+        "aggregate", help="Combine changelogs of many packages into one"
+    )
+    parser_aggregate.add_argument(
+        "paths",
+        nargs="+",
+        type=get_changelog_path,
+        help="Paths to package changelogs or their folders, folder name is a package name",
+    )
+    parser_aggregate.add_argument(
+        "--sort",
+        choices=(AGGREGATE_SORT_DATE, AGGREGATE_SORT_VERSION),
+        default=AGGREGATE_SORT_DATE,
+        help="Order releases by date or by version. Default: date",
+    )
+    parser_aggregate.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        default=None,
+        help="Write combined changelog to a file instead of stdout",
+    )
+    parser_aggregate.add_argument(
+        "--cache-path",
+        type=Path,
+        default=None,
+        help="Parsed changelogs cache. Default: ~/.cache/logchange/aggregate.json",
+    )
+    parser_aggregate.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write parsed changelogs cache",
+    )
+    parser_aggregate.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes, 0 to use all CPUs. Default: 1",
+    )
+
+    parser_merge_driver = subparsers.add_parser(
+        "merge-driver", help="Git merge driver: `logchange merge-driver %%O %%A %%B`"
+    )
+    parser_merge_driver.add_argument("base", type=Path, help="Common ancestor version, `%%O`")
+    parser_merge_driver.add_argument(
+        "ours", type=Path, help="Current version, `%%A`, merge result is written here"
+    )
+    parser_merge_driver.add_argument("theirs", type=Path, help="Other branch version, `%%B`")
+    parser_merge_driver.add_argument(
+        "--marker-size", type=int, default=7, help="Conflict marker size, `%%L`. Default: 7"
+    )
+
+    parser_where = subparsers.add_parser(
+        "where", help="Find releases that mention an issue, PR or commit reference"
+    )
+    parser_where.add_argument("ref", help="Reference: `#123`, `123`, `ABC-123` or commit SHA")
+    parser_where.add_argument(
+        "-p",
+        "--changelog-path",
+        type=get_changelog_path,
+        default=Path.cwd() / "CHANGELOG.md",
+        help="Full path to changelog file. Default: ./CHANGELOG.md",
+    )
+    parser_where.add_argument(
+        "--pattern",
+        action="append",
+        dest="patterns",
+        default=None,
+        help="Reference regular expression, can be used several times."
+        " Default: `#123`, `ABC-123` and commit SHAs",
+    )
+    parser_where.add_argument("--json", action="store_true", help="Output as JSON")
+    parser_where.add_argument(
+        "--cache-path",
+        type=Path,
+        default=None,
+        help="Reference index cache. Default: ~/.cache/logchange/references.json",
+    )
+    parser_where.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write reference index cache",
+    )
+
+    parser_stats = subparsers.add_parser(
+        "stats", help="Show entries per section, release cadence and version bumps"
+    )
+    parser_stats.add_argument(
+        "paths",
+        nargs="*",
+        type=get_changelog_path,
+        help="Paths to changelog files or their folders. Default: ./CHANGELOG.md",
+    )
+    parser_stats.add_argument(
+        "--top", type=int, default=5, help="Number of largest releases to show. Default: 5"
+    )
+    parser_stats.add_argument("--json", action="store_true", help="Output as JSON")
+    parser_stats.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes, 0 to use all CPUs. Default: 1",
+    )
+
+    parser_scan_archives = subparsers.add_parser(
+        "scan-archives", help="List changelog versions of many wheels, sdists and archives"
+    )
+    parser_scan_archives.add_argument(
+        "path",
+        nargs="?",
+        type=Path,
+        default=Path.cwd(),
+        help="Archive or folder to search for archives recursively. Default: current folder",
+    )
+    parser_scan_archives.add_argument("--json", action="store_true", help="Output as JSON")
+    parser_scan_archives.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes, 0 to use all CPUs. Default: 1",
+    )
+
+    parser_watch = subparsers.add_parser(
+        "watch", help="Check changelogs on every change and regenerate derived outputs"
+    )
+    parser_watch.add_argument(
+        "paths",
+        nargs="*",
+        type=get_changelog_path,
+        help="Paths to changelog files or their folders. Default: ./CHANGELOG.md",
+    )
+    parser_watch.add_argument("--json", action="store_true", help="Output updates as JSON lines")
+    parser_watch.add_argument(
+        "--json-out",
+        type=Path,
+        default=None,
+        help="Write parsed records as JSON to this file on every change",
+    )
+    parser_watch.add_argument(
+        "--notes-out",
+        type=Path,
+        default=None,
+        help="Write latest release notes to this file on every change",
+    )
+    parser_watch.add_argument(
+        "--interval",
+        type=float,
+        default=0.5,
+        help="Polling interval in seconds if inotify is not used. Default: 0.5",
+    )
+    parser_watch.add_argument(
+        "--poll",
+        action="store_true",
+        help="Poll modification times even if inotify_simple is installed",
+    )
+    parser_watch.add_argument(
+        "--once",
+        action="store_true",
+        help="Check and write outputs once, exit with code 1 on formatting issues",
+    )
+
+    parser_lint = subparsers.add_parser(
+        "lint", help="Check changelogs for ordering, date, section and version bump issues"
+    )
+    parser_lint.add_argument(
+        "paths",
+        nargs="*",
+        type=get_changelog_path,
+        help="Paths to changelog files or their folders. Default: ./CHANGELOG.md",
+    )
+    parser_lint.add_argument(
+        "--disable",
+        action="append",
+        default=[],
+        metavar="RULE",
+        help="Disable lint rule, can be used multiple times",
+    )
+    parser_lint.add_argument(
+        "--list-rules", action="store_true", help="List available lint rules and exit"
+    )
+    parser_lint.add_argument("--json", action="store_true", help="Output as JSON")
+    parser_lint.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes, 0 to use all CPUs. Default: 1",
+    )
+
+    parser_export = subparsers.add_parser(
+        "export", help="Write a page per release and an index, only changed pages are rewritten"
+    )
+    parser_export.add_argument(
+        "--format",
+        dest="export_format",
+        choices=(EXPORT_FORMAT_HTML, EXPORT_FORMAT_JSON),
+        default=EXPORT_FORMAT_HTML,
+        help="Page format. Default: html",
+    )
+    parser_export.add_argument(
+        "-o", "--out", type=Path, required=True, help="Output folder for pages"
+    )
+    parser_export.add_argument(
+        "--title", default="Changelog", help="Title for pages. Default: Changelog"
+    )
+    parser_export.add_argument(
+        "-p",
+        "--changelog-path",
+        type=get_changelog_path,
+        default=Path.cwd() / "CHANGELOG.md",
+        help="Full path to changelog file. Default: ./CHANGELOG.md",
+    )
+    parser_export.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes, 0 to use all CPUs. Default: 1",
+    )
+
+    parser_from_git = subparsers.add_parser(
+        "from-git", help="Add Unreleased entries from commit subjects since git revision"
+    )
+    parser_from_git.add_argument("since", help="Git revision to start from, e.g. last tag")
+    parser_from_git.add_argument(
+        "--until", default="HEAD", help="Git revision to stop at. Default: HEAD"
+    )
+    parser_from_git.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print new entries instead of writing them to changelog",
+    )
+    parser_from_git.add_argument(
+        "-p",
+        "--changelog-path",
+        type=get_changelog_path,
+        default=Path.cwd() / "CHANGELOG.md",
+        help="Full path to changelog file. Default: ./CHANGELOG.md",
+    )
+
     result = parser.parse_args(args)
+    if hasattr(result, "input_stream"):
+        if not result.input and not result.input_file and not sys.stdin.isatty():
+            result.input_stream = sys.stdin
+        result.input = result.input or ""
     if hasattr(result, "input"):
         if isinstance(result.input, list):
             result.input = " ".join(result.input)
-        if not result.input:
+        if not result.input and not hasattr(result, "input_stream"):
             result.input = get_stdin()
 
     return result
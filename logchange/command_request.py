@@ -0,0 +1,60 @@
+"""
+Immutable CLI command request.
+"""
+import argparse
+from typing import Any, Dict, Type, TypeVar
+
+_R = TypeVar("_R", bound="CommandRequest")
+
+
+class CommandRequest:
+    """
+    Immutable CLI command request.
+
+    Arguments are copied on creation, so changes of the source namespace
+    do not affect running commands.
+
+    Arguments:
+        kwargs -- Command arguments.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        object.__setattr__(self, "_data", dict(kwargs))
+
+    @classmethod
+    def from_namespace(cls: Type[_R], namespace: argparse.Namespace) -> _R:
+        """
+        Create from CLI namespace.
+        """
+        if isinstance(namespace, cls):
+            return namespace
+
+        return cls(**vars(namespace))
+
+    def __getattr__(self, name: str) -> Any:
+        data: Dict[str, Any] = object.__getattribute__(self, "_data")
+        if name not in data:
+            raise AttributeError(f"CommandRequest has no argument {name}")
+
+        return data[name]
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("CommandRequest is immutable, use `replace`")
+
+    def __repr__(self) -> str:
+        data: Dict[str, Any] = object.__getattribute__(self, "_data")
+        args = ", ".join(f"{key}={value!r}" for key, value in data.items())
+        return f"{self.__class__.__name__}({args})"
+
+    def has(self, name: str) -> bool:
+        """
+        Whether argument `name` is set.
+        """
+        return name in object.__getattribute__(self, "_data")
+
+    def replace(self: _R, **kwargs: Any) -> _R:
+        """
+        Create a new request with replaced arguments.
+        """
+        data: Dict[str, Any] = object.__getattribute__(self, "_data")
+        return self.__class__(**{**data, **kwargs})
@@ -0,0 +1,117 @@
+"""
+Commit subject classifier that builds release notes from git history.
+"""
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from logchange.record_body import RecordBody
+from logchange.section_schema import get_schema
+
+
+class CommitNotes(NamedTuple):
+    """
+    Release notes built from commit subjects.
+
+    Arguments:
+        body -- Release body with new entries only
+        entries -- Number of new entries
+        duplicates -- Number of subjects that are already in release notes
+        skipped -- Number of subjects that do not match any section
+    """
+
+    body: RecordBody
+    entries: int
+    duplicates: int
+    skipped: int
+
+
+class CommitClassifier:
+    """
+    Commit subject classifier.
+
+    `Section: text` subjects and section aliases are checked first, like `RecordBody.parse`
+    does for prefixed lines, then conventional commit types, e.g. `fix(parser): text`.
+    Subjects are consumed one by one, only new entries are kept.
+
+    Arguments:
+        types -- Conventional commit types mapped to section titles.
+    """
+
+    CONVENTIONAL_TYPES = {
+        "feat": "added",
+        "fix": "fixed",
+        "perf": "changed",
+        "refactor": "changed",
+        "deprecate": "deprecated",
+        "remove": "removed",
+        "security": "security",
+    }
+
+    _CONVENTIONAL_RE = re.compile(r"^(?P<type>\w+)(?:\((?P<scope>[^)]*)\))?!?:\s*(?P<text>\S.*)$")
+
+    def __init__(self, types: Optional[Dict[str, str]] = None) -> None:
+        self.types = dict(self.CONVENTIONAL_TYPES if types is None else types)
+
+    def classify(self, subject: str) -> Tuple[str, str]:
+        """
+        Get section title and entry text for commit `subject`.
+
+        Returns:
+            Section title and entry text, empty strings if subject has no section.
+        """
+        subject = subject.strip()
+        title = get_schema().parse_prefix(subject)
+        if title:
+            return title, subject[subject.find(":") + 1 :].strip()
+
+        match = self._CONVENTIONAL_RE.match(subject)
+        if not match:
+            return "", ""
+        title = self.types.get(match.group("type").lower(), "")
+        if not title:
+            return "", ""
+
+        text = match.group("text").strip()
+        scope = match.group("scope")
+        if scope:
+            text = f"{scope}: {text}"
+        return title, text
+
+    def build_notes(
+        self, subjects: Iterable[str], existing: Optional[RecordBody] = None
+    ) -> CommitNotes:
+        """
+        Build release notes from commit subjects.
+
+        Arguments:
+            subjects -- Commit subjects.
+            existing -- Current release notes, their entries are not added again.
+
+        Returns:
+            Release notes with new entries only.
+        """
+        entries: Dict[str, Dict[str, None]] = {}
+        if existing is not None:
+            for section in existing.sections:
+                entries[section.title] = dict.fromkeys(section.entries)
+        new_entries: Dict[str, List[str]] = {}
+        duplicates = 0
+        skipped = 0
+        for subject in subjects:
+            title, text = self.classify(subject)
+            if not title or not text:
+                skipped += 1
+                continue
+
+            entry = f"- {text}"
+            section_entries = entries.setdefault(title, {})
+            if entry in section_entries:
+                duplicates += 1
+                continue
+            section_entries[entry] = None
+            new_entries.setdefault(title, []).append(entry)
+
+        body = RecordBody()
+        for title, lines in new_entries.items():
+            body.set_section(title, "\n".join(lines))
+        return CommitNotes(body, sum(len(i) for i in new_entries.values()), duplicates, skipped)
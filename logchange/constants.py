@@ -7,6 +7,14 @@ SECTION_ALL = "all"
 LATEST = "latest"
 UNRELEASED = "unreleased"
 
+AGGREGATE_SORT_DATE = "date"
+AGGREGATE_SORT_VERSION = "version"
+
+EXPORT_FORMAT_HTML = "html"
+EXPORT_FORMAT_JSON = "json"
+
+COMPRESSED_SUFFIXES = (".gz", ".xz", ".bz2")
+
 NEW_CHANGELOG = """# Changelog
 All notable changes to this project will be documented in this file.
 
@@ -2,18 +2,38 @@
 CLI commands executor.
 """
 import argparse
-import datetime
+import io
+import itertools
+import json
 import logging
+import os
+import threading
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Optional, TextIO
 
 from newversion import Version
 from newversion.eol_fixer import EOLFixer
 from newversion.utils import print_path
 
 from logchange.changelog import ChangeLog
+from logchange.changelog_diff import ChangeLogDiff
+from logchange.changelog_file import ChangeLogFile
+from logchange.command_request import CommandRequest
 from logchange.constants import LATEST, LOGGER_NAME, NEW_CHANGELOG, SECTION_ALL, UNRELEASED
+from logchange.git import GitError, get_revision_text
+from logchange.path_locks import PATH_LOCKS
+from logchange.profiler import PROFILER
 from logchange.record import Record
 from logchange.record_body import RecordBody
+from logchange.reference_index import ReferenceIndex, ReferenceIndexError
+from logchange.section_schema import SectionSchema, SectionSchemaError, get_schema, use_schema
+from logchange.session import ChangeLogSession, ChangeLogSessionError
+from logchange.shards import ShardManifest
+from logchange.stream_formatter import StreamFormatter
+from logchange.utils import get_cache_path, get_today
+
+if TYPE_CHECKING:
+    from logchange.watcher import WatchedChangeLog, WatchUpdate
 
 
 class ExecutorError(Exception):
@@ -22,26 +42,59 @@ class ExecutorError(Exception):
     """
 
 
+class _ExecutionState:
+    """
+    Executor state for a single `execute` call.
+    """
+
+    def __init__(self) -> None:
+        self.input: Optional[str] = None
+        self.is_crlf_input = False
+        self.session: Optional[ChangeLogSession] = None
+
+
 class Executor:
     """
     CLI commands executor.
 
+    `config` is copied to an immutable `CommandRequest`. Per-call state is thread-local
+    and commands hold a reentrant lock for changelog path, so one executor
+    or many executors can run in a thread pool.
+
+    Modules used by a single command are imported in its `_command_*` method,
+    so every CLI call does not pay for importing all of them.
+
     Arguments:
         config -- CLI namespace.
+        output -- Stream for commands that write output directly, e.g. `format`.
     """
 
-    def __init__(self, config: argparse.Namespace) -> None:
-        self._config = config
-        self._is_crlf_le = False
+    def __init__(self, config: argparse.Namespace, output: Optional[TextIO] = None) -> None:
+        self._config = CommandRequest.from_namespace(config)
+        self._output = output
+        self._local = threading.local()
         self._logger = logging.getLogger(LOGGER_NAME)
 
+    @property
+    def _state(self) -> _ExecutionState:
+        state: Optional[_ExecutionState] = getattr(self._local, "state", None)
+        if state is None:
+            state = _ExecutionState()
+            self._local.state = state
+
+        return state
+
     @property
     def input(self) -> str:
         """
-        Pipe-in input.
+        Pipe-in input with `\\n` line endings.
         """
-        self._is_crlf_le = EOLFixer.is_crlf(self._config.input)
-        return EOLFixer.to_lf(self._config.input)
+        state = self._state
+        if state.input is None:
+            state.is_crlf_input = EOLFixer.is_crlf(self._config.input)
+            state.input = EOLFixer.to_lf(self._config.input)
+
+        return state.input
 
     @property
     def changelog_path(self) -> Path:
@@ -50,57 +103,77 @@ class Executor:
         """
         return self._config.changelog_path
 
+    @property
+    def session(self) -> ChangeLogSession:
+        """
+        Changelog session, changelog is read and parsed once per `execute` call.
+        """
+        state = self._state
+        if state.session is None:
+            state.session = ChangeLogSession(self.changelog_path)
+
+        return state.session
+
+    @property
+    def changelog_file(self) -> ChangeLogFile:
+        """
+        Changelog file reader and writer.
+        """
+        return self.session.file
+
     @staticmethod
     def get_today() -> str:
         """
         Get today date in `YYYY-MM-DD` format.
         """
-        return datetime.datetime.now().date().strftime("%Y-%m-%d")
+        return get_today()
 
     @property
     def changelog(self) -> ChangeLog:
         """
         Parsed changelog.
         """
-        if not self.changelog_path.exists():
-            self._logger.warning(f"{print_path(self.changelog_path)} does not exists")
-            return ChangeLog.parse(NEW_CHANGELOG)
-
-        text = self.changelog_path.read_text()
-        self._is_crlf_le = EOLFixer.is_crlf(text)
-        return ChangeLog.parse(EOLFixer.to_lf(text))
+        return self.session.changelog
 
-    def save_changelog(self, changelog: ChangeLog) -> None:
+    def save_changelog(self) -> None:
         """
-        Save changelog back to `CHANGELOG.md`.
-
-        Arguments:
-            changelog -- Changelog to save.
+        Save session changelog back to `CHANGELOG.md`.
         """
-        self.changelog_path.write_text(self._fix_eol(changelog.render()))
+        self.session.mark_dirty()
+        self.session.save()
 
     @property
     def release_name(self) -> str:
         return self._config.name
 
-    def _fix_eol(self, text: str) -> str:
-        if not self._is_crlf_le:
-            return text
+    @property
+    def section(self) -> str:
+        """
+        Section title or `all`, aliases are resolved by the changelog's project schema.
+        """
+        section: str = self._config.section
+        if section.lower() == SECTION_ALL:
+            return SECTION_ALL
 
-        return EOLFixer.to_crlf(text)
+        title = get_schema().get_title(section)
+        if not title:
+            raise ExecutorError(f"Unknown section: {section}")
 
-    @staticmethod
-    def _as_md_list(text: str) -> str:
-        if not text.strip():
-            return text
+        return title
 
-        if "\n" in text:
-            return text
+    def _get_schema(self) -> SectionSchema:
+        project_path = self.changelog_path.parent if self._config.has("changelog_path") else None
+        try:
+            return get_schema(project_path)
+        except SectionSchemaError as e:
+            raise ExecutorError(e) from None
 
-        if text.strip().startswith("-"):
+    def _fix_eol(self, text: str) -> str:
+        # output follows pipe-in input, changelog line endings are kept only in the file
+        if not self._state.is_crlf_input:
             return text
 
-        return f"- {text}"
+        return EOLFixer.to_crlf(text)
 
     def execute(self) -> str:
         """
@@ -125,16 +198,45 @@ class Executor:
             "fixed": self._command_add_unreleased,
             "security": self._command_add_unreleased,
             "release": self._command_release,
+            "diff": self._command_diff,
+            "archive": self._command_archive,
+            "aggregate": self._command_aggregate,
+            "merge-driver": self._command_merge_driver,
+            "where": self._command_where,
+            "stats": self._command_stats,
+            "scan-archives": self._command_scan_archives,
+            "watch": self._command_watch,
+            "lint": self._command_lint,
+            "export": self._command_export,
+            "from-git": self._command_from_git,
         }
         command = self._config.command
         if command not in commands:
             raise ExecutorError(f"Unknown command: {command}")
 
-        return self._fix_eol(commands[self._config.command]())
+        # sections, aliases and bump rules come from the changelog's project
+        schema = self._get_schema()
+        # nested calls on the same thread get their own state, outer one is restored
+        outer_state = getattr(self._local, "state", None)
+        self._local.state = _ExecutionState()
+        with PROFILER.phase("execute"), self._get_lock(), use_schema(schema):
+            try:
+                return self._fix_eol(commands[self._config.command]())
+            except (ChangeLogSessionError, SectionSchemaError) as e:
+                raise ExecutorError(e) from None
+            finally:
+                self._local.state = outer_state
+
+    def _get_lock(self) -> Any:
+        if not self._config.has("changelog_path"):
+            # command does not touch changelog file, nothing to share
+            return threading.RLock()
+
+        return PATH_LOCKS.get(self.changelog_path)
 
     def _command_init(self) -> str:
         if not self.changelog_path.exists():
-            self.changelog_path.write_text(NEW_CHANGELOG)
+            self.changelog_file.write(NEW_CHANGELOG)
             self._logger.info(f"{print_path(self.changelog_path)} created successfully.")
             return ""
 
@@ -144,10 +246,9 @@ class Executor:
             )
             return ""
 
-        text = self.changelog_path.read_text()
-        self._is_crlf_le = EOLFixer.is_crlf(text)
-        changelog = ChangeLog.parse(EOLFixer.to_lf(text))
-        changelog.format_released()
+        text = self.changelog_file.read()
+        changelog = ChangeLog.parse(text)
+        changelog.format_released(workers=self._config.workers or os.cpu_count() or 1)
         new_text = changelog.render()
         if new_text == text:
             self._logger.info(
@@ -155,99 +256,117 @@ class Executor:
             )
             return ""
 
-        self.changelog_path.write_text(self._fix_eol(changelog.render()))
+        self.changelog_file.write(new_text)
         self._logger.info(f"{print_path(self.changelog_path)} reformatted.")
         return ""
 
-    def _get_record(self, changelog: ChangeLog, release_name: str) -> Record:
-        if release_name == UNRELEASED:
-            return changelog.get_unreleased()
-        if release_name == LATEST:
-            record = changelog.get_latest()
-            if record is not None:
-                return record
-            raise ExecutorError(
-                f"No releases found in {print_path(self.changelog_path)}, pass explicit version"
-            )
-
-        record = changelog.get_record(Version(release_name))
-        if record is not None:
-            return record
-
-        self._logger.info(f"Record {release_name} not found, added")
-        return Record(Version(release_name), "", self.get_today())
-
     def _command_add_unreleased(self) -> str:
-        self._config.section = self._config.command
-        self._config.name = UNRELEASED
-        self._config.created = self.get_today()
-        return self._command_add()
+        self.session.add(UNRELEASED, self.input, section=self._config.command, created=get_today())
+        self.session.save()
+        return ""
 
     def _command_add(self) -> str:
-        release_name = self.release_name
-        changelog = self.changelog
-        record = self._get_record(changelog, release_name)
+        self.session.add(
+            self.release_name,
+            self.input,
+            section=self.section,
+            created=self._config.created,
+        )
+        self.session.save()
+        return ""
 
-        if self._config.section == SECTION_ALL:
-            record.merge(RecordBody.parse(self.input))
-        else:
-            section_name = self._config.section
-            record.append_section(section_name, self._as_md_list(self.input))
+    def _command_set(self) -> str:
+        self.session.set(
+            self.release_name,
+            self.input,
+            section=self.section,
+            created=self._config.created,
+        )
+        self.session.save()
+        return ""
 
-        if self._config.created:
-            record.created = self._config.created
+    @property
+    def _archive_path(self) -> Optional[Path]:
+        if not self._config.has("from_archive"):
+            return None
 
-        changelog.update_release(record)
-        self.save_changelog(changelog)
-        return ""
+        return self._config.from_archive
 
-    def _command_set(self) -> str:
-        release_name = self.release_name
-        changelog = self.changelog
-        record = self._get_record(changelog, release_name)
+    def _read_archive_changelog(self) -> ChangeLog:
+        from logchange.archive_reader import ArchiveReader, ArchiveReaderError
 
-        if self._config.section == SECTION_ALL:
-            record.set_body(self.input)
-        else:
-            section_name = self._config.section
-            value = self._as_md_list(self.input)
-            record.set_section(section_name, value)
+        archive_path = self._archive_path
+        if archive_path is None:
+            raise ExecutorError("Archive path is not set")
 
-        if self._config.created:
-            record.created = self._config.created
+        try:
+            return ArchiveReader(archive_path).read_changelog()
+        except ArchiveReaderError as e:
+            raise ExecutorError(e) from None
 
-        changelog.update_release(record)
-        self.save_changelog(changelog)
-        return ""
+    def _get_archive_record(self, name: str) -> Optional[Record]:
+        changelog = self._read_archive_changelog()
+        if name == UNRELEASED:
+            return changelog.get_unreleased()
+        if name == LATEST:
+            return changelog.get_latest()
+
+        return changelog.get_record(Version(name))
 
     def _command_get(self) -> str:
-        changelog = self.changelog
-        record_name = self._config.name
-        if record_name == UNRELEASED:
-            record = changelog.get_unreleased()
-        elif record_name == LATEST:
-            record = changelog.get_latest()
+        if self._archive_path:
+            record = self._get_archive_record(self._config.name)
+        elif self._config.name == LATEST:
+            # read only up to the second release
+            record = next(self.session.iterate_records(), None)
         else:
-            record = changelog.get_record(Version(record_name))
-
+            record = self.session.get(self._config.name)
         if record is None:
             return ""
 
-        if self._config.section == SECTION_ALL:
+        section_title = self.section
+        if section_title == SECTION_ALL:
             return record.render()
-        section = record.body.get_section(self._config.section)
+        section = record.body.get_section(section_title)
         if section:
             return section.body
 
         return ""
 
+    def _open_format_source(self) -> TextIO:
+        input_file: Optional[Path] = None
+        if self._config.has("input_file"):
+            input_file = self._config.input_file
+        if input_file:
+            if not input_file.exists():
+                raise ExecutorError(f"{print_path(input_file)} does not exist")
+            return input_file.open(encoding=StreamFormatter.ENCODING, newline="")
+
+        return io.StringIO(self._config.input or "")
+
     def _command_format(self) -> str:
-        record_body = RecordBody.parse(self.input)
-        record_body.sanitize()
-        return record_body.render()
+        input_stream: Optional[TextIO] = None
+        if self._config.has("input_stream"):
+            input_stream = self._config.input_stream
+        source = input_stream or self._open_format_source()
+        try:
+            if self._output is None:
+                output = io.StringIO()
+                StreamFormatter().format(source, output)
+                return output.getvalue()
+
+            if StreamFormatter().format(source, self._output):
+                self._output.write("\n")
+            return ""
+        finally:
+            if source is not input_stream:
+                source.close()
 
     def _command_list(self) -> str:
-        records = list(self.changelog.iterate_records())
+        if self._archive_path:
+            records = list(self._read_archive_changelog().iterate_records())
+        else:
+            records = list(self.session.iterate_records())
         return "\n".join([i.version.dumps() for i in records])
 
     def _command_version(self) -> str:
@@ -269,19 +388,280 @@ class Executor:
         return record_body.bump_rc_version(old_version).dumps()
 
     def _command_release(self) -> str:
+        self.session.release(self._config.version, created=self._config.created)
+        self.session.save()
+        return ""
+
+    def _read_changelog_source(self, value: str) -> ChangeLog:
+        path = Path(value)
+        if not path.exists() and ":" in value:
+            revision, revision_path = value.split(":", 1)
+            try:
+                text = get_revision_text(revision, revision_path, Path.cwd())
+            except GitError as e:
+                raise ExecutorError(e) from None
+            return ChangeLog.parse(EOLFixer.to_lf(text))
+
+        if not path.exists():
+            raise ExecutorError(f"{print_path(path)} does not exist")
+
+        return ChangeLog.parse(ChangeLogFile(path).read())
+
+    def _command_diff(self) -> str:
+        old_changelog = self._read_changelog_source(self._config.old)
+        new_changelog = self._read_changelog_source(self._config.new)
+        changelog_diff = ChangeLogDiff(old_changelog, new_changelog)
+        if self._config.json:
+            return json.dumps(
+                [i.as_dict() for i in changelog_diff.iterate_record_diffs()], indent=2
+            )
+
+        return changelog_diff.render()
+
+    def _command_archive(self) -> str:
         changelog = self.changelog
-        record = changelog.get_record(self._config.version)
+        manifest = ShardManifest.load(self.changelog_path)
+        records = manifest.archive(changelog, self._config.before)
+        if not records:
+            self._logger.info(f"No releases older than {self._config.before} found")
+            return ""
 
-        if record is None:
-            record = Record(self._config.version, "", self.get_today())
+        manifest.save()
+        self.save_changelog()
+        shard_paths = sorted({print_path(manifest.get_shard_path(i.version)) for i in records})
+        self._logger.info(f"{len(records)} releases archived to {', '.join(shard_paths)}")
+        return ""
+
+    def _command_aggregate(self) -> str:
+        from logchange.aggregate import AggregateCache, AggregateError, ChangeLogAggregator
+
+        cache = None
+        if not self._config.no_cache:
+            cache = AggregateCache(self._config.cache_path or get_cache_path("aggregate.json"))
+        aggregator = ChangeLogAggregator(
+            self._config.paths, cache=cache, workers=self._config.workers or os.cpu_count() or 1
+        )
+        output_path: Optional[Path] = self._config.output
+        try:
+            if output_path:
+                with output_path.open("w", encoding="utf-8", newline="") as output_file:
+                    aggregator.write(output_file, self._config.sort)
+                self._logger.info(f"{print_path(output_path)} written")
+                return ""
+
+            if self._output is None:
+                output = io.StringIO()
+                aggregator.write(output, self._config.sort)
+                return output.getvalue().rstrip("\n")
+
+            aggregator.write(self._output, self._config.sort)
+            return ""
+        except AggregateError as e:
+            raise ExecutorError(e) from None
+
+    def _command_merge_driver(self) -> str:
+        from logchange.changelog_merge import ChangeLogMerge
+
+        changelog_files = []
+        for path in (self._config.base, self._config.ours, self._config.theirs):
+            if not path.exists():
+                raise ExecutorError(f"{print_path(path)} does not exist")
+            changelog_files.append(ChangeLogFile(path))
+
+        base, ours, theirs = [ChangeLog.parse(i.read()) for i in changelog_files]
+        result = ChangeLogMerge(base, ours, theirs, self._config.marker_size).merge()
+        # keeps line endings of the current version
+        changelog_files[1].write(result.text)
+        if result.conflicts:
+            raise ExecutorError(f"Merge conflicts: {', '.join(result.conflicts)}")
+
+        return ""
 
-        if self._config.created:
-            record.created = self._config.created
+    def _get_reference_index(self) -> ReferenceIndex:
+        from logchange.reference_cache import ReferenceIndexCache
 
-        unreleased = changelog.get_unreleased()
-        record.merge(unreleased.body)
-        unreleased.body.clear()
+        patterns = self._config.patterns or ReferenceIndex.DEFAULT_PATTERNS
+        cache = None
+        if not self._config.no_cache and self.changelog_path.exists():
+            cache = ReferenceIndexCache(
+                self._config.cache_path or get_cache_path("references.json")
+            )
+            index = cache.get(self.changelog_path, patterns)
+            if index is not None:
+                return index
+
+        try:
+            index = self.changelog.get_reference_index(patterns)
+        except ReferenceIndexError as e:
+            raise ExecutorError(e) from None
+        if cache:
+            cache.save(self.changelog_path, index)
+        return index
+
+    def _command_where(self) -> str:
+        references = self._get_reference_index().find(self._config.ref)
+        if self._config.json:
+            return json.dumps([i._asdict() for i in references], indent=2)
+        if not references:
+            raise ExecutorError(
+                f"{self._config.ref} not found in {print_path(self.changelog_path)}"
+            )
+
+        return "\n".join(i.render() for i in references)
+
+    def _command_stats(self) -> str:
+        from logchange.changelog_stats import collect_stats
+
+        paths = self._config.paths or [Path.cwd() / "CHANGELOG.md"]
+        for path in paths:
+            if not path.exists():
+                raise ExecutorError(f"{print_path(path)} does not exist")
+
+        stats = collect_stats(
+            paths, top=self._config.top, workers=self._config.workers or os.cpu_count() or 1
+        )
+        if self._config.json:
+            return json.dumps([i.as_dict() for i in stats], indent=2)
+
+        return "\n\n".join(i.render() for i in stats)
+
+    def _command_scan_archives(self) -> str:
+        from logchange.archive_reader import find_archives, scan_archives
+
+        path: Path = self._config.path
+        if not path.exists():
+            raise ExecutorError(f"{print_path(path)} does not exist")
+
+        paths = list(find_archives(path)) if path.is_dir() else [path]
+        results = scan_archives(paths, workers=self._config.workers or os.cpu_count() or 1)
+        if self._config.json:
+            return json.dumps([i.as_dict() for i in results], indent=2)
+
+        return "\n".join(i.render() for i in results)
+
+    def _write_watch_outputs(self, changelog: "WatchedChangeLog") -> None:
+        json_out: Optional[Path] = self._config.json_out
+        notes_out: Optional[Path] = self._config.notes_out
+        if json_out:
+            json_out.write_text(json.dumps(changelog.as_dict(), indent=2), encoding="utf-8")
+        if notes_out:
+            notes_out.write_text(f"{changelog.get_notes()}\n", encoding="utf-8")
+
+    def _write_watch_update(self, output: TextIO, update: "WatchUpdate") -> None:
+        if self._config.json:
+            output.write(f"{json.dumps(update.as_dict())}\n")
+        else:
+            output.write(f"{update.render()}\n")
+        output.flush()
+
+    def _command_watch(self) -> str:
+        from logchange.watcher import ChangeLogWatcher
+
+        paths = self._config.paths or [Path.cwd() / "CHANGELOG.md"]
+        for path in paths:
+            if not path.exists():
+                raise ExecutorError(f"{print_path(path)} does not exist")
+        if len(paths) > 1 and (self._config.json_out or self._config.notes_out):
+            raise ExecutorError("--json-out and --notes-out support only one changelog")
+
+        output = self._output or io.StringIO()
+        watcher = ChangeLogWatcher(
+            paths, interval=self._config.interval, use_inotify=not self._config.poll
+        )
+        has_issues = False
+        try:
+            updates: Iterable["WatchUpdate"] = watcher.check()
+            if not self._config.once:
+                updates = itertools.chain(updates, watcher.watch())
+            for update in updates:
+                has_issues = has_issues or bool(update.issues)
+                self._write_watch_outputs(watcher.changelogs[paths[0]])
+                self._write_watch_update(output, update)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            watcher.close()
+
+        if self._config.once and has_issues:
+            raise ExecutorError("Formatting issues found")
+        if self._output is None:
+            return output.getvalue().rstrip("\n")
+        return ""
+
+    def _command_lint(self) -> str:
+        from logchange.changelog_lint import ChangeLogLintError, get_lint_rules, lint_paths
+
+        try:
+            rules = get_lint_rules()
+        except ChangeLogLintError as e:
+            raise ExecutorError(e) from None
+        if self._config.list_rules:
+            return "\n".join(f"{name}: {rule.description}" for name, rule in rules.items())
+
+        for name in self._config.disable:
+            if name not in rules:
+                raise ExecutorError(f"Unknown lint rule: {name}")
+        paths = self._config.paths or [Path.cwd() / "CHANGELOG.md"]
+        for path in paths:
+            if not path.exists():
+                raise ExecutorError(f"{print_path(path)} does not exist")
+
+        issues = lint_paths(
+            paths,
+            disabled=self._config.disable,
+            workers=self._config.workers or os.cpu_count() or 1,
+        )
+        if self._config.json:
+            output = json.dumps([i.as_dict() for i in issues], indent=2)
+        else:
+            output = "\n".join(i.render() for i in issues)
+        if not issues:
+            return output
+
+        # issues are written before exit code 1
+        if self._output is not None:
+            self._output.write(f"{output}\n")
+        raise ExecutorError(f"Found {len(issues)} lint issues")
+
+    def _command_export(self) -> str:
+        from logchange.changelog_export import ChangeLogExporter, ChangeLogExportError
+
+        if not self.changelog_path.exists():
+            raise ExecutorError(f"{print_path(self.changelog_path)} does not exist")
+
+        try:
+            exporter = ChangeLogExporter(
+                self._config.out,
+                self._config.export_format,
+                title=self._config.title,
+                workers=self._config.workers or os.cpu_count() or 1,
+            )
+            result = exporter.export(self.changelog)
+        except ChangeLogExportError as e:
+            raise ExecutorError(e) from None
+
+        self._logger.info(f"{print_path(self._config.out)}: {result.render()}")
+        return ""
 
-        changelog.update_release(record)
-        self.save_changelog(changelog)
+    def _command_from_git(self) -> str:
+        from logchange.commit_classifier import CommitClassifier
+        from logchange.git import iterate_log_subjects
+
+        revision_range = f"{self._config.since}..{self._config.until}"
+        subjects = iterate_log_subjects(revision_range, self.changelog_path.parent)
+        unreleased = self.changelog.get_unreleased()
+        try:
+            notes = CommitClassifier().build_notes(subjects, existing=unreleased.body)
+        except GitError as e:
+            raise ExecutorError(e) from None
+
+        self._logger.info(
+            f"{revision_range}: {notes.entries} new entries, {notes.duplicates} already added,"
+            f" {notes.skipped} commits without section"
+        )
+        if self._config.dry_run:
+            return notes.body.render()
+        if notes.entries:
+            self.session.merge(UNRELEASED, notes.body, created=get_today())
+            self.session.save()
         return ""
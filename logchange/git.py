@@ -0,0 +1,82 @@
+"""
+Helpers to read data from a git repository.
+"""
+import io
+import subprocess
+from pathlib import Path
+from typing import Iterator
+
+
+class GitError(Exception):
+    """
+    Git command failed.
+    """
+
+
+def get_revision_text(revision: str, path: str, cwd: Path) -> str:
+    """
+    Get file text at given git revision.
+
+    Arguments:
+        revision -- Git revision, e.g. `HEAD~1` or `main`.
+        path -- File path relative to repository root, or `./`-prefixed relative to `cwd`.
+        cwd -- Working directory for git.
+
+    Returns:
+        File text.
+    """
+    try:
+        result = subprocess.run(
+            ["git", "show", f"{revision}:{path}"],
+            cwd=cwd.as_posix(),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=False,
+        )
+    except OSError as e:
+        raise GitError(f"Cannot run git: {e}") from None
+
+    if result.returncode:
+        stderr = result.stderr.decode(errors="replace").strip()
+        raise GitError(f"Cannot read {revision}:{path}: {stderr}")
+
+    return result.stdout.decode()
+
+
+def iterate_log_subjects(revision_range: str, cwd: Path) -> Iterator[str]:
+    """
+    Stream commit subjects from a single `git log` process, oldest first.
+
+    Merge commits are skipped. If iteration is stopped early, `git` is killed.
+
+    Arguments:
+        revision_range -- Git revision range, e.g. `v1.0.0..HEAD`.
+        cwd -- Working directory for git.
+
+    Yields:
+        Commit subject.
+    """
+    try:
+        process = subprocess.Popen(
+            ["git", "log", "--no-merges", "--reverse", "--format=%s", revision_range, "--"],
+            cwd=cwd.as_posix(),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+    except OSError as e:
+        raise GitError(f"Cannot run git: {e}") from None
+
+    is_finished = False
+    try:
+        if process.stdout is not None:
+            for line in io.TextIOWrapper(process.stdout, encoding="utf-8", errors="replace"):
+                yield line.rstrip("\n")
+        is_finished = True
+    finally:
+        if not is_finished:
+            process.kill()
+        _, stderr = process.communicate()
+
+    if process.returncode:
+        message = stderr.decode(errors="replace").strip()
+        raise GitError(f"Cannot read git log {revision_range}: {message}")
@@ -1,10 +1,16 @@
 import argparse
 import logging
+import os
 import sys
+import time
+from pathlib import Path
+from typing import Optional, TextIO
 
+from logchange import IMPORT_START
 from logchange.cli_parser import parse_args
 from logchange.constants import LOGGER_NAME
 from logchange.executor import Executor, ExecutorError
+from logchange.profiler import PROFILER, Profiler
 
 
 def setup_logging(level: int) -> None:
@@ -25,28 +31,64 @@ class CLIError(Exception):
     """
 
 
-def main_api(config: argparse.Namespace) -> str:
+def main_api(config: argparse.Namespace, output: Optional[TextIO] = None) -> str:
     """
     Main API entrypoint.
+
+    Arguments:
+        config -- CLI namespace.
+        output -- Stream for commands that write output directly.
     """
-    executor = Executor(config)
+    executor = Executor(config, output)
     try:
         return executor.execute()
     except ExecutorError as e:
         raise CLIError(e)
 
 
+def setup_profiler(config: argparse.Namespace) -> str:
+    """
+    Enable profiler from CLI arguments or `LOGCHANGE_PROFILE` environment variables.
+
+    Returns:
+        Profile output format or an empty string if profiler is disabled.
+    """
+    env_profile = os.environ.get("LOGCHANGE_PROFILE", "").lower()
+    if env_profile in ("0", "false"):
+        env_profile = ""
+    dump_path = config.profile_dump or os.environ.get("LOGCHANGE_PROFILE_DUMP", "")
+    if not config.profile and not env_profile and not dump_path:
+        return ""
+
+    profile_format = config.profile_format
+    if env_profile in Profiler.FORMATS:
+        profile_format = env_profile
+
+    PROFILER.enable(Path(dump_path) if dump_path else None)
+    return profile_format
+
+
 def main_cli() -> None:
     """
     Main entrypoint for CLI.
     """
+    start = time.perf_counter()
     config = parse_args(sys.argv[1:])
+    profile_format = setup_profiler(config)
+    if profile_format:
+        # wall-clock time since package import, like other phases
+        PROFILER.add_timing("startup", start - IMPORT_START)
+        PROFILER.add_timing("parse_args", time.perf_counter() - start)
     setup_logging(logging.INFO)
     try:
-        output = main_api(config)
+        output = main_api(config, sys.stdout)
     except CLIError as e:
         sys.stderr.write(f"ERROR {e}\n")
         sys.exit(1)
+    finally:
+        if profile_format:
+            PROFILER.disable()
+            sys.stderr.write(f"{PROFILER.render(profile_format)}\n")
 
     if output:
         sys.stdout.write(f"{output}\n")
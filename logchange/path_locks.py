@@ -0,0 +1,35 @@
+"""
+Per-path reentrant locks for changelog files.
+"""
+import threading
+import weakref
+from pathlib import Path
+from typing import Any
+
+
+class PathLocks:
+    """
+    Registry of reentrant locks, one per resolved file path.
+
+    Locks are kept only while they are in use.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._locks: "weakref.WeakValueDictionary[str, Any]" = weakref.WeakValueDictionary()
+
+    def get(self, path: Path) -> Any:
+        """
+        Get reentrant lock for `path`.
+        """
+        key = path.resolve(strict=False).as_posix()
+        with self._lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = threading.RLock()
+                self._locks[key] = lock
+
+            return lock
+
+
+PATH_LOCKS = PathLocks()
@@ -0,0 +1,183 @@
+"""
+Per-phase timing and profiling instrumentation.
+"""
+import json
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import cProfile
+
+
+class _NullPhase:
+    """
+    Phase context manager that does nothing, used when profiler is disabled.
+    """
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *_: Any) -> None:
+        return None
+
+
+class _Phase:
+    """
+    Phase context manager that adds elapsed time to profiler.
+    """
+
+    def __init__(self, profiler: "Profiler", name: str) -> None:
+        self._profiler = profiler
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, *_: Any) -> None:
+        self._profiler.add_timing(self._name, time.perf_counter() - self._start)
+
+
+class Profiler:
+    """
+    Per-phase timing collector.
+
+    Phase timings are inclusive, so nested phases are counted in their parents too.
+    Hot paths are wrapped only when profiler is enabled, so disabled profiler
+    costs nothing there.
+    """
+
+    FORMAT_TEXT = "text"
+    FORMAT_JSON = "json"
+    FORMATS = (FORMAT_TEXT, FORMAT_JSON)
+
+    _NULL_PHASE = _NullPhase()
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._timings: Dict[str, List[float]] = {}
+        self._originals: List[Tuple[type, str, Any]] = []
+        self._cprofile: Optional["cProfile.Profile"] = None
+        self._dump_path: Optional[Path] = None
+
+    def phase(self, name: str) -> Any:
+        """
+        Get context manager that measures phase `name`.
+        """
+        if not self.enabled:
+            return self._NULL_PHASE
+
+        return _Phase(self, name)
+
+    def add_timing(self, name: str, seconds: float) -> None:
+        """
+        Add `seconds` to phase `name`.
+        """
+        self._timings.setdefault(name, []).append(seconds)
+
+    def _wrap(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with _Phase(self, name):
+                return func(*args, **kwargs)
+
+        wrapper.__doc__ = func.__doc__
+        return wrapper
+
+    def instrument(self, owner: type, attr_name: str, name: str) -> None:
+        """
+        Measure every call of `owner.attr_name` as phase `name` until profiler is disabled.
+        """
+        original = owner.__dict__[attr_name]
+        self._originals.append((owner, attr_name, original))
+        if isinstance(original, classmethod):
+            setattr(owner, attr_name, classmethod(self._wrap(name, original.__func__)))
+            return
+        if isinstance(original, staticmethod):
+            setattr(owner, attr_name, staticmethod(self._wrap(name, original.__func__)))
+            return
+
+        setattr(owner, attr_name, self._wrap(name, original))
+
+    def _instrument_hot_paths(self) -> None:
+        from logchange.changelog import ChangeLog
+        from logchange.record import Record
+        from logchange.record_body import RecordBody
+        from logchange.record_section import RecordSection
+
+        self.instrument(ChangeLog, "parse", "ChangeLog.parse")
+        self.instrument(ChangeLog, "render", "ChangeLog.render")
+        self.instrument(Record, "parse", "Record.parse")
+        self.instrument(Record, "render", "Record.render")
+        self.instrument(RecordBody, "parse", "RecordBody.parse")
+        self.instrument(RecordBody, "render", "RecordBody.render")
+        self.instrument(RecordSection, "render", "RecordSection.render")
+
+    def enable(self, dump_path: Optional[Path] = None) -> None:
+        """
+        Start collecting timings.
+
+        Arguments:
+            dump_path -- Write `cProfile` stats to this path on `disable`.
+        """
+        if self.enabled:
+            return
+
+        self.enabled = True
+        self._timings = {}
+        self._instrument_hot_paths()
+        self._dump_path = dump_path
+        if dump_path:
+            # cProfile is only needed for stats dump
+            import cProfile
+
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def disable(self) -> None:
+        """
+        Stop collecting timings and restore instrumented methods.
+        """
+        if not self.enabled:
+            return
+
+        self.enabled = False
+        for owner, attr_name, original in reversed(self._originals):
+            setattr(owner, attr_name, original)
+        self._originals = []
+
+        if self._cprofile and self._dump_path:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self._dump_path.as_posix())
+        self._cprofile = None
+
+    def get_timings(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get collected timings.
+
+        Returns:
+            Phase name to `calls` and `total` seconds.
+        """
+        return {
+            name: {"calls": len(timings), "total": sum(timings)}
+            for name, timings in self._timings.items()
+        }
+
+    def render(self, output_format: str = FORMAT_TEXT) -> str:
+        """
+        Render collected timings as text table or JSON.
+        """
+        timings = self.get_timings()
+        if output_format == self.FORMAT_JSON:
+            return json.dumps({"phases": timings}, indent=2)
+
+        name_width = max([len(i) for i in timings] + [len("Phase")])
+        lines = [f"{'Phase':<{name_width}}  {'Calls':>7}  {'Total ms':>10}"]
+        for name, timing in timings.items():
+            lines.append(
+                f"{name:<{name_width}}  {timing['calls']:>7}  {timing['total'] * 1000:>10.3f}"
+            )
+        return "\n".join(lines)
+
+
+PROFILER = Profiler()
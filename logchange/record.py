@@ -2,13 +2,14 @@
 Release record.
 """
 import logging
-from typing import Optional, Tuple, Type, TypeVar
+from typing import Any, Dict, Iterable, Optional, Tuple, Type, TypeVar
 
 from newversion import Version
 
-from logchange.constants import LOGGER_NAME, SECTION_TITLES
+from logchange.constants import LOGGER_NAME, UNRELEASED
 from logchange.record_body import RecordBody
 from logchange.record_section import RecordSection
+from logchange.section_schema import get_schema
 from logchange.utils import dedent
 
 _R = TypeVar("_R", bound="Record")
@@ -37,6 +38,8 @@ class Record:
         self.created: str = created
         self._text = text
         self._record_body: Optional[RecordBody] = None
+        self._render_key: Any = None
+        self._rendered = ""
 
     @property
     def name(self) -> str:
@@ -74,13 +77,21 @@ class Record:
     def render(self) -> str:
         """
         Render as text.
+
+        Result is cached until version, date or body is changed.
         """
-        body = self._text
-        if self._record_body:
-            body = self._record_body.render()
+        record_body = self._record_body
+        body_key = record_body.revision if record_body else None
+        render_key = (self.version, self.created, record_body, body_key)
+        if self._render_key == render_key:
+            return self._rendered
+
+        body = record_body.render() if record_body else self._text
         parts = [self._render_title(), body]
         parts = [i for i in parts if i]
-        return self.PARTS_DELIM.join(parts)
+        self._rendered = self.PARTS_DELIM.join(parts)
+        self._render_key = render_key
+        return self._rendered
 
     @staticmethod
     def _parse_title(title: str) -> Tuple[str, str]:
@@ -119,6 +130,20 @@ class Record:
             text=lines,
         )
 
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Convert to JSON-serializable dict.
+        """
+        body = self.body
+        return {
+            "version": UNRELEASED if self.version == Version.zero() else self.version.dumps(),
+            "created": self.created,
+            "prefix": body.prefix,
+            "sections": {i.title: i.entries for i in body.sections},
+            "postfix": body.postfix,
+            "text": body.render(),
+        }
+
     def is_empty(self) -> bool:
         """
         Whether release has no text.
@@ -133,9 +158,9 @@ class Record:
             title -- Section title.
             text -- Section text.
         """
-        old_body = self.body.clone()
+        old_bodies = self._get_section_bodies((self.body.get_section(title).title,))
         self.body.set_section(title, text)
-        self._log_changes(old_body)
+        self._log_changes(old_bodies)
 
     def append_section(self, title: str, text: str) -> None:
         """
@@ -154,9 +179,9 @@ class Record:
 
         Logs changes.
         """
-        old_body = self.body.clone()
+        old_bodies = self._get_section_bodies(get_schema().titles)
         self._record_body = RecordBody.parse(text)
-        self._log_changes(old_body)
+        self._log_changes(old_bodies)
 
     def merge(self, record_body: RecordBody) -> None:
         """
@@ -164,17 +189,25 @@ class Record:
 
         Logs changes.
         """
-        old_body = self.body.clone()
-        self._record_body = old_body.get_merged(record_body)
-        self._log_changes(old_body)
+        old_bodies = self._get_section_bodies([i.title for i in record_body.sections])
+        self._record_body = self.body.get_merged(record_body)
+        self._log_changes(old_bodies)
+
+    def _get_section_bodies(self, section_titles: Iterable[str]) -> Dict[str, str]:
+        """
+        Get bodies of sections touched by a mutation, empty if changes are not logged.
+        """
+        if not self._logger.isEnabledFor(logging.INFO):
+            return {}
+
+        return {i: self.body.get_section(i).body for i in section_titles}
 
-    def _log_changes(self, old_body: RecordBody) -> None:
-        for section_title in SECTION_TITLES:
-            old_section = old_body.get_section(section_title)
+    def _log_changes(self, old_bodies: Dict[str, str]) -> None:
+        for section_title, old_body in old_bodies.items():
             new_section = self.body.get_section(section_title)
-            if new_section.body == old_section.body:
+            if new_section.body == old_body:
                 continue
-            if old_section.is_empty():
+            if not old_body:
                 if not new_section.is_empty():
                     self._logger.info(f"{self.name} `{new_section.title}` section added")
             else:
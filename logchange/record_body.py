@@ -1,9 +1,10 @@
-from typing import Dict, Iterable, Iterator, Type, TypeVar
+import copy
+from typing import Any, Dict, Iterable, Iterator, Tuple, Type, TypeVar
 
 from newversion import Version
 
-from logchange.constants import MAJOR_SECTION_TITLES, MINOR_SECTION_TITLES, SECTION_TITLES
-from logchange.record_section import RecordSection
+from logchange.record_section import REVISIONS, RecordSection
+from logchange.section_schema import get_schema
 from logchange.utils import dedent
 
 _R = TypeVar("_R", bound="RecordBody")
@@ -22,12 +23,48 @@ class RecordBody:
         prefix: str = "",
         postfix: str = "",
     ) -> None:
-        self._sections: Dict[str, RecordSection] = {i: RecordSection(i, "") for i in SECTION_TITLES}
-        self.prefix: str = prefix
-        self.postfix: str = postfix
+        self._sections: Dict[str, RecordSection] = {
+            i: RecordSection(i, "") for i in get_schema().titles
+        }
+        self._prefix = prefix
+        self._postfix = postfix
+        self._revision = next(REVISIONS)
+        self._render_key: Any = None
+        self._rendered = ""
         for section in sections:
             self.append_lines(section.title, section.body)
 
+    @property
+    def prefix(self) -> str:
+        """
+        Text before sections.
+        """
+        return self._prefix
+
+    @prefix.setter
+    def prefix(self, value: str) -> None:
+        self._prefix = value
+        self._revision = next(REVISIONS)
+
+    @property
+    def postfix(self) -> str:
+        """
+        Text after sections.
+        """
+        return self._postfix
+
+    @postfix.setter
+    def postfix(self, value: str) -> None:
+        self._postfix = value
+        self._revision = next(REVISIONS)
+
+    @property
+    def revision(self) -> Tuple[int, ...]:
+        """
+        Revision that changes on every change of body or its sections.
+        """
+        return (self._revision, *(i.revision for i in self._sections.values()))
+
     @property
     def sections(self) -> Iterator[RecordSection]:
         """
@@ -45,10 +82,11 @@ class RecordBody:
         """
         Bump version based on present changelog sections.
         """
+        schema = get_schema()
         section_titles = {i.title for i in self.sections}
-        if section_titles & MAJOR_SECTION_TITLES:
+        if section_titles & schema.major_titles:
             return old_version.bump_major()
-        if section_titles & MINOR_SECTION_TITLES:
+        if section_titles & schema.minor_titles:
             return old_version.bump_minor()
 
         return old_version.bump_micro()
@@ -68,28 +106,33 @@ class RecordBody:
         Get section by `title`.
 
         Arguments:
-            title -- Section title.
+            title -- Section title or alias.
 
         Returns:
             Found Record Section.
         """
-        title = title.lower()
-        if title not in self._sections:
-            raise ValueError(f"Invalid section title: {title}")
+        section = self._sections.get(get_schema().get_title(title))
+        if section is None:
+            raise ValueError(f"Invalid section title: {title.lower()}")
 
-        return self._sections[title.lower()]
+        return section
 
     def render(self) -> str:
         """
         Render to string.
+
+        Result is cached until body or any of its sections is changed.
         """
+        render_key = self.revision
+        if self._render_key == render_key:
+            return self._rendered
+
         parts = []
 
         if self.prefix:
             parts.append(self.prefix)
 
-        for section_title in SECTION_TITLES:
-            section = self.get_section(section_title)
+        for section in self._sections.values():
             if section.is_empty():
                 continue
             parts.append(section.render())
@@ -98,7 +141,9 @@ class RecordBody:
             parts.append(self.postfix)
 
         parts = [i for i in parts if i]
-        return self.PARTS_DELIM.join(parts)
+        self._rendered = self.PARTS_DELIM.join(parts)
+        self._render_key = render_key
+        return self._rendered
 
     def set_section(self, title: str, body: str) -> None:
         """
@@ -134,9 +179,15 @@ class RecordBody:
             New RecordBody.
         """
         result = self.__class__()
-        for section_title in SECTION_TITLES:
+        for section_title in result._sections:
             old_section = self.get_section(section_title)
             new_section = other.get_section(section_title)
+            if new_section.is_empty():
+                result._sections[section_title] = copy.copy(old_section)
+                continue
+            if old_section.is_empty():
+                result._sections[section_title] = copy.copy(new_section)
+                continue
             result.append_lines(section_title, old_section.body)
             result.append_lines(section_title, new_section.body)
 
@@ -144,22 +195,12 @@ class RecordBody:
 
     @staticmethod
     def _parse_prefix_section(line: str) -> str:
-        if ":" not in line:
-            return ""
-
-        line_lower = line.lower()
-        for section_title in SECTION_TITLES:
-            if line_lower.startswith(f"{section_title}:"):
-                return section_title
-
-        return ""
+        return get_schema().parse_prefix(line)
 
     @staticmethod
     def _parse_header_title(line: str) -> str:
         if line.startswith("#") and " " in line:
-            title = line.split()[1].lower()
-            if title in SECTION_TITLES:
-                return title
+            return get_schema().get_title(line.split()[1])
         return ""
 
     @staticmethod
@@ -188,7 +229,8 @@ class RecordBody:
 
                 prefix_title = cls._parse_prefix_section(line)
                 if prefix_title:
-                    result.append_lines(prefix_title, line[len(prefix_title) + 1 :].strip())
+                    # prefix can be an alias, so text starts after the first colon
+                    result.append_lines(prefix_title, line[line.find(":") + 1 :].strip())
                     continue
 
             if title:
@@ -223,9 +265,11 @@ class RecordBody:
         self.postfix = ""
 
     def __copy__(self: _R) -> _R:
-        return self.__class__(
-            prefix=self.prefix, postfix=self.postfix, sections=(i for i in self.sections)
-        )
+        result = self.__class__(prefix=self.prefix, postfix=self.postfix)
+        for section in self.sections:
+            result._sections[section.title] = copy.copy(section)
+
+        return result
 
     def clone(self: _R) -> _R:
         """
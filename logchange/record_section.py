@@ -1,9 +1,15 @@
 """
 Keep a Changelog section.
 """
-from logchange.constants import SECTION_TITLES
+import itertools
+from typing import Any, List
+
+from logchange.section_schema import get_schema
 from logchange.utils import dedent
 
+# Global revision counter, so a revision identifies state across all objects
+REVISIONS = itertools.count()
+
 
 class RecordSection:
     """
@@ -14,13 +20,19 @@ class RecordSection:
         body -- Section text
     """
 
+    # Markdown list item markers that start a new entry
+    ENTRY_MARKERS = ("- ", "* ", "+ ")
+
     def __init__(self, title: str, body: str) -> None:
-        title = title.lower()
-        if title not in SECTION_TITLES:
-            raise ValueError(f"Invalid section title: {title}")
+        section_title = get_schema().get_title(title)
+        if not section_title:
+            raise ValueError(f"Invalid section title: {title.lower()}")
 
-        self.title: str = title
+        self.title: str = section_title
         self._body: str = dedent(body)
+        self.revision = next(REVISIONS)
+        self._render_key: Any = None
+        self._rendered = ""
 
     @property
     def body(self) -> str:
@@ -32,13 +44,20 @@ class RecordSection:
     @body.setter
     def body(self, value: str) -> None:
         self._body = dedent(value)
+        self.revision = next(REVISIONS)
+
+    def __copy__(self) -> "RecordSection":
+        result = self.__class__(self.title, "")
+        # body is already dedented, share the string
+        result._body = self._body
+        return result
 
     @staticmethod
     def is_valid_title(title: str) -> bool:
         """
-        Check whether `title` presents in Keep a Changelog.
+        Check whether `title` presents in Keep a Changelog or in configured sections.
         """
-        return title.lower() in SECTION_TITLES
+        return bool(get_schema().get_title(title))
 
     def is_empty(self) -> bool:
         """
@@ -49,11 +68,19 @@ class RecordSection:
     def render(self) -> str:
         """
         Render in Keep a Changelog format.
+
+        Result is cached until body is changed.
         """
-        if self.is_empty():
-            return f"### {self.title.capitalize()}"
+        render_key = (self.title, self.revision)
+        if self._render_key == render_key:
+            return self._rendered
 
-        return f"### {self.title.capitalize()}\n{self.body}"
+        if self.is_empty():
+            self._rendered = f"### {self.title.capitalize()}"
+        else:
+            self._rendered = f"### {self.title.capitalize()}\n{self.body}"
+        self._render_key = render_key
+        return self._rendered
 
     def append(self, text: str) -> None:
         """
@@ -66,3 +93,21 @@ class RecordSection:
         Append `text` to section body after new line.
         """
         self.append(f"\n{dedent(text)}")
+
+    @property
+    def entries(self) -> List[str]:
+        """
+        Section entries: list items with their continuation lines.
+        """
+        result: List[str] = []
+        codeblock = False
+        for line in self.body.splitlines():
+            is_entry_start = not codeblock and line.startswith(self.ENTRY_MARKERS)
+            if line.startswith("```"):
+                codeblock = not codeblock
+            if result and not is_entry_start:
+                result[-1] = f"{result[-1]}\n{line}"
+                continue
+            result.append(line)
+
+        return result
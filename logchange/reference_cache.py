@@ -0,0 +1,105 @@
+"""
+Reference index cache file.
+"""
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+from newversion.utils import print_path
+
+from logchange.constants import LOGGER_NAME
+from logchange.reference_index import ReferenceIndex, ReferenceIndexError
+from logchange.shards import get_fingerprint
+
+
+class ReferenceIndexCache:
+    """
+    Reference indexes cache, keyed by changelog path.
+
+    Index is valid when reference patterns are the same and changelog
+    and its shards `mtime` and `size` are the same, or content `sha256` is the same.
+
+    Arguments:
+        path -- Path to JSON cache file
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._logger = logging.getLogger(LOGGER_NAME)
+
+    @staticmethod
+    def get_key(changelog_path: Path) -> str:
+        """
+        Get cache key for changelog path, cache is shared by all working folders.
+        """
+        return changelog_path.resolve().as_posix()
+
+    def _read(self) -> Dict[str, Any]:
+        if not self.path.exists():
+            return {}
+
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except ValueError:
+            self._logger.warning(f"{print_path(self.path)} is invalid, ignoring")
+            return {}
+
+        if not isinstance(data, dict) or data.get("version") != self.VERSION:
+            return {}
+
+        return data.get("changelogs", {})
+
+    def get(self, changelog_path: Path, patterns: Sequence[str]) -> Optional[ReferenceIndex]:
+        """
+        Get valid cached index.
+
+        Arguments:
+            changelog_path -- Path to changelog file.
+            patterns -- Reference regular expressions.
+        """
+        data = self._read().get(self.get_key(changelog_path))
+        if not data:
+            return None
+
+        try:
+            if data["index"]["patterns"] != list(patterns):
+                return None
+
+            fingerprint = data["fingerprint"]
+            if get_fingerprint(changelog_path)["files"] != fingerprint["files"]:
+                if get_fingerprint(changelog_path, sha256=True)["sha256"] != fingerprint["sha256"]:
+                    return None
+
+            return ReferenceIndex.from_dict(data["index"])
+        except OSError:
+            # shard from manifest is missing, index is rebuilt
+            return None
+        except (KeyError, TypeError, ReferenceIndexError):
+            self._logger.warning(f"{print_path(self.path)} is invalid, ignoring")
+
+        return None
+
+    def save(self, changelog_path: Path, index: ReferenceIndex) -> None:
+        """
+        Write index for changelog, indexes of other changelogs are kept.
+
+        Write errors are logged and ignored.
+
+        Arguments:
+            changelog_path -- Path to changelog file.
+            index -- Reference index.
+        """
+        changelogs = self._read()
+        try:
+            changelogs[self.get_key(changelog_path)] = {
+                "fingerprint": get_fingerprint(changelog_path, sha256=True),
+                "index": index.as_dict(),
+            }
+            data = {"version": self.VERSION, "changelogs": changelogs}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(data), encoding="utf-8")
+        except OSError as e:
+            self._logger.warning(f"Cannot write {print_path(self.path)}: {e.strerror}")
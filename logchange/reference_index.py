@@ -0,0 +1,178 @@
+"""
+Inverted index from issue, PR and commit references to release entries.
+"""
+import re
+from typing import Any, Dict, Iterable, List, NamedTuple, Sequence, Type, TypeVar
+
+from newversion import Version
+
+from logchange.constants import UNRELEASED
+from logchange.record import Record
+
+_R = TypeVar("_R", bound="ReferenceIndex")
+
+
+class ReferenceIndexError(Exception):
+    """
+    Reference index error.
+    """
+
+
+class Reference(NamedTuple):
+    """
+    Reference found in a release entry.
+
+    Arguments:
+        ref -- Reference as it is written in entry
+        version -- Release version or `unreleased`
+        section -- Section title, empty for text out of sections
+        entry -- Entry text
+    """
+
+    ref: str
+    version: str
+    section: str
+    entry: str
+
+    def render(self) -> str:
+        """
+        Render as `version section: entry` line.
+        """
+        entry = " ".join(self.entry.split())
+        if not self.section:
+            return f"{self.version} {entry}"
+
+        return f"{self.version} {self.section}: {entry}"
+
+
+class ReferenceIndex:
+    """
+    Inverted index from references to release entries.
+
+    Index is built in one pass over release bodies, so every lookup is a dict hit.
+    Commit SHAs are indexed by their short prefix, so both short and full SHAs are found.
+
+    Arguments:
+        patterns -- Reference regular expressions.
+    """
+
+    # `#123`, `ABC-123` and commit SHAs with at least one digit
+    DEFAULT_PATTERNS = (
+        r"#\d+",
+        r"\b[A-Z][A-Z0-9]+-\d+\b",
+        r"\b(?=[0-9a-f]*\d)[0-9a-f]{7,40}\b",
+    )
+
+    # Length of commit SHA prefix used as a key
+    SHA_KEY_SIZE = 7
+
+    _SHA_RE = re.compile(r"^[0-9a-f]{7,40}$")
+
+    def __init__(self, patterns: Sequence[str] = DEFAULT_PATTERNS) -> None:
+        self.patterns = list(patterns)
+        try:
+            self._pattern_re = re.compile("|".join(f"(?:{i})" for i in self.patterns))
+        except re.error as e:
+            raise ReferenceIndexError(f"Invalid reference pattern: {e}") from None
+        self._index: Dict[str, List[Reference]] = {}
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @classmethod
+    def _get_key(cls, ref: str) -> str:
+        key = ref.lower()
+        if cls._SHA_RE.match(key):
+            return key[: cls.SHA_KEY_SIZE]
+
+        return key
+
+    def add(self, version: str, section: str, text: str) -> None:
+        """
+        Add references found in entry `text`.
+
+        Arguments:
+            version -- Release version.
+            section -- Section title.
+            text -- Entry text.
+        """
+        refs: Dict[str, None] = {}
+        for match in self._pattern_re.finditer(text):
+            refs[match.group(0)] = None
+
+        for ref in refs:
+            self._index.setdefault(self._get_key(ref), []).append(
+                Reference(ref, version, section, text)
+            )
+
+    def add_record(self, record: Record) -> None:
+        """
+        Add references from all entries of release `record`.
+        """
+        version = UNRELEASED if record.version == Version.zero() else record.version.dumps()
+        body = record.body
+        for text in (body.prefix, body.postfix):
+            for line in text.splitlines():
+                self.add(version, "", line)
+        for section in body.sections:
+            for entry in section.entries:
+                self.add(version, section.title, entry)
+
+    @classmethod
+    def build(
+        cls: Type[_R], records: Iterable[Record], patterns: Sequence[str] = DEFAULT_PATTERNS
+    ) -> _R:
+        """
+        Build index from release `records`.
+
+        Arguments:
+            records -- Release records.
+            patterns -- Reference regular expressions.
+        """
+        result = cls(patterns)
+        for record in records:
+            result.add_record(record)
+        return result
+
+    def find(self, ref: str) -> List[Reference]:
+        """
+        Find entries with reference `ref`.
+
+        Arguments:
+            ref -- Reference, case-insensitive, a short or full SHA for commits.
+
+        Returns:
+            Found references from newest to oldest release.
+        """
+        ref = ref.strip()
+        if ref.isdigit():
+            ref = f"#{ref}"
+
+        references = self._index.get(self._get_key(ref), [])
+        if not self._SHA_RE.match(ref.lower()):
+            return list(references)
+
+        ref = ref.lower()
+        return [
+            i for i in references if i.ref.lower().startswith(ref) or ref.startswith(i.ref.lower())
+        ]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Convert to JSON-serializable dict.
+        """
+        return {
+            "patterns": self.patterns,
+            "index": {key: [list(i) for i in value] for key, value in self._index.items()},
+        }
+
+    @classmethod
+    def from_dict(cls: Type[_R], data: Dict[str, Any]) -> _R:
+        """
+        Create from `as_dict` output.
+        """
+        result = cls(data["patterns"])
+        result._index = {
+            key: [Reference(*i) for i in value] for key, value in data["index"].items()
+        }
+        return result
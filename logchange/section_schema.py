@@ -0,0 +1,233 @@
+"""
+Changelog sections schema, configurable in `pyproject.toml`.
+"""
+import contextlib
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Type, TypeVar
+
+from logchange.constants import (
+    LOGGER_NAME,
+    MAJOR_SECTION_TITLES,
+    MINOR_SECTION_TITLES,
+    SECTION_TITLES,
+)
+
+_R = TypeVar("_R", bound="SectionSchema")
+
+
+class SectionSchemaError(Exception):
+    """
+    Invalid section schema config.
+    """
+
+
+class SectionSchema:
+    """
+    Changelog sections schema.
+
+    Section titles and aliases are compiled into a single dict,
+    so a line is classified with one lookup regardless of schema size.
+
+    Arguments:
+        titles -- Section titles in render order
+        major_titles -- Sections that bump major version
+        minor_titles -- Sections that bump minor version
+        aliases -- Alias to section title mapping, e.g. `fix` -> `fixed`
+
+    Examples::
+
+        [tool.logchange]
+        extra_sections = ["performance", "dependencies"]
+        minor_sections = ["added", "changed", "deprecated", "performance"]
+
+        [tool.logchange.aliases]
+        fix = "fixed"
+        feat = "added"
+    """
+
+    PYPROJECT_NAME = "pyproject.toml"
+
+    def __init__(
+        self,
+        titles: Iterable[str] = SECTION_TITLES,
+        major_titles: Iterable[str] = MAJOR_SECTION_TITLES,
+        minor_titles: Iterable[str] = MINOR_SECTION_TITLES,
+        aliases: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self.titles: List[str] = [i.lower() for i in titles]
+        self.major_titles = {i.lower() for i in major_titles}
+        self.minor_titles = {i.lower() for i in minor_titles}
+        self.aliases = {key.lower(): value.lower() for key, value in (aliases or {}).items()}
+        self._lookup: Dict[str, str] = {i: i for i in self.titles}
+        for alias, title in self.aliases.items():
+            if title not in self._lookup:
+                raise SectionSchemaError(f"Alias {alias} points to unknown section {title}")
+            self._lookup.setdefault(alias, title)
+
+        for title in (*self.major_titles, *self.minor_titles):
+            if title not in self._lookup:
+                raise SectionSchemaError(f"Unknown section {title}")
+
+    @property
+    def names(self) -> List[str]:
+        """
+        Section titles and aliases.
+        """
+        return list(self._lookup)
+
+    def get_key(self) -> str:
+        """
+        Get key that changes when section titles or aliases change.
+        """
+        return json.dumps([self.titles, sorted(self.aliases.items())])
+
+    def get_title(self, name: str) -> str:
+        """
+        Get section title by title or alias, case-insensitive.
+
+        Returns:
+            Section title or an empty string.
+        """
+        return self._lookup.get(name.lower(), "")
+
+    def parse_prefix(self, line: str) -> str:
+        """
+        Get section title from `<section>: text` line.
+
+        Returns:
+            Section title or an empty string.
+        """
+        index = line.find(":")
+        if index < 1:
+            return ""
+
+        return self._lookup.get(line[:index].lower(), "")
+
+    @classmethod
+    def from_dict(cls: Type[_R], data: Dict[str, Any]) -> _R:
+        """
+        Create from `[tool.logchange]` config.
+        """
+        try:
+            titles = [*SECTION_TITLES, *data.get("extra_sections", [])]
+            return cls(
+                titles=titles,
+                major_titles=data.get("major_sections", MAJOR_SECTION_TITLES),
+                minor_titles=data.get("minor_sections", MINOR_SECTION_TITLES),
+                aliases=dict(data.get("aliases", {})),
+            )
+        except (AttributeError, TypeError, ValueError) as e:
+            raise SectionSchemaError(f"Invalid [tool.logchange] config: {e}") from None
+
+    @classmethod
+    def find_pyproject(cls, path: Path) -> Optional[Path]:
+        """
+        Find `pyproject.toml` in `path` or its parents.
+        """
+        for parent in (path, *path.parents):
+            pyproject_path = parent / cls.PYPROJECT_NAME
+            if pyproject_path.exists():
+                return pyproject_path
+
+        return None
+
+    @classmethod
+    def load(cls: Type[_R], path: Path) -> _R:
+        """
+        Load from `[tool.logchange]` section of the closest `pyproject.toml`.
+
+        Arguments:
+            path -- Directory to start search from.
+        """
+        pyproject_path = cls.find_pyproject(path)
+        if pyproject_path is None:
+            return cls()
+
+        text = pyproject_path.read_text(encoding="utf-8")
+        if "[tool.logchange" not in text:
+            return cls()
+
+        # TOML parser is imported only for projects with config
+        try:
+            import tomllib  # type: ignore
+        except ImportError:  # pragma: no cover
+            try:
+                import tomli as tomllib  # type: ignore
+            except ImportError:
+                logging.getLogger(LOGGER_NAME).warning(
+                    "Install `tomli` to use [tool.logchange] config on Python < 3.11"
+                )
+                return cls()
+
+        try:
+            data = tomllib.loads(text)
+        except ValueError as e:
+            raise SectionSchemaError(f"Cannot parse {pyproject_path}: {e}") from None
+
+        return cls.from_dict(data.get("tool", {}).get("logchange", {}))
+
+
+_SCHEMA: Optional[SectionSchema] = None
+_SCHEMAS: Dict[Path, SectionSchema] = {}
+_SCHEMAS_LOCK = threading.Lock()
+_LOCAL = threading.local()
+
+
+def get_schema(path: Optional[Path] = None) -> SectionSchema:
+    """
+    Get section schema.
+
+    Schema set by `use_schema` in current thread or by `set_schema` is returned as it is.
+    Otherwise schema is loaded from `pyproject.toml` once per directory.
+
+    Arguments:
+        path -- Directory to start `pyproject.toml` search from. Default: current schema
+            or current directory.
+    """
+    if path is None:
+        schema: Optional[SectionSchema] = getattr(_LOCAL, "schema", None)
+        if schema is not None:
+            return schema
+
+    if _SCHEMA is not None:
+        return _SCHEMA
+
+    directory = (path or Path.cwd()).resolve()
+    with _SCHEMAS_LOCK:
+        schema = _SCHEMAS.get(directory)
+        if schema is None:
+            schema = SectionSchema.load(directory)
+            _SCHEMAS[directory] = schema
+
+    return schema
+
+
+@contextlib.contextmanager
+def use_schema(schema: SectionSchema) -> Iterator[SectionSchema]:
+    """
+    Use `schema` as current schema in current thread, previous one is restored on exit.
+
+    Examples::
+
+        with use_schema(get_schema(changelog_path.parent)):
+            changelog = ChangeLog.parse(changelog_path.read_text())
+    """
+    outer_schema = getattr(_LOCAL, "schema", None)
+    _LOCAL.schema = schema
+    try:
+        yield schema
+    finally:
+        _LOCAL.schema = outer_schema
+
+
+def set_schema(schema: Optional[SectionSchema]) -> None:
+    """
+    Set section schema for all projects, `None` to load it from `pyproject.toml` again.
+    """
+    global _SCHEMA
+    _SCHEMA = schema
+    with _SCHEMAS_LOCK:
+        _SCHEMAS.clear()
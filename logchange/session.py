@@ -0,0 +1,297 @@
+"""
+Changelog editing session: read and parse once, save once.
+"""
+import logging
+from pathlib import Path
+from typing import Any, Iterator, Optional, Type, TypeVar, Union
+
+from newversion import Version
+from newversion.utils import print_path
+
+from logchange.changelog import ChangeLog, ChangeLogStreamError
+from logchange.changelog_file import ChangeLogFile
+from logchange.constants import LATEST, LOGGER_NAME, NEW_CHANGELOG, SECTION_ALL, UNRELEASED
+from logchange.path_locks import PATH_LOCKS
+from logchange.profiler import PROFILER
+from logchange.record import Record
+from logchange.record_body import RecordBody
+from logchange.shards import ShardManifest
+from logchange.utils import get_today
+
+_R = TypeVar("_R", bound="ChangeLogSession")
+
+
+class ChangeLogSessionError(Exception):
+    """
+    Changelog session error.
+    """
+
+
+class ChangeLogSession:
+    """
+    Changelog editing session.
+
+    Changelog is read and parsed on first access and reused for all edits.
+    Used as a context manager, holds a per-path lock, so sessions for the same file
+    in other threads wait, and saves changelog once on exit if it was changed.
+
+    Arguments:
+        path -- Path to changelog file
+
+    Examples::
+
+        with ChangeLogSession(Path("CHANGELOG.md")) as session:
+            session.add("unreleased", "New feature", section="added")
+            session.add("unreleased", "Bug fix", section="fixed")
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.file = ChangeLogFile(path)
+        self.is_dirty = False
+        self._changelog: Optional[ChangeLog] = None
+        self._logger = logging.getLogger(LOGGER_NAME)
+        self._lock = PATH_LOCKS.get(path)
+
+    def __enter__(self: _R) -> _R:
+        self._lock.acquire()
+        return self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], *_: Any) -> None:
+        try:
+            if exc_type is None:
+                self.save()
+        finally:
+            self._lock.release()
+
+    @property
+    def changelog(self) -> ChangeLog:
+        """
+        Parsed changelog.
+        """
+        if self._changelog is None:
+            self._changelog = self._load()
+
+        return self._changelog
+
+    def _load(self) -> ChangeLog:
+        if not self.file.exists():
+            self._logger.warning(f"{print_path(self.path)} does not exists")
+            return ChangeLog.parse(NEW_CHANGELOG)
+
+        with PROFILER.phase("read"):
+            text = self.file.read()
+        changelog = ChangeLog.parse(text)
+        changelog.shards = ShardManifest.load(self.path).shards
+        return changelog
+
+    def mark_dirty(self) -> None:
+        """
+        Mark changelog as changed, so `save` writes it.
+        """
+        self.is_dirty = True
+
+    def save(self) -> bool:
+        """
+        Write changelog if it was changed.
+
+        Returns:
+            True if changelog was written.
+        """
+        if not self.is_dirty or self._changelog is None:
+            return False
+
+        text = self._changelog.render()
+        with PROFILER.phase("write"):
+            self.file.write(text)
+        for shard in self._changelog.shards:
+            shard.save()
+        self.is_dirty = False
+        return True
+
+    def get(self, name: str) -> Optional[Record]:
+        """
+        Get release record.
+
+        Arguments:
+            name -- Release version, `latest` or `unreleased`.
+
+        Returns:
+            Found record or None.
+        """
+        if name == UNRELEASED:
+            return self.changelog.get_unreleased()
+        if name == LATEST:
+            return self.changelog.get_latest()
+
+        return self.changelog.get_record(Version(name))
+
+    def iterate_records(self) -> Iterator[Record]:
+        """
+        Iterate over release records from newest to oldest, including archived.
+
+        If changelog is not parsed yet, it is read line by line only as far as records
+        are consumed, so `next(session.iterate_records())` does not read
+        or decompress the whole file. Records are not a part of `changelog`,
+        use `get` to edit them.
+
+        Yields:
+            Release record.
+        """
+        if self._changelog is not None or not self.file.exists():
+            yield from self.changelog.iterate_records()
+            return
+
+        lines = self.file.iterate_lines()
+        try:
+            record_texts = ChangeLog.iterate_stream_record_texts(lines)
+            try:
+                first_record_text = next(record_texts, None)
+            except ChangeLogStreamError as e:
+                self._logger.debug(f"{print_path(self.path)} is parsed as a whole: {e}")
+                yield from self.changelog.iterate_records()
+                return
+
+            if first_record_text is not None:
+                yield Record.parse(first_record_text)
+            for record_text in record_texts:
+                yield Record.parse(record_text)
+        finally:
+            lines.close()
+
+        for shard in ShardManifest.load(self.path).shards:
+            yield from shard.changelog.iterate_records()
+
+    def _get_or_create(self, name: str) -> Record:
+        record = self.get(name)
+        if record is not None:
+            return record
+
+        if name == LATEST:
+            raise ChangeLogSessionError(
+                f"No releases found in {print_path(self.path)}, pass explicit version"
+            )
+
+        self._logger.info(f"Record {name} not found, added")
+        return Record(Version(name), "", get_today())
+
+    @staticmethod
+    def _as_md_list(text: str) -> str:
+        if not text.strip():
+            return text
+
+        if "\n" in text:
+            return text
+
+        if text.strip().startswith("-"):
+            return text
+
+        return f"- {text}"
+
+    def _update(self, record: Record, created: str) -> None:
+        if created:
+            record.created = created
+
+        self.changelog.update_release(record)
+        self.mark_dirty()
+
+    def add(self, name: str, text: str, section: str = SECTION_ALL, created: str = "") -> Record:
+        """
+        Add notes to a release record.
+
+        Arguments:
+            name -- Release version, `latest` or `unreleased`.
+            text -- Release notes.
+            section -- Section name or `all` to parse sections from `text`.
+            created -- New release date.
+
+        Returns:
+            Updated record.
+        """
+        record = self._get_or_create(name)
+        if section == SECTION_ALL:
+            record.merge(RecordBody.parse(text))
+        else:
+            record.append_section(section, self._as_md_list(text))
+
+        self._update(record, created)
+        return record
+
+    def merge(self, name: str, body: RecordBody, created: str = "") -> Record:
+        """
+        Merge sections of `body` to a release record.
+
+        Arguments:
+            name -- Release version, `latest` or `unreleased`.
+            body -- Release notes.
+            created -- New release date.
+
+        Returns:
+            Updated record.
+        """
+        record = self._get_or_create(name)
+        record.merge(body)
+        self._update(record, created)
+        return record
+
+    def set(self, name: str, text: str, section: str = SECTION_ALL, created: str = "") -> Record:
+        """
+        Replace notes of a release record.
+
+        Arguments:
+            name -- Release version, `latest` or `unreleased`.
+            text -- Release notes.
+            section -- Section name or `all` to replace the whole body.
+            created -- New release date.
+
+        Returns:
+            Updated record.
+        """
+        record = self._get_or_create(name)
+        if section == SECTION_ALL:
+            record.set_body(text)
+        else:
+            record.set_section(section, self._as_md_list(text))
+
+        self._update(record, created)
+        return record
+
+    def release(self, version: Union[str, Version], created: str = "") -> Record:
+        """
+        Move `Unreleased` notes to release `version`.
+
+        Arguments:
+            version -- Release version.
+            created -- Release date.
+
+        Returns:
+            Release record.
+        """
+        if isinstance(version, str):
+            version = Version(version)
+
+        record = self.changelog.get_record(version)
+        if record is None:
+            record = Record(version, "", get_today())
+
+        unreleased = self.changelog.get_unreleased()
+        record.merge(unreleased.body)
+        unreleased.body.clear()
+
+        self._update(record, created)
+        return record
+
+
+def open_changelog(path: Union[str, Path]) -> ChangeLogSession:
+    """
+    Open changelog for editing.
+
+    Arguments:
+        path -- Path to changelog file.
+
+    Examples::
+
+        with logchange.open("CHANGELOG.md") as changelog:
+            changelog.add("unreleased", "New feature", section="added")
+    """
+    return ChangeLogSession(Path(path))
@@ -0,0 +1,290 @@
+"""
+Archived changelog shards for old releases.
+"""
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type, TypeVar
+
+from newversion import Version
+
+from logchange.changelog import ChangeLog
+from logchange.changelog_file import ChangeLogFile
+from logchange.record import Record
+
+_R = TypeVar("_R", bound="ShardManifest")
+
+
+class ArchiveChangeLog(ChangeLog):
+    """
+    Changelog shard with archived releases only.
+    """
+
+    def render(self) -> str:
+        """
+        Render to string without `Unreleased` section.
+        """
+        parts = [self.head]
+        if self._released:
+            parts.append(self._render_released())
+
+        return self.PARTS_DELIM.join(parts).strip() + "\n"
+
+    def add_release(self, record: Record) -> None:
+        """
+        Add new release keeping releases sorted from newest to oldest.
+
+        Arguments:
+            record -- New release record.
+        """
+        self.update_releases([record])
+
+    def update_release(self, record: Record) -> None:
+        """
+        Add or update release `record` keeping releases sorted from newest to oldest.
+
+        Arguments:
+            record -- Record to update.
+        """
+        self.update_releases([record])
+
+    def update_releases(self, records: Iterable[Record]) -> None:
+        """
+        Add or update releases keeping releases sorted from newest to oldest.
+
+        Shard text is split and rebuilt once for all `records`,
+        texts of other releases are kept as they are.
+
+        Arguments:
+            records -- Records to add or update.
+        """
+        entries: List[Tuple[Version, str]] = []
+        indexes: Dict[Version, int] = {}
+        for record_text in self.iterate_record_texts():
+            version = Record.parse(record_text).version
+            indexes.setdefault(version, len(entries))
+            entries.append((version, record_text))
+
+        for record in records:
+            entry = (record.version, record.render())
+            if record.version in indexes:
+                entries[indexes[record.version]] = entry
+                continue
+            indexes[record.version] = len(entries)
+            entries.append(entry)
+
+        entries.sort(key=lambda x: x[0], reverse=True)
+        self.set_record_texts(i[1] for i in entries)
+
+
+class ChangeLogShard:
+    """
+    Archived changelog shard file.
+
+    Shard content is read on first access.
+
+    Arguments:
+        path -- Path to shard file
+        newest -- Newest archived version
+        oldest -- Oldest archived version
+    """
+
+    def __init__(self, path: Path, newest: Version, oldest: Version) -> None:
+        self.path = path
+        self.newest = newest
+        self.oldest = oldest
+        self.is_dirty = False
+        self._file = ChangeLogFile(path)
+        self._changelog: Optional[ArchiveChangeLog] = None
+
+    @property
+    def changelog(self) -> ArchiveChangeLog:
+        """
+        Parsed shard changelog.
+        """
+        if self._changelog is None:
+            text = ""
+            if self._file.exists():
+                text = self._file.read()
+            self._changelog = ArchiveChangeLog.parse(text)
+
+        return self._changelog
+
+    def contains(self, version: Version) -> bool:
+        """
+        Whether `version` is in shard versions range.
+        """
+        return self.oldest <= version <= self.newest
+
+    def overlaps(self, oldest: Version, newest: Version) -> bool:
+        """
+        Whether shard versions range overlaps with `oldest` - `newest` range.
+        """
+        return self.oldest <= newest and oldest <= self.newest
+
+    def update_release(self, record: Record) -> None:
+        """
+        Add or update archived release `record`.
+        """
+        self.update_releases([record])
+
+    def update_releases(self, records: List[Record]) -> None:
+        """
+        Add or update archived release `records` at once.
+        """
+        if not records:
+            return
+
+        self.changelog.update_releases(records)
+        self.is_dirty = True
+        self.newest = max(self.newest, *(i.version for i in records))
+        self.oldest = min(self.oldest, *(i.version for i in records))
+
+    def save(self) -> None:
+        """
+        Write shard changelog if it was changed.
+        """
+        if not self.is_dirty:
+            return
+
+        self._file.write(self.changelog.render())
+        self.is_dirty = False
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Convert to manifest entry.
+        """
+        return {
+            "path": self.path.name,
+            "newest": self.newest.dumps(),
+            "oldest": self.oldest.dumps(),
+        }
+
+
+class ShardManifest:
+    """
+    List of changelog shards stored next to changelog.
+
+    Arguments:
+        changelog_path -- Path to main changelog
+        shards -- Changelog shards from newest to oldest
+    """
+
+    SUFFIX = ".shards.json"
+
+    HEAD_TEMPLATE = "# Changelog {major}.x\nArchived releases, newer ones are in [{name}]({name})."
+
+    def __init__(self, changelog_path: Path, shards: Iterable[ChangeLogShard] = ()) -> None:
+        self.changelog_path = changelog_path
+        self.shards: List[ChangeLogShard] = list(shards)
+
+    @property
+    def path(self) -> Path:
+        """
+        Path to manifest file.
+        """
+        return self.changelog_path.with_name(f"{self.changelog_path.stem}{self.SUFFIX}")
+
+    @classmethod
+    def load(cls: Type[_R], changelog_path: Path) -> _R:
+        """
+        Load manifest for `changelog_path` if it exists.
+        """
+        result = cls(changelog_path)
+        if not result.path.exists():
+            return result
+
+        data = json.loads(result.path.read_text())
+        for shard_data in data["shards"]:
+            result.shards.append(
+                ChangeLogShard(
+                    path=changelog_path.with_name(shard_data["path"]),
+                    newest=Version(shard_data["newest"]),
+                    oldest=Version(shard_data["oldest"]),
+                )
+            )
+        return result
+
+    def save(self) -> None:
+        """
+        Write manifest and changed shards.
+        """
+        for shard in self.shards:
+            shard.save()
+
+        data = {"shards": [i.as_dict() for i in self.shards]}
+        self.path.write_text(json.dumps(data, indent=2) + "\n")
+
+    def get_shard_path(self, version: Version) -> Path:
+        """
+        Get shard file path for release `version`.
+        """
+        path = self.changelog_path
+        return path.with_name(f"{path.stem}-{version.major}.x{path.suffix}")
+
+    def _get_shard(self, version: Version) -> ChangeLogShard:
+        path = self.get_shard_path(version)
+        for shard in self.shards:
+            if shard.path == path:
+                return shard
+
+        shard = ChangeLogShard(path, newest=version, oldest=version)
+        if not path.exists():
+            shard.changelog.head = self.HEAD_TEMPLATE.format(
+                major=version.major, name=self.changelog_path.name
+            )
+        self.shards.append(shard)
+        self.shards.sort(key=lambda x: x.newest, reverse=True)
+        return shard
+
+    def archive(self, changelog: ChangeLog, before: Version) -> List[Record]:
+        """
+        Move releases older than `before` from `changelog` to shards.
+
+        Arguments:
+            changelog -- Main changelog.
+            before -- Version to compare with.
+
+        Returns:
+            Archived records.
+        """
+        records = changelog.extract_releases(before)
+        # each shard text is rebuilt once, not once per archived release
+        shard_records: Dict[Path, List[Record]] = {}
+        for record in records:
+            shard_records.setdefault(self._get_shard(record.version).path, []).append(record)
+        for shard in self.shards:
+            shard.update_releases(shard_records.get(shard.path, []))
+
+        changelog.shards = self.shards
+        return records
+
+
+def get_fingerprint(changelog_path: Path, sha256: bool = False) -> Dict[str, Any]:
+    """
+    Get changelog and its shards fingerprint.
+
+    Arguments:
+        changelog_path -- Path to changelog file.
+        sha256 -- Add content hash.
+
+    Returns:
+        Fingerprint dict with `files` stats and optional `sha256`.
+    """
+    manifest = ShardManifest.load(changelog_path)
+    source_paths = [changelog_path, *(i.path for i in manifest.shards)]
+    files = []
+    for source_path in source_paths:
+        stat = source_path.stat()
+        files.append([source_path.as_posix(), stat.st_mtime_ns, stat.st_size])
+
+    result: Dict[str, Any] = {"files": files}
+    if sha256:
+        # hashing is only needed for aggregate cache entries
+        import hashlib
+
+        digest = hashlib.sha256()
+        for source_path in source_paths:
+            digest.update(source_path.read_bytes())
+        result["sha256"] = digest.hexdigest()
+
+    return result
@@ -0,0 +1,212 @@
+"""
+Bounded-memory release notes formatter.
+"""
+import re
+import tempfile
+from typing import IO, Dict, Iterator, Optional, TextIO
+
+from logchange.record_body import RecordBody
+from logchange.section_schema import get_schema
+
+
+class StreamFormatter:
+    """
+    Bounded-memory release notes formatter.
+
+    Output is the same as `RecordBody.parse` + `sanitize` + `render`, but input is read
+    in chunks and lines are kept in buffers that spill to disk when they grow
+    over `spill_size`.
+
+    Input is read twice: the first pass copies it to a spill buffer and finds
+    common indentation margin the same way `textwrap.dedent` does, the second pass
+    sorts lines to section buffers. Sections are written in section schema order.
+
+    Arguments:
+        spill_size -- Buffer size to keep in memory before spilling to disk.
+    """
+
+    ENCODING = "utf-8"
+
+    # Size of input chunks and output copy chunks
+    CHUNK_SIZE = 64 * 1024
+
+    # Default buffer size to keep in memory
+    SPILL_SIZE = 1024 * 1024
+
+    # Characters `str.splitlines` splits on
+    LINE_BREAKS = "\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+
+    # Same patterns as in `textwrap.dedent`
+    _WHITESPACE_ONLY_RE = re.compile("^[ \t]+$")
+    _LEADING_WHITESPACE_RE = re.compile("^([ \t]*)[^ \t\n]")
+
+    def __init__(self, spill_size: int = SPILL_SIZE) -> None:
+        self.spill_size = spill_size
+        self.is_crlf = False
+        self._margin = ""
+        self._sections: Dict[str, IO[str]] = {}
+
+    def _get_spill_buffer(self) -> IO[str]:
+        return tempfile.SpooledTemporaryFile(  # type: ignore
+            max_size=self.spill_size, mode="w+", encoding=self.ENCODING, newline="\n"
+        )
+
+    def _iterate_raw_lines(self, source: TextIO) -> Iterator[str]:
+        carry = ""
+        while True:
+            chunk = source.read(self.CHUNK_SIZE)
+            if not chunk:
+                break
+
+            lines = f"{carry}{chunk}".splitlines(True)
+            carry = lines.pop()
+            # `\r` can be the first half of `\r\n` split between chunks
+            if carry[-1] in self.LINE_BREAKS and carry[-1] != "\r":
+                lines.append(carry)
+                carry = ""
+            yield from lines
+
+        if carry:
+            yield carry
+
+    def _iterate_lines(self, source: TextIO) -> Iterator[str]:
+        for line in self._iterate_raw_lines(source):
+            if line.endswith("\r\n"):
+                self.is_crlf = True
+                yield line[:-2]
+                continue
+            if line[-1] in self.LINE_BREAKS:
+                yield line[:-1]
+                continue
+            yield line
+
+    @staticmethod
+    def _merge_margin(margin: Optional[str], indent: str) -> str:
+        if margin is None or indent.startswith(margin):
+            return indent if margin is None else margin
+        if margin.startswith(indent):
+            return indent
+
+        for index, (margin_char, indent_char) in enumerate(zip(margin, indent)):
+            if margin_char != indent_char:
+                return margin[:index]
+
+        return margin
+
+    def _spill_input(self, source: TextIO, spill: IO[str]) -> None:
+        margin: Optional[str] = None
+        # margin of blank lines counts only if a non-blank line follows
+        pending_margin: Optional[str] = None
+        is_started = False
+        for line in self._iterate_lines(source):
+            spill.write(f"{line}\n")
+            if self._WHITESPACE_ONLY_RE.match(line):
+                continue
+            match = self._LEADING_WHITESPACE_RE.match(line)
+            if not match:
+                continue
+
+            indent = match.group(1)
+            if not line.strip():
+                if is_started:
+                    pending_margin = self._merge_margin(pending_margin, indent)
+                continue
+
+            is_started = True
+            if pending_margin is not None:
+                margin = self._merge_margin(margin, pending_margin)
+                pending_margin = None
+            margin = self._merge_margin(margin, indent)
+
+        self._margin = margin or ""
+
+    def _append(self, title: str, text: str) -> None:
+        if not text.strip():
+            return
+
+        text = text.lstrip(" \t")
+        buffer = self._sections.get(title)
+        if buffer is None:
+            buffer = self._get_spill_buffer()
+            self._sections[title] = buffer
+            buffer.write(text)
+            return
+
+        buffer.write(f"\n{text}")
+
+    def _sort_lines(self, spill: IO[str]) -> None:
+        margin = self._margin
+        title = ""
+        codeblock = False
+        for line in spill:
+            line = line[:-1]
+            if line.startswith(margin):
+                line = line[len(margin) :]
+
+            if line.startswith("```"):
+                codeblock = not codeblock
+            if not codeblock:
+                if RecordBody._has_header(line):
+                    title = RecordBody._parse_header_title(line)
+                    if title:
+                        continue
+
+                prefix_title = RecordBody._parse_prefix_section(line)
+                if prefix_title:
+                    self._append(prefix_title, line[line.find(":") + 1 :].strip())
+                    continue
+
+            if title:
+                self._append(title, line)
+
+    def _write(self, output: TextIO, text: str) -> None:
+        if self.is_crlf:
+            text = text.replace("\n", "\r\n")
+        output.write(text)
+
+    def _write_sections(self, output: TextIO) -> bool:
+        is_written = False
+        for section_title in get_schema().titles:
+            buffer = self._sections.get(section_title)
+            if buffer is None:
+                continue
+
+            if is_written:
+                self._write(output, RecordBody.PARTS_DELIM)
+            self._write(output, f"### {section_title.capitalize()}\n")
+            buffer.seek(0)
+            while True:
+                chunk = buffer.read(self.CHUNK_SIZE)
+                if not chunk:
+                    break
+                self._write(output, chunk)
+            is_written = True
+
+        return is_written
+
+    def format(self, source: TextIO, output: TextIO) -> bool:
+        """
+        Format release notes from `source` to `output`.
+
+        Line endings are `\\r\\n` if `source` has any, `\\n` otherwise.
+
+        Arguments:
+            source -- Text stream with release notes.
+            output -- Text stream for formatted release notes.
+
+        Returns:
+            True if anything was written.
+        """
+        self.is_crlf = False
+        self._sections = {}
+        try:
+            with self._get_spill_buffer() as spill:
+                self._spill_input(source, spill)
+                spill.seek(0)
+                self._sort_lines(spill)
+
+            return self._write_sections(output)
+        finally:
+            for buffer in self._sections.values():
+                buffer.close()
+            self._sections = {}
@@ -1,10 +1,17 @@
+import datetime
+import os
+import re
 import textwrap
+from pathlib import Path
 
+# Line breaks other than `\n` that `str.splitlines` splits on
+_LINE_BREAKS = ("\r", "\x0b", "\x0c", "\x1c", "\x1d", "\x1e", "\x85", "\u2028", "\u2029")
 
-def strip_empty_lines(text: str) -> str:
-    """
-    Remove empty lines from the start and end of `text`.
-    """
+# Same pattern as in `textwrap.dedent`
+_WHITESPACE_ONLY_RE = re.compile("^[ \t]+$", re.MULTILINE)
+
+
+def _strip_empty_lines_splitlines(text: str) -> str:
     lines = text.splitlines()
     while lines and not lines[0].strip():
         lines.pop(0)
@@ -14,8 +21,70 @@ def strip_empty_lines(text: str) -> str:
     return "\n".join(lines)
 
 
+def strip_empty_lines(text: str) -> str:
+    """
+    Remove empty lines from the start and end of `text`.
+
+    Lines are split like `str.splitlines` does, so `\\r`, `\\r\\n`, `\\x0b`, `\\x0c`,
+    `\\x1c`-`\\x1e`, `\\x85`, `\\u2028` and `\\u2029` are replaced with `\\n`,
+    and a trailing line break is dropped. If `text` has only `\\n` line breaks,
+    it is sliced without splitting, so only empty lines are scanned.
+    """
+    # substring checks are much faster than a character class regex search
+    if any(i in text for i in _LINE_BREAKS):
+        return _strip_empty_lines_splitlines(text)
+
+    start = 0
+    while True:
+        end = text.find("\n", start)
+        if end == -1:
+            end = len(text)
+        if text[start:end].strip():
+            break
+        if end == len(text):
+            return ""
+        start = end + 1
+
+    end = len(text)
+    while True:
+        line_start = text.rfind("\n", 0, end) + 1
+        if text[line_start:end].strip():
+            break
+        end = line_start - 1
+
+    return text[start:end]
+
+
 def dedent(text: str) -> str:
     """
     Dendent text and remove empty lines from beginning and end.
+
+    Same as `textwrap.dedent`, but if the first line is not indented,
+    common margin is empty, so only whitespace-only lines are cleared
+    and the rest of the text is not scanned line by line.
+    """
+    text = strip_empty_lines(text)
+    if not text or text[0] in " \t":
+        return textwrap.dedent(text)
+
+    if text[-1] in " \t" or " \n" in text or ("\t" in text and "\t\n" in text):
+        return _WHITESPACE_ONLY_RE.sub("", text)
+
+    return text
+
+
+def get_today() -> str:
+    """
+    Get today date in `YYYY-MM-DD` format.
+    """
+    return datetime.datetime.now().date().strftime("%Y-%m-%d")
+
+
+def get_cache_path(name: str) -> Path:
+    """
+    Get path to a cache file in user cache folder.
+
+    Folder is `$XDG_CACHE_HOME/logchange`, or `~/.cache/logchange` if it is not set.
     """
-    return textwrap.dedent(strip_empty_lines(text))
+    cache_root = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_root) / "logchange" / name
@@ -0,0 +1,49 @@
+"""
+Release version bump types, shared by `stats` and `lint`.
+"""
+from newversion import Version
+
+from logchange.record_body import RecordBody
+
+BUMP_MAJOR = "major"
+BUMP_MINOR = "minor"
+BUMP_MICRO = "micro"
+# Same stable version, e.g. `1.0.0rc1` -> `1.0.0`
+BUMP_PRERELEASE = "prerelease"
+BUMP_TYPES = (BUMP_MAJOR, BUMP_MINOR, BUMP_MICRO, BUMP_PRERELEASE)
+
+
+def get_bump_type(old_version: Version, new_version: Version) -> str:
+    """
+    Get bump type between two release versions.
+
+    Arguments:
+        old_version -- Previous release version.
+        new_version -- Next release version.
+
+    Returns:
+        `major`, `minor`, `micro` or `prerelease` if stable versions are the same.
+    """
+    if new_version.major != old_version.major:
+        return BUMP_MAJOR
+    if new_version.minor != old_version.minor:
+        return BUMP_MINOR
+    if new_version.micro != old_version.micro:
+        return BUMP_MICRO
+
+    return BUMP_PRERELEASE
+
+
+def get_expected_bump_type(body: RecordBody, old_version: Version) -> str:
+    """
+    Get bump type that `RecordBody.bump_version` suggests for release `body`.
+
+    Arguments:
+        body -- Release body.
+        old_version -- Previous release version.
+
+    Returns:
+        `major`, `minor` or `micro`.
+    """
+    old_stable = old_version.get_stable()
+    return get_bump_type(old_stable, body.bump_version(old_stable))
@@ -0,0 +1,343 @@
+"""
+Changelog watcher that re-parses only changed release blocks.
+"""
+import hashlib
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from newversion import Version
+from newversion.utils import print_path
+
+from logchange.changelog import ChangeLog
+from logchange.changelog_file import ChangeLogFile
+from logchange.record import Record
+from logchange.section_schema import get_schema, use_schema
+
+try:
+    import inotify_simple
+except ImportError:
+    inotify_simple = None
+
+
+class ChangeLogWatchError(Exception):
+    """
+    Changelog watcher error.
+    """
+
+
+class WatchUpdate(NamedTuple):
+    """
+    Watched changelog update.
+
+    Arguments:
+        path -- Changelog path
+        changed -- Versions of re-parsed blocks, `unreleased` for Unreleased block
+        removed -- Versions of removed blocks
+        blocks -- Number of blocks in changelog
+        issues -- Formatting issues of all blocks
+    """
+
+    path: str
+    changed: List[str]
+    removed: List[str]
+    blocks: int
+    issues: List[str]
+
+    def render(self) -> str:
+        """
+        Render as summary line and issue lines.
+        """
+        line = f"{self.path}: {len(self.changed)} of {self.blocks} blocks re-parsed"
+        if self.changed:
+            line = f"{line} ({', '.join(self.changed)})"
+        if self.removed:
+            line = f"{line}, removed {', '.join(self.removed)}"
+        return "\n".join([line, *(f"  {i}" for i in self.issues)])
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Convert to JSON-serializable dict.
+        """
+        return self._asdict()
+
+
+class _Block(NamedTuple):
+    record: Record
+    data: Dict[str, Any]
+    issues: List[str]
+
+
+class WatchedChangeLog:
+    """
+    Parsed release blocks of a watched changelog, keyed by block text hash.
+
+    On update changelog is split to raw blocks, that is cheap, and only blocks
+    with a new hash are parsed and checked.
+
+    Arguments:
+        path -- Path to changelog file.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._blocks: Dict[str, _Block] = {}
+        self._keys: List[str] = []
+        self._is_loaded = False
+
+    @staticmethod
+    def _get_key(text: str) -> str:
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    @staticmethod
+    def _parse_block(record_text: str) -> _Block:
+        record = Record.parse(record_text)
+        issues = []
+        # body is not parsed yet, so record is rendered the same way `init -f` does
+        if record.render() != record_text.strip():
+            issues.append(f"{record.version.dumps()}: not formatted, run `logchange init -f`")
+        return _Block(record, record.as_dict(), issues)
+
+    def update(self) -> Optional[WatchUpdate]:
+        """
+        Re-read changelog and re-parse changed blocks.
+
+        Returns:
+            Update or None if no blocks are changed since the last update.
+        """
+        if not self.path.exists():
+            return None
+
+        with use_schema(get_schema(self.path.parent)):
+            return self._update()
+
+    def _update(self) -> Optional[WatchUpdate]:
+        changelog = ChangeLog.parse(ChangeLogFile(self.path).read())
+        unreleased = changelog.get_unreleased()
+        blocks: Dict[str, _Block] = {}
+        keys: List[str] = []
+        changed: List[str] = []
+        record_texts = [unreleased.render(), *changelog.iterate_record_texts()]
+        for index, record_text in enumerate(record_texts):
+            # separators after the last release differ, so blocks are compared stripped
+            key = self._get_key(record_text.strip())
+            block = self._blocks.get(key) or blocks.get(key)
+            if block is None:
+                if index:
+                    block = self._parse_block(record_text)
+                else:
+                    # Unreleased is always formatted by `ChangeLog.render`
+                    block = _Block(unreleased, unreleased.as_dict(), [])
+                changed.append(block.data["version"])
+            blocks[key] = block
+            keys.append(key)
+
+        is_changed = not self._is_loaded or keys != self._keys
+        versions = {i.data["version"] for i in blocks.values()}
+        removed = [
+            i.data["version"] for i in self._blocks.values() if i.data["version"] not in versions
+        ]
+        self._blocks = blocks
+        self._keys = keys
+        self._is_loaded = True
+        if not is_changed:
+            return None
+
+        return WatchUpdate(print_path(self.path), changed, removed, len(keys), self.issues)
+
+    @property
+    def records(self) -> List[Record]:
+        """
+        Unreleased and release records from newest to oldest.
+        """
+        return [self._blocks[key].record for key in self._keys]
+
+    @property
+    def issues(self) -> List[str]:
+        """
+        Formatting issues of all blocks.
+        """
+        return [issue for key in self._keys for issue in self._blocks[key].issues]
+
+    def as_dict(self) -> List[Dict[str, Any]]:
+        """
+        Convert records to JSON-serializable list.
+        """
+        return [self._blocks[key].data for key in self._keys]
+
+    def get_notes(self) -> str:
+        """
+        Render latest release notes.
+        """
+        for record in self.records:
+            if record.version != Version.zero():
+                return record.render()
+
+        return ""
+
+
+class PollingBackend:
+    """
+    File change detection by modification time and size polling.
+
+    Arguments:
+        paths -- Paths to watch.
+        interval -- Polling interval in seconds.
+    """
+
+    def __init__(self, paths: Iterable[Path], interval: float = 0.5) -> None:
+        self.interval = interval
+        self._stats = {path: self._get_stat(path) for path in paths}
+
+    @staticmethod
+    def _get_stat(path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def wait(self, timeout: Optional[float] = None) -> List[Path]:
+        """
+        Wait for changes.
+
+        Arguments:
+            timeout -- Timeout in seconds, None to wait forever.
+
+        Returns:
+            Changed paths, empty on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            result = []
+            for path, old_stat in self._stats.items():
+                stat = self._get_stat(path)
+                if stat != old_stat:
+                    self._stats[path] = stat
+                    result.append(path)
+            if result:
+                return result
+            if deadline is not None and time.monotonic() >= deadline:
+                return []
+            time.sleep(self.interval)
+
+    def close(self) -> None:
+        """
+        Release resources, nothing to release for polling.
+        """
+
+
+class InotifyBackend:
+    """
+    File change detection with `inotify_simple`.
+
+    Parent folders are watched, so files replaced on save by editors are tracked.
+
+    Arguments:
+        paths -- Paths to watch.
+        delay -- Time in seconds to collect events of one save.
+    """
+
+    def __init__(self, paths: Iterable[Path], delay: float = 0.05) -> None:
+        if inotify_simple is None:
+            raise ChangeLogWatchError("inotify_simple is not installed")
+
+        self.delay = delay
+        self._inotify = inotify_simple.INotify()
+        mask = inotify_simple.flags.CLOSE_WRITE | inotify_simple.flags.MOVED_TO
+        self._paths: Dict[int, Dict[str, Path]] = {}
+        for path in paths:
+            wd = self._inotify.add_watch(str(path.parent), mask)
+            self._paths.setdefault(wd, {})[path.name] = path
+
+    def wait(self, timeout: Optional[float] = None) -> List[Path]:
+        """
+        Wait for changes.
+
+        Arguments:
+            timeout -- Timeout in seconds, None to wait forever.
+
+        Returns:
+            Changed paths, empty on timeout.
+        """
+        timeout_ms = None if timeout is None else int(timeout * 1000)
+        result: Dict[Path, None] = {}
+        for event in self._inotify.read(timeout=timeout_ms, read_delay=int(self.delay * 1000)):
+            path = self._paths.get(event.wd, {}).get(event.name)
+            if path is not None:
+                result[path] = None
+        return list(result)
+
+    def close(self) -> None:
+        """
+        Close inotify file descriptor.
+        """
+        self._inotify.close()
+
+
+class ChangeLogWatcher:
+    """
+    Watcher for many changelogs.
+
+    Uses `inotify_simple` if it is installed, otherwise polls modification times.
+
+    Arguments:
+        paths -- Paths to changelog files.
+        interval -- Polling interval in seconds.
+        use_inotify -- Use `inotify_simple` if it is installed.
+    """
+
+    def __init__(
+        self, paths: Sequence[Path], interval: float = 0.5, use_inotify: bool = True
+    ) -> None:
+        self.changelogs = {path: WatchedChangeLog(path) for path in paths}
+        self.backend: Any
+        if use_inotify and inotify_simple is not None:
+            self.backend = InotifyBackend(paths)
+        else:
+            self.backend = PollingBackend(paths, interval)
+
+    def check(self) -> List[WatchUpdate]:
+        """
+        Parse all changelogs.
+
+        Returns:
+            Updates for changelogs that are changed since the last check.
+        """
+        return self._update(self.changelogs)
+
+    def _update(self, paths: Iterable[Path]) -> List[WatchUpdate]:
+        result = []
+        for path in paths:
+            update = self.changelogs[path].update()
+            if update is not None:
+                result.append(update)
+        return result
+
+    def poll(self, timeout: Optional[float] = None) -> List[WatchUpdate]:
+        """
+        Wait for file changes and update changed changelogs.
+
+        Arguments:
+            timeout -- Timeout in seconds, None to wait forever.
+
+        Returns:
+            Updates, empty on timeout or if files were saved without changes.
+        """
+        return self._update(self.backend.wait(timeout))
+
+    def watch(self) -> Iterator[WatchUpdate]:
+        """
+        Watch changelogs forever.
+
+        Yields:
+            Changelog updates.
+        """
+        while True:
+            yield from self.poll()
+
+    def close(self) -> None:
+        """
+        Stop watching.
+        """
+        self.backend.close()
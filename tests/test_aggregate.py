@@ -0,0 +1,116 @@
+import argparse
+import io
+import os
+
+import pytest
+from newversion import Version
+
+from logchange import aggregate
+from logchange.aggregate import AggregateCache, AggregateError, ChangeLogAggregator
+from logchange.changelog import ChangeLog
+from logchange.executor import Executor
+from logchange.shards import ShardManifest
+
+
+class TestChangeLogAggregator:
+    def _create(self, tmp_path):
+        paths = []
+        for name, text in (
+            (
+                "alpha",
+                "## [Unreleased]\n- a\n\n## [1.1.0] - 2021-03-01\n### Fixed\n- fix\n\n"
+                "## [1.0.0] - 2021-01-01\n### Added\n- init",
+            ),
+            (
+                "beta",
+                "## [Unreleased]\n### Fixed\n- fix\n\n## [2.0.0] - 2021-02-01\n"
+                "### Removed\n* removed",
+            ),
+        ):
+            (tmp_path / name).mkdir()
+            path = tmp_path / name / "CHANGELOG.md"
+            path.write_text(f"# Changelog\n\n{text}\n")
+            paths.append(path)
+        return paths
+
+    def test_write(self, tmp_path):
+        paths = self._create(tmp_path)
+        output = io.StringIO()
+        ChangeLogAggregator(paths).write(output)
+        text = output.getvalue()
+        assert text.startswith("# Changelog\n")
+        assert text.split("## [Unreleased]\n", 1)[1] == (
+            "### Fixed\n- **beta**: fix\n\n"
+            "## [1.1.0] - 2021-03-01 (alpha)\n### Fixed\n- **alpha**: fix\n\n"
+            "## [2.0.0] - 2021-02-01 (beta)\n### Removed\n* **beta**: removed\n\n"
+            "## [1.0.0] - 2021-01-01 (alpha)\n### Added\n- **alpha**: init\n"
+        )
+
+        output = io.StringIO()
+        ChangeLogAggregator(paths, workers=2).write(output, ChangeLogAggregator.SORT_VERSION)
+        titles = [i for i in output.getvalue().splitlines() if i.startswith("## [")]
+        assert titles == [
+            "## [Unreleased]",
+            "## [2.0.0] - 2021-02-01 (beta)",
+            "## [1.1.0] - 2021-03-01 (alpha)",
+            "## [1.0.0] - 2021-01-01 (alpha)",
+        ]
+
+    def test_cache(self, tmp_path, monkeypatch):
+        paths = self._create(tmp_path)
+        cache_path = tmp_path / "cache.json"
+        ChangeLogAggregator(paths, cache=AggregateCache(cache_path)).load()
+
+        loaded = []
+        load_package = aggregate.load_package
+
+        def spy(path, name):
+            loaded.append(name)
+            return load_package(path, name)
+
+        monkeypatch.setattr(aggregate, "load_package", spy)
+        ChangeLogAggregator(paths, cache=AggregateCache(cache_path)).load()
+        assert loaded == []
+
+        stat = paths[0].stat()
+        os.utime(paths[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        ChangeLogAggregator(paths, cache=AggregateCache(cache_path)).load()
+        assert loaded == []
+
+        paths[1].write_text(paths[1].read_text().replace("- fix", "- new fix"))
+        packages = ChangeLogAggregator(paths, cache=AggregateCache(cache_path)).load()
+        assert loaded == ["beta"]
+        assert packages[1].unreleased == "### Fixed\n- **beta**: new fix"
+
+    def test_missing_shard(self, tmp_path):
+        paths = self._create(tmp_path)
+        changelog = ChangeLog.parse(paths[0].read_text())
+        manifest = ShardManifest.load(paths[0])
+        manifest.archive(changelog, Version("1.1.0"))
+        manifest.save()
+        paths[0].write_text(changelog.render())
+        cache_path = tmp_path / "cache.json"
+        ChangeLogAggregator(paths, cache=AggregateCache(cache_path)).load()
+
+        (tmp_path / "alpha" / "CHANGELOG-1.x.md").unlink()
+        for cache in (AggregateCache(cache_path), None):
+            with pytest.raises(AggregateError, match="CHANGELOG-1.x.md"):
+                ChangeLogAggregator(paths, cache=cache).load()
+
+    def test_default_cache(self, tmp_path, monkeypatch):
+        paths = self._create(tmp_path)
+        monkeypatch.setenv("XDG_CACHE_HOME", (tmp_path / "cache").as_posix())
+        monkeypatch.chdir(tmp_path / "alpha")
+        config = argparse.Namespace(
+            command="aggregate",
+            input="",
+            paths=paths,
+            sort="date",
+            output=None,
+            cache_path=None,
+            no_cache=False,
+            workers=1,
+        )
+        assert "## [2.0.0] - 2021-02-01 (beta)" in Executor(config).execute()
+        assert (tmp_path / "cache" / "logchange" / "aggregate.json").exists()
+        assert os.listdir(tmp_path / "alpha") == ["CHANGELOG.md"]
@@ -0,0 +1,138 @@
+import argparse
+import io
+import json
+import tarfile
+import zipfile
+
+import pytest
+
+from logchange.archive_reader import (
+    ArchiveReader,
+    ArchiveReaderError,
+    find_archives,
+    scan_archives,
+)
+from logchange.executor import Executor
+
+CHANGELOG = """
+# Changelog
+
+## [Unreleased]
+
+## [1.1.0] - 2021-02-01
+### Added
+- Feature
+
+## [1.0.0] - 2021-01-01
+### Added
+- Initial
+"""
+
+METADATA = f"""Metadata-Version: 2.1
+Name: package
+Version: 1.1.0
+Description-Content-Type: text/markdown
+
+{CHANGELOG}"""
+
+
+def write_zip(path, members):
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, text in members.items():
+            archive.writestr(name, text)
+
+
+def write_tar(path, members):
+    with tarfile.open(path, "w:gz") as archive:
+        for name, text in members.items():
+            data = text.encode()
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+
+class TestArchiveReader:
+    def test_find_member(self):
+        assert ArchiveReader.find_member(["pkg/docs/CHANGELOG.md", "pkg/CHANGES.rst"]) == (
+            "pkg/docs/CHANGELOG.md"
+        )
+        assert ArchiveReader.find_member(["pkg/HISTORY.md", "pkg/docs/CHANGELOG.md"]) == (
+            "pkg/HISTORY.md"
+        )
+        assert ArchiveReader.find_member(["pkg/CHANGES.md", "pkg/changelog.txt"]) == (
+            "pkg/changelog.txt"
+        )
+        assert ArchiveReader.find_member(["pkg/__init__.py", "pkg-1.0.dist-info/METADATA"]) == (
+            "pkg-1.0.dist-info/METADATA"
+        )
+        assert ArchiveReader.find_member(["pkg/METADATA", "pkg/sub/PKG-INFO"]) == ""
+
+    def test_read(self, tmp_path):
+        wheel_path = tmp_path / "package-1.1.0-py3-none-any.whl"
+        write_zip(
+            wheel_path,
+            {"package/__init__.py": "", "package-1.1.0.dist-info/METADATA": METADATA},
+        )
+        member = ArchiveReader(wheel_path).read()
+        assert member.name == "package-1.1.0.dist-info/METADATA"
+        assert member.text.strip() == CHANGELOG.strip()
+
+        sdist_path = tmp_path / "package-1.1.0.tar.gz"
+        write_tar(
+            sdist_path,
+            {
+                "package-1.1.0/PKG-INFO": METADATA.replace("1.1.0", "1.0.0"),
+                "package-1.1.0/CHANGELOG.md": CHANGELOG.replace("\n", "\r\n"),
+            },
+        )
+        changelog = ArchiveReader(sdist_path).read_changelog()
+        assert [i.version.dumps() for i in changelog.iterate_records()] == ["1.1.0", "1.0.0"]
+
+        empty_path = tmp_path / "empty.zip"
+        write_zip(empty_path, {"README.md": "# Package"})
+        assert ArchiveReader(empty_path).read() is None
+        with pytest.raises(ArchiveReaderError):
+            ArchiveReader(empty_path).read_changelog()
+
+        broken_path = tmp_path / "broken.whl"
+        broken_path.write_text("not a zip")
+        with pytest.raises(ArchiveReaderError):
+            ArchiveReader(broken_path).read()
+
+    def test_scan_archives(self, tmp_path):
+        (tmp_path / "sub").mkdir()
+        write_zip(tmp_path / "a-1.1.0-py3-none-any.whl", {"a/CHANGELOG.md": CHANGELOG})
+        write_tar(tmp_path / "sub" / "b-1.0.0.tar.gz", {"b-1.0.0/README.md": "# B"})
+        (tmp_path / "c.whl").write_text("not a zip")
+        (tmp_path / "CHANGELOG.md").write_text(CHANGELOG)
+
+        paths = list(find_archives(tmp_path))
+        assert [i.name for i in paths] == ["a-1.1.0-py3-none-any.whl", "c.whl", "b-1.0.0.tar.gz"]
+        for workers in (1, 2):
+            results = list(scan_archives(paths, workers=workers))
+            assert [(i.member, i.versions) for i in results] == [
+                ("a/CHANGELOG.md", ["1.1.0", "1.0.0"]),
+                ("", []),
+                ("", []),
+            ]
+            assert [bool(i.error) for i in results] == [False, True, False]
+            assert results[0].render().endswith(" a/CHANGELOG.md 1.1.0")
+            assert results[2].render().endswith(" no changelog")
+
+    def test_executor(self, tmp_path):
+        wheel_path = tmp_path / "package-1.1.0-py3-none-any.whl"
+        write_zip(wheel_path, {"package-1.1.0/CHANGELOG.md": CHANGELOG})
+        changelog_path = tmp_path / "CHANGELOG.md"
+
+        def execute(command, **kwargs):
+            kwargs.setdefault("changelog_path", changelog_path)
+            return Executor(argparse.Namespace(command=command, input="", **kwargs)).execute()
+
+        assert execute("list", from_archive=wheel_path) == "1.1.0\n1.0.0"
+        assert execute("get", name="1.0.0", section="added", from_archive=wheel_path) == (
+            "- Initial"
+        )
+        assert not changelog_path.exists()
+
+        output = execute("scan-archives", path=tmp_path, json=True, workers=1)
+        assert json.loads(output)[0]["versions"] == ["1.1.0", "1.0.0"]
@@ -0,0 +1,74 @@
+import argparse
+import asyncio
+import threading
+
+from newversion import Version
+
+from logchange.async_changelog import AsyncChangeLog, execute, map_changelogs
+from logchange.session import ChangeLogSession
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class TestAsyncChangeLog:
+    def test_open(self, tmp_path, monkeypatch):
+        path = tmp_path / "CHANGELOG.md"
+        path.write_text("# Changelog\n\n## [Unreleased]\n\n## [1.0.0] - 2021-01-01\n- initial\n")
+        threads = set()
+        original_add = ChangeLogSession.add
+
+        def add(*args, **kwargs):
+            threads.add(threading.get_ident())
+            return original_add(*args, **kwargs)
+
+        monkeypatch.setattr(ChangeLogSession, "add", add)
+
+        async def main():
+            async with await AsyncChangeLog.open(path) as changelog:
+                await changelog.add("unreleased", "Feature", section="added")
+                await changelog.release("1.1.0", created="2021-02-01")
+                record = await changelog.get("latest")
+                text = await changelog.render()
+
+            return record, text
+
+        record, text = run(main())
+        assert threads and threading.get_ident() not in threads
+        assert record.version == Version("1.1.0")
+        assert "## [1.1.0] - 2021-02-01\n### Added\n- Feature\n" in text
+        assert path.read_text() == text
+
+    def test_map_changelogs(self, tmp_path):
+        paths = [tmp_path / f"CHANGELOG{index}.md" for index in range(10)]
+        active = []
+        max_active = []
+
+        async def handler(changelog):
+            active.append(changelog.path)
+            max_active.append(len(active))
+            await asyncio.sleep(0.001)
+            await changelog.add("unreleased", f"Update {changelog.path.name}", section="changed")
+            active.remove(changelog.path)
+            return changelog.path.name
+
+        async def main():
+            return await map_changelogs(paths + paths, handler, concurrency=3)
+
+        result = run(main())
+        assert result == [i.name for i in paths + paths]
+        assert max(max_active) == 3
+        for path in paths:
+            assert path.read_text().count(f"- Update {path.name}\n") == 2
+
+    def test_execute(self, tmp_path):
+        path = tmp_path / "CHANGELOG.md"
+        path.write_text("# Changelog\n\n## [Unreleased]\n")
+        config = argparse.Namespace(command="added", input="Feature", changelog_path=path)
+        run(execute(config))
+        assert "### Added\n- Feature\n" in path.read_text()
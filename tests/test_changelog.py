@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from benchmarks.generator import ChangeLogGenerator
+from logchange.changelog import ChangeLog, ChangeLogStreamError
+from logchange.record import Record
+
+
+class TestChangeLog:
+    def test_format_released_workers(self, monkeypatch):
+        monkeypatch.setattr(ChangeLog, "FORMAT_CHUNK_SIZE", 4)
+        text = ChangeLogGenerator(releases=50, code_fences=3, seed=1).generate()
+        text = text.replace("\n### ", "\n\n#### ").replace("\n- ", "\n  - ")
+        serial = ChangeLog.parse(text)
+        serial.format_released()
+        parallel = ChangeLog.parse(text)
+        parallel.format_released(workers=3)
+        assert parallel.render() == serial.render()
+        assert [i.version for i in parallel.released] == [i.version for i in serial.released]
+
+        edited = ChangeLog.parse(text)
+        edited.released[10].set_section("fixed", "- Edited fix")
+        edited.format_released(workers=3)
+        assert "### Fixed\n- Edited fix\n" in edited.render()
+
+        small = ChangeLog.parse(ChangeLogGenerator(releases=3).generate())
+        small.format_released(workers=3)
+        assert len(small.released) == 3
+
+    def test_unreleased_edit(self, monkeypatch):
+        text = ChangeLogGenerator(releases=20, code_fences=3).generate()
+        reference = ChangeLog.parse(text)
+        reference.released
+        reference.get_unreleased().append_section("fixed", "- Fix")
+
+        def parse(*args):
+            raise AssertionError("released records should not be parsed")
+
+        changelog = ChangeLog.parse(text)
+        with monkeypatch.context() as m:
+            m.setattr(Record, "parse", parse)
+            changelog.get_unreleased().append_section("fixed", "- Fix")
+            result = changelog.render()
+        assert result == reference.render()
+
+    def test_parse(self):
+        text = "  # Changelog\n\n  ## [Unreleased]\n  - Added\n   \n  ## [1.0.0]\n  - Fixed\n"
+        changelog = ChangeLog.parse(text)
+        assert changelog.head == "# Changelog"
+        assert changelog.get_unreleased().body.render() == "- Added"
+        assert (
+            changelog.render() == "# Changelog\n\n## [Unreleased]\n- Added\n\n## [1.0.0]\n- Fixed\n"
+        )
+        changelog = ChangeLog.parse("# Changelog\n\n## [1.0.0]\n- Fixed\n \t\n\n## [Unreleased]\n")
+        assert changelog.render() == "# Changelog\n\n## [Unreleased]\n\n## [1.0.0]\n- Fixed\n"
+
+    def test_iterate_stream_record_texts(self):
+        def render(records):
+            result = []
+            try:
+                for record in records:
+                    result.append(record.render())
+            except ValueError as e:
+                result.append(type(e).__name__)
+            return result
+
+        def check(text):
+            expected = render(ChangeLog.parse(text).iterate_records())
+            record_texts = ChangeLog.iterate_stream_record_texts(text.split("\n"))
+            try:
+                result = render(Record.parse(i) for i in record_texts)
+            except ChangeLogStreamError:
+                return False
+            assert result == expected, repr(text)
+            return True
+
+        text = ChangeLogGenerator(releases=20, code_fences=3).generate()
+        assert check(text)
+        assert check("# Changelog\n\n## [Unreleased]\n")
+        assert check("# Changelog\n## [Unreleased]\n- new ## [1.0.0]\n- one\n## [## [0.9.0] - x\n")
+        assert check("# Changelog\n\n## [Unreleased]\n\n## [1.0.0]\n - one  \n  \n\t\n")
+        assert not check("  # Changelog\n\n  ## [Unreleased]\n  ## [1.0.0]\n  - one\n")
+        assert not check("# Changelog\n## [1.0.0]\n- one\n## [Unreleased]\n")
+
+        rnd = random.Random(0)
+        parts = ["\n", " ", "\t", "- x", "## [", "## [1.0.0]", "## [Unreleased]", "\r", "\x0c"]
+        for _ in range(500):
+            check("".join(rnd.choice(parts) for _ in range(rnd.randint(1, 30))))
@@ -0,0 +1,79 @@
+from logchange.changelog import ChangeLog
+from logchange.changelog_diff import ChangeLogDiff, EntryChange
+
+OLD_CHANGELOG = """# Changelog
+
+## [Unreleased]
+
+## [1.1.0] - 2021-02-01
+### Added
+- New feature
+- Another feature
+
+### Fixed
+- Old fix
+
+## [1.0.0] - 2021-01-01
+### Added
+- Initial release
+"""
+
+NEW_CHANGELOG = """# Changelog
+
+## [Unreleased]
+### Fixed
+- Upcoming fix
+
+## [1.2.0] - 2021-03-01
+### Removed
+- Old API
+
+## [1.1.0] - 2021-02-02
+### Added
+- New feature
+- Another feature, updated
+
+### Security
+- Security fix
+
+## [1.0.0] - 2021-01-01
+### Added
+- Initial release
+"""
+
+
+class TestChangeLogDiff:
+    def test_iterate_record_diffs(self):
+        changelog_diff = ChangeLogDiff(
+            ChangeLog.parse(OLD_CHANGELOG), ChangeLog.parse(NEW_CHANGELOG)
+        )
+        record_diffs = list(changelog_diff.iterate_record_diffs())
+        assert [(i.name, i.kind) for i in record_diffs] == [
+            ("[Unreleased]", "changed"),
+            ("[1.2.0]", "added"),
+            ("[1.1.0]", "changed"),
+        ]
+        updated = record_diffs[2]
+        assert (updated.old_created, updated.new_created) == ("2021-02-01", "2021-02-02")
+        assert {i.title: i.changes for i in updated.sections} == {
+            "added": [EntryChange("changed", "- Another feature", "- Another feature, updated")],
+            "fixed": [EntryChange("removed", "- Old fix", "")],
+            "security": [EntryChange("added", "", "- Security fix")],
+        }
+
+    def test_removed_release(self):
+        changelog_diff = ChangeLogDiff(
+            ChangeLog.parse(NEW_CHANGELOG), ChangeLog.parse(OLD_CHANGELOG)
+        )
+        record_diffs = list(changelog_diff.iterate_record_diffs())
+        assert [(i.name, i.kind) for i in record_diffs][-1] == ("[1.2.0]", "removed")
+
+    def test_render(self):
+        changelog = ChangeLog.parse(OLD_CHANGELOG)
+        assert ChangeLogDiff(changelog, ChangeLog.parse(OLD_CHANGELOG)).render() == ""
+        changelog_diff = ChangeLogDiff(
+            ChangeLog.parse(OLD_CHANGELOG), ChangeLog.parse(NEW_CHANGELOG)
+        )
+        assert changelog_diff.render().startswith(
+            "## [Unreleased] changed\n### Fixed\n+ - Upcoming fix\n\n## [1.2.0] added"
+        )
@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from logchange import changelog_export
+from logchange.changelog import ChangeLog
+from logchange.changelog_export import ChangeLogExporter, ChangeLogExportError, render_page
+from logchange.section_schema import SectionSchema, use_schema
+
+CHANGELOG = """
+# Changelog
+
+## [Unreleased]
+
+## [1.1.0] - 2021-02-01
+### Added
+- Feature <b>
+
+## [1.0.0] - 2021-01-01
+### Added
+- Initial
+"""
+
+
+def test_render_page(monkeypatch):
+    monkeypatch.setattr(changelog_export, "markdown", None)
+    text = render_page("html", "Package", "## [1.1.0] - 2021-02-01\n### Added\n- Feature <b>")
+    assert "<title>Package 1.1.0</title>" in text
+    assert "<p>Released 2021-02-01</p>" in text
+    assert "<pre>### Added\n- Feature &lt;b&gt;</pre>" in text
+    data = json.loads(render_page("json", "Package", "## [1.1.0]\n### Added\n- Feature"))
+    assert data["sections"] == {"added": ["- Feature"]}
+
+
+class TestChangeLogExporter:
+    def test_export(self, tmp_path):
+        exporter = ChangeLogExporter(tmp_path / "site", "json")
+        result = exporter.export(ChangeLog.parse(CHANGELOG))
+        assert result.written == ["1.1.0.json", "1.0.0.json", "index.json"]
+        index = json.loads((tmp_path / "site" / "index.json").read_text())
+        assert [i["page"] for i in index["releases"]] == ["1.1.0.json", "1.0.0.json"]
+
+        result = exporter.export(ChangeLog.parse(CHANGELOG))
+        assert (result.written, result.unchanged) == ([], 3)
+
+        changelog = ChangeLog.parse(CHANGELOG.replace("- Initial", "- First"))
+        (tmp_path / "site" / "1.1.0.json").unlink()
+        result = exporter.export(changelog)
+        assert result.written == ["1.1.0.json", "1.0.0.json"]
+        assert json.loads((tmp_path / "site" / "1.0.0.json").read_text())["text"] == (
+            "### Added\n- First"
+        )
+
+        (tmp_path / "site" / "extra.json").write_text("{}")
+        result = exporter.export(ChangeLog.parse(CHANGELOG.split("## [1.0.0]")[0]))
+        assert (result.written, result.removed) == (["index.json"], ["1.0.0.json"])
+        assert sorted(i.name for i in (tmp_path / "site").iterdir()) == [
+            ".logchange-export-json.json",
+            "1.1.0.json",
+            "extra.json",
+            "index.json",
+        ]
+
+        html_result = ChangeLogExporter(tmp_path / "site", "html").export(
+            ChangeLog.parse(CHANGELOG)
+        )
+        assert len(html_result.written) == 3
+        assert (tmp_path / "site" / "1.1.0.json").exists()
+
+    def test_schema_change(self, tmp_path):
+        exporter = ChangeLogExporter(tmp_path, "json")
+        changelog_text = CHANGELOG.replace("### Added\n- Initial", "### Docs\n- Initial")
+        exporter.export(ChangeLog.parse(changelog_text))
+        assert json.loads((tmp_path / "1.0.0.json").read_text())["sections"] == {}
+
+        with use_schema(SectionSchema.from_dict({"extra_sections": ["docs"]})):
+            result = exporter.export(ChangeLog.parse(changelog_text))
+        assert result.written == ["1.1.0.json", "1.0.0.json", "index.json"]
+        assert json.loads((tmp_path / "1.0.0.json").read_text())["sections"] == {
+            "docs": ["- Initial"]
+        }
+
+    def test_workers(self, tmp_path):
+        text = "".join(f"## [1.{i}.0]\n### Fixed\n- Fix {i}\n\n" for i in range(200, 0, -1))
+        changelog = ChangeLog.parse(f"# Changelog\n\n## [Unreleased]\n\n{text}")
+        result = ChangeLogExporter(tmp_path / "pool", "html", workers=2).export(changelog)
+        ChangeLogExporter(tmp_path / "single", "html").export(changelog)
+        assert len(result.written) == 201
+        for name in result.written:
+            assert (tmp_path / "pool" / name).read_text() == (
+                tmp_path / "single" / name
+            ).read_text()
+
+    def test_errors(self, tmp_path):
+        with pytest.raises(ChangeLogExportError):
+            ChangeLogExporter(tmp_path, "pdf")
+        with pytest.raises(ChangeLogExportError):
+            ChangeLogExporter(tmp_path, "json").export(ChangeLog.parse("## [Unreleased]\n## [bad]"))
@@ -0,0 +1,78 @@
+import bz2
+import gzip
+import lzma
+import subprocess
+import sys
+
+from logchange.changelog_file import ChangeLogFile
+
+
+class TestChangeLogFile:
+    def test_read(self, tmp_path):
+        path = tmp_path / "CHANGELOG.md"
+        path.write_bytes("# Changelog\r\n\r\n- ünïcode\r\n".encode())
+        changelog_file = ChangeLogFile(path)
+        assert changelog_file.read() == "# Changelog\n\n- ünïcode\n"
+        assert changelog_file.is_crlf is True
+
+        path.write_bytes(b"# Changelog\n\n- test\r\n")
+        assert changelog_file.read() == "# Changelog\n\n- test\n"
+        assert changelog_file.is_crlf is False
+
+    def test_write_new(self, tmp_path):
+        path = tmp_path / "CHANGELOG.md"
+        ChangeLogFile(path).write("# Changelog\n")
+        assert path.read_bytes() == b"# Changelog\n"
+
+    def test_write_crlf(self, tmp_path):
+        path = tmp_path / "CHANGELOG.md"
+        path.write_bytes(b"# Changelog\r\n\r\n- one\r\n- two\r\n")
+        changelog_file = ChangeLogFile(path)
+        text = changelog_file.read()
+        changelog_file.write(text.replace("- one\n", "- one\n- new\n"))
+        assert path.read_bytes() == b"# Changelog\r\n\r\n- one\r\n- new\r\n- two\r\n"
+
+        changelog_file.write("# Changelog\n\n- two\n")
+        assert path.read_bytes() == b"# Changelog\r\n\r\n- two\r\n"
+
+    def test_write_mixed(self, tmp_path):
+        path = tmp_path / "CHANGELOG.md"
+        path.write_bytes(b"# Changelog\r\n\n- one\n- two\r\n- three\n")
+        changelog_file = ChangeLogFile(path)
+        text = changelog_file.read()
+        changelog_file.write(text.replace("- two", "- second"))
+        assert path.read_bytes() == b"# Changelog\r\n\n- one\n- second\n- three\n"
+
+        changelog_file.write(changelog_file.read() + "- four\n")
+        assert path.read_bytes() == b"# Changelog\r\n\n- one\n- second\n- three\n- four\n"
+
+        changelog_file.write("- zero\n" + changelog_file.read())
+        assert path.read_bytes() == b"- zero\n# Changelog\r\n\n- one\n- second\n- three\n- four\n"
+
+    def test_compressed(self, tmp_path):
+        for suffix, compressor in {".gz": gzip, ".xz": lzma, ".bz2": bz2}.items():
+            path = tmp_path / f"CHANGELOG.md{suffix}"
+            with compressor.open(path, "wb") as f:
+                f.write(b"# Changelog\r\n\r\n- one\r\n")
+            changelog_file = ChangeLogFile(path)
+            assert changelog_file.is_compressed
+            assert changelog_file.read() == "# Changelog\n\n- one\n"
+            assert list(changelog_file.iterate_lines()) == ["# Changelog", "", "- one"]
+
+            changelog_file.write("# Changelog\n\n- one\n- two\n")
+            with compressor.open(path, "rb") as f:
+                assert f.read() == b"# Changelog\r\n\r\n- one\r\n- two\r\n"
+
+            new_path = tmp_path / f"NEW.md{suffix}"
+            ChangeLogFile(new_path).write("# Changelog\n")
+            assert ChangeLogFile(new_path).read() == "# Changelog\n"
+
+        assert not ChangeLogFile(tmp_path / "CHANGELOG.md").is_compressed
+
+    def test_lazy_compressor_imports(self):
+        code = "import sys, logchange.session; print(' '.join(sys.modules))"
+        modules = subprocess.run(
+            [sys.executable, "-c", code], check=True, capture_output=True, text=True
+        ).stdout.split()
+        for name in ("gzip", "lzma", "bz2"):
+            assert name not in modules
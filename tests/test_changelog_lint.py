@@ -0,0 +1,117 @@
+import argparse
+import io
+import json
+
+import pytest
+
+from logchange.changelog import ChangeLog
+from logchange.changelog_lint import (
+    ChangeLogLinter,
+    LintRule,
+    get_lint_rules,
+    lint_paths,
+)
+from logchange.executor import Executor, ExecutorError
+
+CHANGELOG = """
+# Changelog
+
+## [Unreleased]
+### Added
+
+## [1.2.0] - 2021-03-01
+### Fixed
+- Fix
+```python
+x = 1
+
+## [1.3.0] - 2021-13-01
+### Added
+- Feature
+
+## [1.1.0] - 2021-04-01
+### Fixed
+- Fix
+### Notes
+- Note
+
+## [1.1.0] - 2021-01-01
+### Removed
+- Old API
+
+## [bad]
+"""
+
+VALID_CHANGELOG = """
+# Changelog
+
+## [Unreleased]
+
+## [2.0.0] - 2021-03-01
+### Fixed
+- Fix
+
+## [1.0.0] - 2021-01-01
+### Added
+- Initial
+"""
+
+
+class TestChangeLogLinter:
+    def test_lint(self):
+        issues = ChangeLogLinter(get_lint_rules().values()).lint(ChangeLog.parse(CHANGELOG))
+        assert sorted((i.version, i.rule) for i in issues) == [
+            ("1.1.0", "duplicate-version"),
+            ("1.1.0", "unknown-header"),
+            ("1.2.0", "unclosed-fence"),
+            ("1.2.0", "version-order"),
+            ("1.3.0", "invalid-date"),
+            ("bad", "invalid-version"),
+            ("unreleased", "empty-section"),
+        ]
+
+    def test_bump_mismatch(self):
+        issues = ChangeLogLinter(get_lint_rules().values()).lint(ChangeLog.parse(VALID_CHANGELOG))
+        assert [i.render() for i in issues] == [
+            ": 2.0.0: major bump from 1.0.0, but sections suggest micro [bump-mismatch]"
+        ]
+
+    def test_custom_rule(self):
+        class NoFixesRule(LintRule):
+            name = "no-fixes"
+
+            def check(self, record, older):
+                if record.record.body.get_section("fixed").body:
+                    yield f"fixes after {older.name if older else 'nothing'}"
+
+        changelog = ChangeLog.parse(VALID_CHANGELOG)
+        issues = ChangeLogLinter([NoFixesRule]).lint(changelog, "CHANGELOG.md")
+        assert [i.render() for i in issues] == ["CHANGELOG.md: 2.0.0: fixes after 1.0.0 [no-fixes]"]
+
+
+def test_lint_paths(tmp_path):
+    paths = [tmp_path / f"CHANGELOG{index}.md" for index in range(3)]
+    for index, path in enumerate(paths):
+        path.write_text(VALID_CHANGELOG if index else CHANGELOG)
+
+    issues = lint_paths(paths, disabled=["bump-mismatch"], workers=2)
+    assert len(issues) == 7
+    assert len({i.path for i in issues}) == 1
+    assert lint_paths(paths[1:], disabled=["bump-mismatch"]) == []
+
+    output = io.StringIO()
+    config = argparse.Namespace(
+        command="lint",
+        input="",
+        paths=paths[:2],
+        disable=[],
+        list_rules=False,
+        json=True,
+        workers=1,
+    )
+    with pytest.raises(ExecutorError):
+        Executor(config, output).execute()
+    assert len(json.loads(output.getvalue())) == 8
+
+    with pytest.raises(ExecutorError):
+        Executor(argparse.Namespace(**{**vars(config), "disable": ["unknown"]})).execute()
@@ -0,0 +1,100 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from logchange.changelog_merge import merge_texts
+
+BASE = """# Changelog
+
+## [Unreleased]
+### Added
+- base feature
+
+## [1.1.0] - 2021-02-01
+### Fixed
+- fix
+
+## [1.0.0] - 2021-01-01
+  Raw   text is   kept
+- initial
+"""
+
+
+class TestChangeLogMerge:
+    def test_merge(self):
+        ours = BASE.replace("- base feature", "- ours feature\n- base feature")
+        theirs = BASE.replace("- base feature", "- theirs feature\n- base feature").replace(
+            "- fix", "- fix\n\n### Security\n- cve"
+        )
+        result = merge_texts(BASE, ours, theirs)
+        assert result.conflicts == []
+        assert result.text == BASE.replace(
+            "- base feature", "- ours feature\n- theirs feature\n- base feature"
+        ).replace("- fix", "- fix\n\n### Security\n- cve")
+
+    def test_merge_releases(self):
+        ours = BASE.replace("## [1.1.0]", "## [1.2.0] - 2021-03-01\n- ours\n\n## [1.1.0]")
+        theirs = BASE.replace("## [1.1.0]", "## [1.1.1] - 2021-02-15\n- theirs\n\n## [1.1.0]")
+        result = merge_texts(BASE, ours, theirs)
+        assert result.conflicts == []
+        assert "## [1.2.0] - 2021-03-01\n- ours\n\n## [1.1.1] - 2021-02-15\n- theirs\n\n" in (
+            result.text
+        )
+        assert "  Raw   text is   kept\n" in result.text
+
+    def test_conflicts(self):
+        ours = BASE.replace("- fix", "- ours fix").replace("2021-01-01", "2021-01-02")
+        theirs = BASE.replace("- fix", "- theirs fix").replace("2021-01-01", "2021-01-03")
+        result = merge_texts(BASE, ours, theirs)
+        assert result.conflicts == ["[1.1.0] fixed", "[1.0.0] date"]
+        assert "<<<<<<< ours\n- ours fix\n=======\n- theirs fix\n>>>>>>> theirs" in result.text
+        assert (
+            "<<<<<<< ours\n## [1.0.0] - 2021-01-02\n=======\n## [1.0.0] - 2021-01-03\n"
+            ">>>>>>> theirs\n"
+        ) in result.text
+
+    def test_duplicates(self):
+        base = BASE.replace("## [1.0.0]", "## [1.1.0] - 2021-01-15\n- duplicate\n\n## [1.0.0]")
+        ours = base.replace("- fix", "- ours fix")
+        theirs = base.replace("- duplicate", "- theirs duplicate")
+        result = merge_texts(base, ours, theirs)
+        assert result.conflicts == ["[1.1.0] duplicate"]
+        assert "- ours fix\n\n## [1.1.0] - 2021-01-15\n- duplicate\n=======\n" in result.text
+        assert "- theirs duplicate\n>>>>>>> theirs" in result.text
+
+        assert merge_texts(base, ours, base).conflicts == []
+        assert merge_texts(base, ours, base).text == ours
+
+    def test_git_merge_driver(self, tmp_path):
+        env = {
+            **os.environ,
+            "PYTHONPATH": Path(__file__).parent.parent.as_posix(),
+            "GIT_AUTHOR_NAME": "test",
+            "GIT_AUTHOR_EMAIL": "test@example.com",
+            "GIT_COMMITTER_NAME": "test",
+            "GIT_COMMITTER_EMAIL": "test@example.com",
+        }
+
+        def git(*args):
+            subprocess.run(["git", *args], cwd=tmp_path, env=env, check=True, capture_output=True)
+
+        path = tmp_path / "CHANGELOG.md"
+        git("init", "-q", "-b", "main")
+        git(
+            "config",
+            "merge.logchange.driver",
+            f"{sys.executable} -m logchange merge-driver %O %A %B",
+        )
+        (tmp_path / ".gitattributes").write_text("CHANGELOG.md merge=logchange\n")
+        path.write_text(BASE)
+        git("add", ".")
+        git("commit", "-q", "-m", "base")
+        git("checkout", "-q", "-b", "feature")
+        path.write_text(BASE.replace("- base feature", "- theirs feature\n- base feature"))
+        git("commit", "-q", "-am", "theirs")
+        git("checkout", "-q", "main")
+        path.write_text(BASE.replace("- base feature", "- ours feature\n- base feature"))
+        git("commit", "-q", "-am", "ours")
+        git("merge", "-q", "--no-edit", "feature")
+        assert "- ours feature\n- theirs feature\n- base feature\n" in path.read_text()
@@ -0,0 +1,105 @@
+import json
+
+from newversion import Version
+
+from logchange.changelog import ChangeLog
+from logchange.changelog_stats import ChangeLogStats, collect_stats
+from logchange.record_body import RecordBody
+from logchange.version_bump import get_bump_type, get_expected_bump_type
+
+CHANGELOG = """
+# Changelog
+
+## [Unreleased]
+### Added
+- Not released
+
+## [2.0.0] - 2021-03-01
+### Removed
+- Old API
+
+## [1.1.0] - 2021-02-11
+### Added
+- Feature
+- Feature 2
+
+### Fixed
+- Fix
+
+## [1.0.1] - 2021-02-01
+### Added
+- Feature in a patch release
+
+## [1.0.0] - 2021-01-01
+### Added
+- Initial
+"""
+
+
+def test_get_bump_type():
+    assert get_bump_type(Version("1.2.3"), Version("2.0.0")) == "major"
+    assert get_bump_type(Version("1.2.3"), Version("1.3.0rc1")) == "minor"
+    assert get_bump_type(Version("1.2.3"), Version("1.2.4")) == "micro"
+    assert get_bump_type(Version("1.3.0rc1"), Version("1.3.0")) == "prerelease"
+    body = RecordBody.parse("### Fixed\n- Fix")
+    assert get_expected_bump_type(body, Version("1.2.3rc1")) == "micro"
+
+
+class TestChangeLogStats:
+    def test_collect(self):
+        stats = ChangeLogStats("CHANGELOG.md", top=2)
+        stats.collect(ChangeLog.parse(CHANGELOG).iterate_records())
+        assert [i.version for i in stats.releases] == ["2.0.0", "1.1.0", "1.0.1", "1.0.0"]
+        assert stats.releases[1].entries == {"added": 2, "fixed": 1}
+        assert [(i.bump, i.expected_bump) for i in stats.releases] == [
+            ("major", "major"),
+            ("minor", "minor"),
+            ("micro", "minor"),
+            ("", ""),
+        ]
+        assert stats.total == 6
+        assert stats.section_entries == {"added": 4, "fixed": 1, "removed": 1}
+        assert stats.intervals == [18, 10, 31]
+        assert stats.get_cadence() == {"mean": 19.7, "median": 18, "min": 10, "max": 31}
+        assert [i.version for i in stats.get_largest()] == ["1.1.0", "2.0.0"]
+
+        data = stats.as_dict()
+        assert data["bumps"]["minor"] == {"actual": 1, "expected": 2, "matched": 1}
+        assert data["first_date"] == "2021-01-01"
+        assert data["release_stats"][1]["total"] == 3
+        json.dumps(data)
+
+        text = stats.render()
+        assert "Releases: 4 (2021-01-01 - 2021-03-01)" in text
+        assert "added                  4          1.0" in text
+        assert "micro                  1         0        0" in text
+
+    def test_empty(self):
+        stats = ChangeLogStats()
+        stats.collect([])
+        assert stats.get_cadence() == {}
+        assert stats.render().startswith("Releases: 0\nEntries: 0, 0.0 per release")
+
+    def test_collect_stats(self, tmp_path):
+        paths = []
+        for name in ("a", "b", "c"):
+            (tmp_path / name).mkdir()
+            paths.append(tmp_path / name / "CHANGELOG.md")
+            paths[-1].write_text(CHANGELOG)
+
+        serial = collect_stats(paths)
+        parallel = collect_stats(paths, workers=2)
+        assert [i.as_dict() for i in parallel] == [i.as_dict() for i in serial]
+        assert [len(i.releases) for i in parallel] == [4, 4, 4]
+
+    def test_project_schema(self, tmp_path):
+        (tmp_path / "pyproject.toml").write_text(
+            '[tool.logchange]\nextra_sections = ["docs", "performance"]\n'
+        )
+        path = tmp_path / "CHANGELOG.md"
+        path.write_text(
+            "# Changelog\n\n## [Unreleased]\n\n"
+            "## [1.1.0]\n### Performance\n- Faster\n\n## [1.0.0]\n### Docs\n- Readme\n"
+        )
+        text = collect_stats([path])[0].render()
+        assert text.index("\ndocs ") < text.index("\nperformance ")
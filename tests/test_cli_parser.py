@@ -0,0 +1,18 @@
+import re
+
+import pytest
+
+from logchange.cli_parser import parse_args
+
+
+def test_help(capsys):
+    with pytest.raises(SystemExit) as exc_info:
+        parse_args(["--help"])
+    assert exc_info.value.code == 0
+    commands = re.search(r"\{(init,[^}]+)\}", capsys.readouterr().out).group(1).split(",")
+    assert "merge-driver" in commands
+    for command in commands:
+        with pytest.raises(SystemExit) as exc_info:
+            parse_args([command, "--help"])
+        assert exc_info.value.code == 0
+        assert command in capsys.readouterr().out
@@ -0,0 +1,95 @@
+import argparse
+import os
+import subprocess
+
+import pytest
+
+from logchange.commit_classifier import CommitClassifier
+from logchange.executor import Executor, ExecutorError
+from logchange.git import GitError, iterate_log_subjects
+from logchange.record_body import RecordBody
+
+
+class TestCommitClassifier:
+    def test_classify(self):
+        classifier = CommitClassifier()
+        assert classifier.classify("feat(cli): New command") == ("added", "cli: New command")
+        assert classifier.classify("fix!: Crash") == ("fixed", "Crash")
+        assert classifier.classify("Fixed: Prefixed fix") == ("fixed", "Prefixed fix")
+        assert classifier.classify("Security: CVE") == ("security", "CVE")
+        assert classifier.classify("docs: Readme") == ("", "")
+        assert classifier.classify("Merge branch main") == ("", "")
+        assert CommitClassifier({"docs": "changed"}).classify("docs: Readme") == (
+            "changed",
+            "Readme",
+        )
+
+    def test_build_notes(self):
+        existing = RecordBody.parse("### Fixed\n- Crash")
+        notes = CommitClassifier().build_notes(
+            ["feat: One", "fix: Crash", "chore: Bump", "feat: One", "perf: Faster"],
+            existing=existing,
+        )
+        assert (notes.entries, notes.duplicates, notes.skipped) == (2, 2, 1)
+        assert notes.body.render() == "### Added\n- One\n\n### Changed\n- Faster"
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    env = {
+        **os.environ,
+        "GIT_AUTHOR_NAME": "test",
+        "GIT_AUTHOR_EMAIL": "test@example.com",
+        "GIT_COMMITTER_NAME": "test",
+        "GIT_COMMITTER_EMAIL": "test@example.com",
+    }
+
+    def commit(message):
+        subprocess.run(
+            ["git", "commit", "-q", "--allow-empty", "-m", message],
+            cwd=tmp_path,
+            env=env,
+            check=True,
+            capture_output=True,
+        )
+
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True, capture_output=True)
+    commit("Initial")
+    subprocess.run(["git", "tag", "v1"], cwd=tmp_path, check=True, capture_output=True)
+    for message in ("feat: Feature", "docs: Docs", "fix(parser): Crash", "Added: Prefixed"):
+        commit(message)
+    return tmp_path
+
+
+def test_iterate_log_subjects(git_repo):
+    subjects = iterate_log_subjects("v1..HEAD", git_repo)
+    assert next(subjects) == "feat: Feature"
+    subjects.close()
+    assert list(iterate_log_subjects("v1..HEAD", git_repo)) == [
+        "feat: Feature",
+        "docs: Docs",
+        "fix(parser): Crash",
+        "Added: Prefixed",
+    ]
+    with pytest.raises(GitError):
+        list(iterate_log_subjects("unknown..HEAD", git_repo))
+
+
+def test_from_git(git_repo):
+    path = git_repo / "CHANGELOG.md"
+    path.write_text("# Changelog\n\n## [Unreleased]\n### Added\n- Feature\n")
+
+    def execute(**kwargs):
+        config = argparse.Namespace(
+            command="from-git", input="", since="v1", until="HEAD", changelog_path=path
+        )
+        return Executor(argparse.Namespace(**{**vars(config), **kwargs})).execute()
+
+    assert execute(dry_run=True) == "### Added\n- Prefixed\n\n### Fixed\n- parser: Crash"
+    assert execute(dry_run=False) == ""
+    assert path.read_text() == (
+        "# Changelog\n\n## [Unreleased]\n### Added\n- Feature\n- Prefixed\n\n"
+        "### Fixed\n- parser: Crash\n"
+    )
+    with pytest.raises(ExecutorError):
+        execute(since="unknown", dry_run=False)
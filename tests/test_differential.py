@@ -0,0 +1,39 @@
+from benchmarks.differential import ENGINES, DedentEngine, DiffCase, run, run_engine
+from benchmarks.generator import RandomChangeLogGenerator
+
+
+class BrokenDedentEngine(DedentEngine):
+    name = "broken dedent"
+
+    def candidate(self, text):
+        return super().candidate(text).replace("\t", " ")
+
+
+def test_random_generator():
+    texts = {RandomChangeLogGenerator(5, seed=i).generate() for i in range(20)}
+    assert len(texts) == 20
+    assert any("\r\n" in i for i in texts)
+    assert any("```" in i for i in texts)
+    assert RandomChangeLogGenerator(5, seed=3).generate() == (
+        RandomChangeLogGenerator(5, seed=3).generate()
+    )
+
+
+def test_run():
+    engines = [i for i in ENGINES if "workers" not in i.name]
+    results = run(engines, 30, releases=5)
+    assert [i.name for i in results] == [i.name for i in engines]
+    for result in results:
+        assert result.divergence is None, result.render()
+        assert result.cases + result.skipped == 30
+        assert "ok" in result.render()
+
+
+def test_divergence():
+    cases = [DiffCase(0, "- line", ""), DiffCase(7, "\t- a\tb\n\t- c", "")]
+    result = run_engine(BrokenDedentEngine(), cases)
+    assert result.cases == 2
+    assert result.divergence.seed == 7
+    assert result.as_dict()["divergence"]["expected"] == "- a\tb\n- c"
+    assert "DIVERGED" in result.render()
+    assert "seed 7, outputs differ at" in result.render()
@@ -0,0 +1,147 @@
+import argparse
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from logchange.command_request import CommandRequest
+from logchange.executor import Executor, ExecutorError
+
+
+def test_lazy_command_imports():
+    code = "import sys, logchange.main; print(' '.join(sys.modules))"
+    modules = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout.split()
+    for name in (
+        "logchange.aggregate",
+        "logchange.changelog_merge",
+        "logchange.reference_cache",
+        "logchange.changelog_stats",
+        "logchange.archive_reader",
+        "logchange.watcher",
+        "logchange.changelog_lint",
+        "logchange.changelog_export",
+        "logchange.commit_classifier",
+        "concurrent.futures.process",
+    ):
+        assert name not in modules
+
+
+class TestCommandRequest:
+    def test_immutable(self):
+        namespace = argparse.Namespace(command="added", input="Feature")
+        request = CommandRequest.from_namespace(namespace)
+        namespace.input = "Changed"
+        assert request.input == "Feature"
+        assert request.has("input")
+        assert not request.has("section")
+        with pytest.raises(AttributeError):
+            request.input = "Changed"
+        with pytest.raises(AttributeError):
+            request.section
+        assert request.replace(input="Changed").input == "Changed"
+        assert CommandRequest.from_namespace(request) is request
+
+
+class TestExecutor:
+    def test_thread_pool(self, tmp_path):
+        paths = [tmp_path / f"CHANGELOG{index}.md" for index in range(4)]
+        for path in paths:
+            path.write_text("# Changelog\n\n## [Unreleased]\n")
+
+        requests = [
+            argparse.Namespace(
+                command="added" if index % 2 else "fixed",
+                input=f"Entry {index}",
+                changelog_path=paths[index % len(paths)],
+            )
+            for index in range(200)
+        ]
+        shared = Executor(
+            argparse.Namespace(
+                command="get", name="unreleased", section="all", input="", changelog_path=paths[0]
+            )
+        )
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            futures = [pool.submit(Executor(request).execute) for request in requests]
+            futures.extend(pool.submit(shared.execute) for _ in range(20))
+            for future in futures:
+                future.result()
+
+        for path_index, path in enumerate(paths):
+            text = path.read_text()
+            for index in range(path_index, 200, len(paths)):
+                assert text.count(f"- Entry {index}\n") == 1
+
+    def test_nested_execute(self, tmp_path):
+        path = tmp_path / "CHANGELOG.md"
+        path.write_text("# Changelog\n\n## [Unreleased]\n\n## [1.0.0]\n### Added\n- Initial\n")
+        executor = Executor(
+            argparse.Namespace(command="list", input="", changelog_path=path, output="text")
+        )
+        command_list = executor._command_list
+        sessions = []
+
+        def command():
+            session = executor.session
+            sessions.append(session)
+            if len(sessions) == 1:
+                assert executor.execute() == "1.0.0"
+            assert executor.session is session
+            return command_list()
+
+        executor._command_list = command
+        assert executor.execute() == "1.0.0"
+        assert len(sessions) == 2
+        assert sessions[0] is not sessions[1]
+
+    def test_project_schema(self, tmp_path, monkeypatch):
+        project_path = tmp_path / "project"
+        project_path.mkdir()
+        (project_path / "pyproject.toml").write_text(
+            '[tool.logchange]\nextra_sections = ["performance"]\n\n'
+            '[tool.logchange.aliases]\nperf = "performance"\n'
+        )
+        path = project_path / "CHANGELOG.md"
+        path.write_text("# Changelog\n\n## [Unreleased]\n")
+        monkeypatch.chdir(tmp_path)
+
+        Executor(
+            argparse.Namespace(
+                command="add",
+                name="unreleased",
+                section="Perf",
+                input="- Faster",
+                created="",
+                changelog_path=path,
+            )
+        ).execute()
+        assert "### Performance\n- Faster\n" in path.read_text()
+        executor = Executor(
+            argparse.Namespace(
+                command="get", name="unreleased", section="unknown", input="", changelog_path=path
+            )
+        )
+        with pytest.raises(ExecutorError):
+            executor.execute()
+
+    def test_crlf_changelog_output(self, tmp_path):
+        path = tmp_path / "CHANGELOG.md"
+        path.write_bytes(
+            b"# Changelog\r\n\r\n## [Unreleased]\r\n\r\n## [1.0.0]\r\n### Added\r\n- Initial\r\n"
+        )
+        # `latest` and `list` read the file line by line, other commands read it fully
+        for name in ("1.0.0", "latest"):
+            result = Executor(
+                argparse.Namespace(
+                    command="get", name=name, section="all", input="", changelog_path=path
+                )
+            ).execute()
+            assert result == "## [1.0.0]\n### Added\n- Initial"
+        path.write_bytes(path.read_bytes().replace(b"## [1.0.0]", b"## [1.1.0]\r\n\r\n## [1.0.0]"))
+        result = Executor(
+            argparse.Namespace(command="list", input="", changelog_path=path)
+        ).execute()
+        assert result == "1.1.0\n1.0.0"
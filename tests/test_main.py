@@ -0,0 +1,69 @@
+import argparse
+import json
+import sys
+import time
+
+import pytest
+
+from logchange import IMPORT_START
+from logchange.main import main_cli, setup_profiler
+from logchange.profiler import PROFILER
+
+
+@pytest.fixture
+def config():
+    yield argparse.Namespace(profile=False, profile_format="text", profile_dump="")
+    PROFILER.disable()
+
+
+class TestMain:
+    def test_setup_profiler(self, config, monkeypatch):
+        monkeypatch.delenv("LOGCHANGE_PROFILE", raising=False)
+        monkeypatch.delenv("LOGCHANGE_PROFILE_DUMP", raising=False)
+        assert setup_profiler(config) == ""
+        assert not PROFILER.enabled
+
+        monkeypatch.setenv("LOGCHANGE_PROFILE", "0")
+        assert setup_profiler(config) == ""
+        assert not PROFILER.enabled
+
+        monkeypatch.setenv("LOGCHANGE_PROFILE", "JSON")
+        assert setup_profiler(config) == "json"
+        assert PROFILER.enabled
+        PROFILER.disable()
+
+        monkeypatch.setenv("LOGCHANGE_PROFILE", "1")
+        config.profile_format = "json"
+        assert setup_profiler(config) == "json"
+        PROFILER.disable()
+
+    def test_setup_profiler_dump(self, config, monkeypatch, tmp_path):
+        dump_path = tmp_path / "logchange.pstats"
+        monkeypatch.delenv("LOGCHANGE_PROFILE", raising=False)
+        monkeypatch.setenv("LOGCHANGE_PROFILE_DUMP", dump_path.as_posix())
+        assert setup_profiler(config) == "text"
+        PROFILER.disable()
+        assert dump_path.exists()
+
+        config.profile_dump = (tmp_path / "cli.pstats").as_posix()
+        assert setup_profiler(config) == "text"
+        PROFILER.disable()
+        assert (tmp_path / "cli.pstats").exists()
+
+    def test_main_cli_profile(self, monkeypatch, capsys, tmp_path):
+        path = tmp_path / "CHANGELOG.md"
+        path.write_text("# Changelog\n\n## [Unreleased]\n\n## [1.0.0]\n### Added\n- Initial\n")
+        monkeypatch.delenv("LOGCHANGE_PROFILE", raising=False)
+        monkeypatch.delenv("LOGCHANGE_PROFILE_DUMP", raising=False)
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            ["logchange", "--profile-format", "json", "--profile", "list", "-p", str(path)],
+        )
+        main_cli()
+        captured = capsys.readouterr()
+        assert captured.out == "1.0.0\n"
+        phases = json.loads(captured.err)["phases"]
+        assert list(phases)[:2] == ["startup", "parse_args"]
+        assert "execute" in phases
+        assert 0 <= phases["startup"]["total"] <= time.perf_counter() - IMPORT_START
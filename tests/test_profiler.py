@@ -0,0 +1,34 @@
+import json
+
+from logchange.changelog import ChangeLog
+from logchange.profiler import Profiler
+from logchange.record import Record
+
+
+class TestProfiler:
+    def test_disabled(self):
+        profiler = Profiler()
+        original_parse = Record.__dict__["parse"]
+        with profiler.phase("read"):
+            pass
+        assert profiler.get_timings() == {}
+        assert Record.__dict__["parse"] is original_parse
+
+    def test_enable(self, tmp_path):
+        profiler = Profiler()
+        original_parse = Record.__dict__["parse"]
+        dump_path = tmp_path / "logchange.pstats"
+        profiler.enable(dump_path)
+        with profiler.phase("read"):
+            changelog = ChangeLog.parse("# Changelog\n\n## [1.0.0]\n### Added\n- test")
+        assert changelog.get_latest() is not None
+        profiler.disable()
+
+        assert Record.__dict__["parse"] is original_parse
+        assert dump_path.exists()
+        timings = profiler.get_timings()
+        assert timings["read"]["calls"] == 1
+        assert timings["ChangeLog.parse"]["calls"] == 1
+        assert timings["Record.parse"]["calls"] == 1
+        assert set(json.loads(profiler.render("json"))["phases"]) == set(timings)
+        assert profiler.render().startswith("Phase")
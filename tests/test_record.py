@@ -0,0 +1,72 @@
+import logging
+
+from newversion import Version
+
+from logchange.constants import LOGGER_NAME
+from logchange.record import Record
+from logchange.record_body import RecordBody
+
+
+class TestRecord:
+    def test_log_changes(self, caplog):
+        record = Record(Version("1.0.0"), "### Added\n- added\n\n### Fixed\n- fixed", "")
+        with caplog.at_level(logging.INFO, logger=LOGGER_NAME):
+            record.set_section("Added", "- new")
+            record.merge(RecordBody.parse("### Removed\n- removed"))
+            record.set_body("### Removed\n- removed")
+
+        assert caplog.messages == [
+            "[1.0.0] `added` section updated",
+            "[1.0.0] `removed` section added",
+            "[1.0.0] `added` section deleted",
+            "[1.0.0] `fixed` section deleted",
+        ]
+
+    def test_log_changes_disabled(self, caplog, monkeypatch):
+        def clone(_self):
+            raise AssertionError("body should not be cloned")
+
+        monkeypatch.setattr(RecordBody, "clone", clone)
+        record = Record(Version("1.0.0"), "### Added\n- added", "")
+        with caplog.at_level(logging.WARNING, logger=LOGGER_NAME):
+            record.set_section("added", "- new")
+            record.append_section("fixed", "- fixed")
+            record.set_body("### Changed\n- changed")
+
+        assert caplog.messages == []
+        assert record.render() == "## [1.0.0]\n### Changed\n- changed"
+
+    def test_render_cache(self):
+        record = Record(Version("1.0.0"), "### Added\n- added", "")
+        assert record.render() == "## [1.0.0]\n### Added\n- added"
+        assert record.render() is record.render()
+
+        record.created = "2021-01-01"
+        assert record.render() == "## [1.0.0] - 2021-01-01\n### Added\n- added"
+        record.version = Version("1.0.1")
+        assert record.render() == "## [1.0.1] - 2021-01-01\n### Added\n- added"
+        record.body.get_section("added").append_lines("- added2")
+        assert record.render() == "## [1.0.1] - 2021-01-01\n### Added\n- added\n- added2"
+        record.set_section("fixed", "- fixed")
+        assert record.render().endswith("### Fixed\n- fixed")
+        record.body.sanitize()
+        record.body.prefix = "prefix"
+        assert record.render().startswith("## [1.0.1] - 2021-01-01\nprefix\n\n### Added")
+        record.merge(RecordBody.parse("### Removed\n- removed"))
+        assert "### Removed\n- removed" in record.render()
+        record.body = RecordBody.parse("### Changed\n- changed")
+        assert record.render() == "## [1.0.1] - 2021-01-01\n### Changed\n- changed"
+        record.body.clear()
+        assert record.render() == "## [1.0.1] - 2021-01-01"
+
+    def test_as_dict(self):
+        record = Record.parse("## [1.0.0] - 2021-01-01\nprefix\n### Added\n- added\n- added2")
+        assert record.as_dict() == {
+            "version": "1.0.0",
+            "created": "2021-01-01",
+            "prefix": "prefix",
+            "sections": {"added": ["- added", "- added2"]},
+            "postfix": "",
+            "text": "prefix\n\n### Added\n- added\n- added2",
+        }
+        assert Record(Version.zero(), "", "").as_dict()["version"] == "unreleased"
@@ -153,6 +153,8 @@ class TestRecordBody:
         assert merged.get_section("added").body == "- added"
         assert merged.get_section("fixed").body == "- fixed"
         assert merged.get_section("security").body == ""
+        merged.get_section("fixed").append_lines("- fixed2")
+        assert body.get_section("fixed").body == "- fixed"
 
     def test_parse_prefix_section(self):
         assert RecordBody._parse_prefix_section("Added: new added") == "added"
@@ -176,8 +178,32 @@ class TestRecordBody:
     def test_clone(self):
         body = RecordBody(prefix="prefix", postfix="postfix")
         assert body.clone().render() == "prefix\n\npostfix"
+        body.set_section("added", "- added")
+        clone = body.clone()
+        clone.set_section("added", "- changed")
+        assert body.get_section("added").body == "- added"
 
     def test_clear(self):
         body = RecordBody([RecordSection("added", "- added")], prefix="prefix", postfix="postfix")
         body.clear()
         assert body.render() == ""
+
+    def test_render_cache(self):
+        body = RecordBody([RecordSection("added", "- added")])
+        assert body.render() == "### Added\n- added"
+        assert body.render() is body.render()
+        revision = body.revision
+        body.get_section("added").body = "- changed"
+        assert body.revision != revision
+        assert body.render() == "### Added\n- changed"
+        body.set_section("fixed", "- fixed")
+        assert body.render() == "### Added\n- changed\n\n### Fixed\n- fixed"
+        body.append_to_all("!")
+        assert body.render() == "### Added\n- changed!\n\n### Fixed\n- fixed!"
+        body.prefix = "prefix"
+        body.postfix = "postfix"
+        assert body.render() == "prefix\n\n### Added\n- changed!\n\n### Fixed\n- fixed!\n\npostfix"
+        body.sanitize()
+        assert body.render() == "### Added\n- changed!\n\n### Fixed\n- fixed!"
+        body.clear()
+        assert body.render() == ""
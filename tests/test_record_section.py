@@ -35,3 +35,16 @@ class TestRecordBody:
         assert section.render() == "### Changed\ntest\ntest2\ntest3"
         section.append_lines("\n")
         assert section.render() == "### Changed\ntest\ntest2\ntest3"
+
+    def test_entries(self):
+        section = RecordSection("added", "- one\n  continued\n* two\n```\n- code\n```\n- three")
+        assert section.entries == ["- one\n  continued", "* two\n```\n- code\n```", "- three"]
+        assert RecordSection("added", "").entries == []
+
+    def test_render_cache(self):
+        section = RecordSection("added", "- one")
+        assert section.render() is section.render()
+        section.title = "fixed"
+        assert section.render() == "### Fixed\n- one"
+        section.body = ""
+        assert section.render() == "### Fixed"
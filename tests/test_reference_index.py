@@ -0,0 +1,99 @@
+import argparse
+import os
+
+from logchange.changelog import ChangeLog
+from logchange.executor import Executor
+from logchange.reference_cache import ReferenceIndexCache
+from logchange.reference_index import Reference, ReferenceIndex
+
+CHANGELOG = """
+# Changelog
+
+## [Unreleased]
+### Added
+- Feature PROJ-12
+
+## [1.1.0] - 2021-02-01
+### Fixed
+- Fix crash #4821, see 3f2a9c1d0e
+- Fix #48
+
+## [1.0.0] - 2021-01-01
+Initial release #1
+
+### Fixed
+- Fix #4821 for real
+  continued
+"""
+
+
+class TestReferenceIndex:
+    def test_find(self):
+        index = ChangeLog.parse(CHANGELOG).get_reference_index()
+        assert [(i.version, i.section) for i in index.find("#4821")] == [
+            ("1.1.0", "fixed"),
+            ("1.0.0", "fixed"),
+        ]
+        assert index.find("4821")[1].entry == "- Fix #4821 for real\ncontinued"
+        assert index.find("4821")[1].render() == "1.0.0 fixed: - Fix #4821 for real continued"
+        assert [i.version for i in index.find("#48")] == ["1.1.0"]
+        assert index.find("#1") == [Reference("#1", "1.0.0", "", "Initial release #1")]
+        assert [i.version for i in index.find("proj-12")] == ["unreleased"]
+        assert [i.ref for i in index.find("3F2A9C1")] == ["3f2a9c1d0e"]
+        assert [i.ref for i in index.find("3f2a9c1d0e1234")] == ["3f2a9c1d0e"]
+        assert index.find("3f2a9c1d0f") == []
+        assert index.find("3f2a9c1d") == index.find("3f2a9c1d0e")
+        assert index.find("#2") == []
+
+        custom = ReferenceIndex.build(
+            ChangeLog.parse(CHANGELOG).iterate_records(), patterns=[r"\bfor real\b"]
+        )
+        assert [i.version for i in custom.find("For Real")] == ["1.0.0"]
+        assert custom.find("#4821") == []
+
+    def test_as_dict(self):
+        index = ChangeLog.parse(CHANGELOG).get_reference_index()
+        new_index = ReferenceIndex.from_dict(index.as_dict())
+        assert new_index.patterns == index.patterns
+        assert len(new_index) == len(index)
+        assert new_index.find("#4821") == index.find("#4821")
+
+    def test_cache(self, tmp_path):
+        changelog_path = tmp_path / "CHANGELOG.md"
+        changelog_path.write_text(CHANGELOG)
+        cache = ReferenceIndexCache(tmp_path / "cache.json")
+        patterns = ReferenceIndex.DEFAULT_PATTERNS
+        assert cache.get(changelog_path, patterns) is None
+
+        cache.save(changelog_path, ChangeLog.parse(CHANGELOG).get_reference_index())
+        assert len(cache.get(changelog_path, patterns).find("#4821")) == 2
+        assert cache.get(changelog_path, [r"#\d+"]) is None
+        assert cache.get(tmp_path / "other.md", patterns) is None
+
+        # same content with new mtime is still valid
+        os.utime(changelog_path, ns=(1, 1))
+        assert cache.get(changelog_path, patterns) is not None
+        changelog_path.write_text(CHANGELOG.replace("#4821", "#4822"))
+        assert cache.get(changelog_path, patterns) is None
+
+        (tmp_path / "cache.json").write_text("{")
+        assert cache.get(changelog_path, patterns) is None
+
+    def test_default_cache(self, tmp_path, monkeypatch):
+        changelog_path = tmp_path / "CHANGELOG.md"
+        changelog_path.write_text(CHANGELOG)
+        monkeypatch.setenv("XDG_CACHE_HOME", (tmp_path / "cache").as_posix())
+        monkeypatch.chdir(tmp_path)
+        config = argparse.Namespace(
+            command="where",
+            input="",
+            changelog_path=changelog_path,
+            ref="4821",
+            patterns=[],
+            json=False,
+            cache_path=None,
+            no_cache=False,
+        )
+        assert Executor(config).execute() == Executor(config).execute()
+        assert (tmp_path / "cache" / "logchange" / "references.json").exists()
+        assert sorted(i.name for i in tmp_path.iterdir()) == ["CHANGELOG.md", "cache"]
@@ -0,0 +1,102 @@
+import pytest
+from newversion.version import Version
+
+from logchange.record_body import RecordBody
+from logchange.record_section import RecordSection
+from logchange.section_schema import (
+    SectionSchema,
+    SectionSchemaError,
+    get_schema,
+    set_schema,
+    use_schema,
+)
+
+
+@pytest.fixture
+def schema():
+    schema = SectionSchema.from_dict(
+        {
+            "extra_sections": ["performance"],
+            "minor_sections": ["added", "changed", "performance"],
+            "aliases": {"fix": "fixed", "Feat": "Added", "perf": "performance"},
+        }
+    )
+    set_schema(schema)
+    yield schema
+    set_schema(None)
+
+
+class TestSectionSchema:
+    def test_init(self):
+        schema = SectionSchema()
+        assert schema.titles == ["added", "changed", "deprecated", "removed", "fixed", "security"]
+        assert schema.get_title("Added") == "added"
+        assert schema.get_title("unknown") == ""
+        with pytest.raises(SectionSchemaError):
+            SectionSchema(aliases={"fix": "unknown"})
+        with pytest.raises(SectionSchemaError):
+            SectionSchema(major_titles=["unknown"])
+        with pytest.raises(SectionSchemaError):
+            SectionSchema.from_dict({"aliases": ["fix"]})
+
+    def test_from_dict(self, schema):
+        assert schema.titles[-1] == "performance"
+        assert schema.names[-3:] == ["fix", "feat", "perf"]
+        assert schema.get_title("FIX") == "fixed"
+        assert schema.parse_prefix("perf: faster") == "performance"
+        assert schema.parse_prefix("other: text") == ""
+        assert schema.parse_prefix(": text") == ""
+
+    def test_parse(self, schema):
+        body = RecordBody.parse("fix: bug\nFeat: feature\n### Perf\n- faster")
+        assert body.render() == "### Added\nfeature\n\n### Fixed\nbug\n\n### Performance\n- faster"
+        assert RecordSection("perf", "- faster").title == "performance"
+        assert RecordSection.is_valid_title("Fix")
+
+    def test_bump_version(self, schema):
+        version = Version("1.2.3")
+        assert RecordBody([RecordSection("fixed", "- fix")]).bump_version(version) == Version(
+            "1.2.4"
+        )
+        assert RecordBody([RecordSection("perf", "- fast")]).bump_version(version) == Version(
+            "1.3.0"
+        )
+        assert RecordBody([RecordSection("removed", "- rm")]).bump_version(version) == Version(
+            "2.0.0"
+        )
+
+    def test_load(self, tmp_path):
+        assert SectionSchema.load(tmp_path).titles == SectionSchema().titles
+
+        (tmp_path / "pyproject.toml").write_text(
+            '[tool.logchange]\nextra_sections = ["docs"]\n\n'
+            '[tool.logchange.aliases]\ndoc = "docs"\n'
+        )
+        child_path = tmp_path / "child"
+        child_path.mkdir()
+        schema = SectionSchema.load(child_path)
+        assert schema.titles[-1] == "docs"
+        assert schema.get_title("doc") == "docs"
+
+        (tmp_path / "pyproject.toml").write_text("[tool.logchange\n")
+        with pytest.raises(SectionSchemaError):
+            SectionSchema.load(tmp_path)
+
+    def test_get_schema(self, tmp_path, monkeypatch):
+        docs_path = tmp_path / "docs"
+        docs_path.mkdir()
+        (docs_path / "pyproject.toml").write_text('[tool.logchange]\nextra_sections = ["docs"]\n')
+        other_path = tmp_path / "other"
+        other_path.mkdir()
+        monkeypatch.chdir(other_path)
+
+        schema = get_schema(docs_path)
+        assert schema.titles[-1] == "docs"
+        assert get_schema(docs_path) is schema
+        assert get_schema().titles == SectionSchema().titles
+        with use_schema(schema):
+            assert get_schema() is schema
+            with use_schema(get_schema(other_path)):
+                assert get_schema() is not schema
+            assert get_schema() is schema
+        assert get_schema() is not schema
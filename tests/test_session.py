@@ -0,0 +1,96 @@
+import gzip
+import subprocess
+import sys
+
+import pytest
+
+import logchange
+from benchmarks.generator import ChangeLogGenerator
+from logchange.changelog import ChangeLog
+from logchange.changelog_file import ChangeLogFile
+from logchange.session import ChangeLogSessionError
+
+
+def test_import():
+    code = "import sys, logchange; print(sorted(i for i in sys.modules if i.startswith('asyncio')))"
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    assert output.strip() == "[]"
+
+
+class TestChangeLogSession:
+    def test_open(self, tmp_path, monkeypatch):
+        path = tmp_path / "CHANGELOG.md"
+        path.write_text("# Changelog\n\n## [Unreleased]\n\n## [1.0.0] - 2021-01-01\n- initial\n")
+        calls = []
+        monkeypatch.setattr(ChangeLog, "parse", self._spy(calls, "parse", ChangeLog.parse))
+        monkeypatch.setattr(ChangeLogFile, "write", self._spy(calls, "write", ChangeLogFile.write))
+
+        with logchange.open(path) as changelog:
+            for index in range(30):
+                changelog.add("unreleased", f"Feature {index}", section="added")
+            changelog.set("1.0.0", "Bug fix", section="fixed", created="2021-01-02")
+            changelog.release("1.1.0", created="2021-02-01")
+
+        assert calls == ["parse", "write"]
+        text = path.read_text()
+        assert "## [1.1.0] - 2021-02-01\n### Added\n- Feature 0\n" in text
+        assert "- Feature 29\n\n## [1.0.0] - 2021-01-02\n- initial\n\n### Fixed\n- Bug fix" in text
+
+    def test_not_saved_on_error(self, tmp_path):
+        path = tmp_path / "CHANGELOG.md"
+        with pytest.raises(ChangeLogSessionError):
+            with logchange.open(path) as changelog:
+                changelog.add("unreleased", "Feature", section="added")
+                changelog.add("latest", "Feature", section="added")
+
+        assert not path.exists()
+
+    def test_save(self, tmp_path):
+        path = tmp_path / "CHANGELOG.md"
+        session = logchange.ChangeLogSession(path)
+        assert session.save() is False
+        session.add("unreleased", "Feature", section="added")
+        assert session.is_dirty is True
+        assert session.save() is True
+        assert session.save() is False
+        assert session.get("unreleased").body.get_section("added").body == "- Feature"
+
+    def test_iterate_records(self, tmp_path, monkeypatch):
+        path = tmp_path / "CHANGELOG.md.gz"
+        with gzip.open(path, "wt") as f:
+            f.write(ChangeLogGenerator(releases=50).generate())
+        lines = []
+        iterate_lines = ChangeLogFile.iterate_lines
+
+        def spy(self):
+            for line in iterate_lines(self):
+                lines.append(line)
+                yield line
+
+        monkeypatch.setattr(ChangeLogFile, "iterate_lines", spy)
+        session = logchange.ChangeLogSession(path)
+        latest = next(session.iterate_records())
+        assert latest.version.dumps() == "1.4.9"
+        assert len(lines) < 40
+        assert session._changelog is None
+        assert [i.version for i in session.iterate_records()] == [
+            i.version for i in session.changelog.iterate_records()
+        ]
+
+        path = tmp_path / "CHANGELOG.md"
+        path.write_text("  # Changelog\n\n  ## [Unreleased]\n\n  ## [1.0.0]\n  - one\n")
+        session = logchange.ChangeLogSession(path)
+        assert [i.render() for i in session.iterate_records()] == ["## [1.0.0]\n- one"]
+        assert session._changelog is not None
+
+    @staticmethod
+    def _spy(calls, name, method):
+        func = getattr(method, "__func__", method)
+
+        def wrapper(*args, **kwargs):
+            calls.append(name)
+            return func(*args, **kwargs)
+
+        return classmethod(wrapper) if hasattr(method, "__func__") else wrapper
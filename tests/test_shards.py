@@ -0,0 +1,88 @@
+from newversion import Version
+
+from logchange.changelog import ChangeLog
+from logchange.shards import ShardManifest
+
+CHANGELOG = """# Changelog
+
+## [Unreleased]
+
+## [3.0.0] - 2021-03-01
+### Removed
+- Old API
+
+## [2.1.0] - 2021-02-01
+### Added
+- Feature
+
+## [2.0.0] - 2021-01-01
+### Removed
+- Older API
+
+## [1.0.0] - 2020-01-01
+### Added
+- Initial release
+"""
+
+
+class TestShardManifest:
+    def test_archive(self, tmp_path):
+        changelog_path = tmp_path / "CHANGELOG.md"
+        changelog = ChangeLog.parse(CHANGELOG)
+        manifest = ShardManifest.load(changelog_path)
+        records = manifest.archive(changelog, Version("3.0.0"))
+        manifest.save()
+
+        assert [i.version.dumps() for i in records] == ["2.1.0", "2.0.0", "1.0.0"]
+        assert [i.version.dumps() for i in changelog.released] == ["3.0.0"]
+        assert sorted(i.name for i in tmp_path.iterdir()) == [
+            "CHANGELOG-1.x.md",
+            "CHANGELOG-2.x.md",
+            "CHANGELOG.shards.json",
+        ]
+        shard_text = (tmp_path / "CHANGELOG-2.x.md").read_text()
+        assert "## [Unreleased]" not in shard_text
+        assert "## [2.1.0] - 2021-02-01\n### Added\n- Feature\n\n## [2.0.0]" in shard_text
+
+    def test_lazy_shards(self, tmp_path):
+        changelog_path = tmp_path / "CHANGELOG.md"
+        changelog = ChangeLog.parse(CHANGELOG)
+        manifest = ShardManifest.load(changelog_path)
+        manifest.archive(changelog, Version("3.0.0"))
+        manifest.save()
+
+        changelog = ChangeLog.parse(changelog.render())
+        changelog.shards = ShardManifest.load(changelog_path).shards
+        assert [i.changelog for i in changelog.shards if i._changelog] == []
+
+        record = changelog.get_record(Version("1.0.0"))
+        assert record is not None
+        assert record.body.get_section("added").body == "- Initial release"
+        assert [i.path.name for i in changelog.shards if i._changelog] == ["CHANGELOG-1.x.md"]
+
+        versions = [
+            i.version.dumps() for i in changelog.iterate_range(Version("2.0.0"), Version("3.0.0"))
+        ]
+        assert versions == ["3.0.0", "2.1.0", "2.0.0"]
+        versions = [i.version.dumps() for i in changelog.iterate_records()]
+        assert versions == ["3.0.0", "2.1.0", "2.0.0", "1.0.0"]
+
+    def test_archive_many(self, tmp_path):
+        changelog_path = tmp_path / "CHANGELOG.md"
+        releases = "".join(f"## [1.{i}.0]\n### Fixed\n- Fix {i}\n\n" for i in range(50, 0, -1))
+        changelog = ChangeLog.parse(f"# Changelog\n\n## [Unreleased]\n\n{releases}")
+        manifest = ShardManifest.load(changelog_path)
+        manifest.archive(changelog, Version("1.40.0"))
+        manifest.save()
+
+        manifest = ShardManifest.load(changelog_path)
+        releases = releases.replace("- Fix 45\n", "- Fixed\n")
+        changelog = ChangeLog.parse(f"# Changelog\n\n## [Unreleased]\n\n{releases}")
+        manifest.archive(changelog, Version("1.50.0"))
+        manifest.save()
+
+        (shard,) = manifest.shards
+        assert (shard.newest.dumps(), shard.oldest.dumps()) == ("1.49.0", "1.1.0")
+        versions = [i.version.dumps() for i in shard.changelog.iterate_records()]
+        assert versions == [f"1.{i}.0" for i in range(49, 0, -1)]
+        assert shard.changelog.get_record(Version("1.45.0")).body.render() == "### Fixed\n- Fixed"
@@ -0,0 +1,68 @@
+import io
+import random
+
+from logchange.record_body import RecordBody
+from logchange.stream_formatter import StreamFormatter
+from logchange.utils import dedent
+
+
+class TestStreamFormatter:
+    LINES = (
+        "### Added",
+        "## Fixed",
+        "# Removed stuff",
+        "### Unknown",
+        "added: inline",
+        "Fixed:  inline ",
+        "- item",
+        "  - subitem",
+        "```",
+        "    code",
+        "\t- tab",
+        "",
+        "   ",
+        "　",
+        "note: text",
+        "  ### Changed",
+    )
+
+    @staticmethod
+    def _format(text, spill_size=StreamFormatter.SPILL_SIZE, chunk_size=None):
+        formatter = StreamFormatter(spill_size)
+        if chunk_size:
+            formatter.CHUNK_SIZE = chunk_size
+        output = io.StringIO()
+        formatter.format(io.StringIO(text), output)
+        return output.getvalue()
+
+    @staticmethod
+    def _format_reference(text):
+        is_crlf = "\r\n" in text
+        body = RecordBody.parse(dedent(text.replace("\r\n", "\n")))
+        body.sanitize()
+        result = body.render()
+        return result.replace("\n", "\r\n") if is_crlf else result
+
+    def test_format(self):
+        text = (
+            "  Notes\n  ### Added\n  - one\n\n    continued\n  ```\n  ### Code\n  ```\n  fixed: two"
+        )
+        assert self._format(text) == (
+            "### Added\n- one\ncontinued\n```\n### Code\n```\n\n### Fixed\ntwo"
+        )
+        assert self._format("### Added\r\n- one\r\nremoved: two") == (
+            "### Added\r\n- one\r\n\r\n### Removed\r\ntwo"
+        )
+        assert self._format("") == ""
+        assert self._format("just notes") == ""
+
+    def test_format_random(self):
+        for seed in range(500):
+            rnd = random.Random(seed)
+            indent = rnd.choice(["", "  ", "\t"])
+            lines = [
+                rnd.choice(["", indent]) + rnd.choice(self.LINES) for _ in range(rnd.randint(0, 20))
+            ]
+            text = "".join(i + rnd.choice(["\n", "\r\n", "\r", "\x0c"]) for i in lines)
+            result = self._format(text, spill_size=rnd.choice([1, 10**6]), chunk_size=3)
+            assert result == self._format_reference(text), text
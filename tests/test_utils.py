@@ -1,7 +1,36 @@
-from logchange.utils import dedent
+import itertools
+from pathlib import Path
+
+from logchange.utils import (
+    _strip_empty_lines_splitlines,
+    dedent,
+    get_cache_path,
+    strip_empty_lines,
+)
 
 
 def test_dedent():
     assert dedent("  a\n  b") == "a\nb"
     assert dedent("  a\n b") == " a\nb"
     assert dedent("\n  a\n b\n   \n") == " a\nb"
+    assert dedent("a\n  b\n  \n\tc \n") == "a\n  b\n\n\tc "
+    assert dedent("a\n\t\nb\t") == "a\n\nb\t"
+
+
+def test_strip_empty_lines():
+    assert strip_empty_lines("") == ""
+    assert strip_empty_lines(" \n\t\n") == ""
+    assert strip_empty_lines("\n \na\n\nb \n\n") == "a\n\nb "
+    assert strip_empty_lines("a\n") == "a"
+    # other line breaks are normalized like `str.splitlines` does
+    assert strip_empty_lines("\r\n\ra\r\nb\x0cc \n") == "a\nb\nc "
+    for parts in itertools.product(("", "a", " ", "\xa0", "\n", "\r\n", " "), repeat=4):
+        text = "".join(parts)
+        assert strip_empty_lines(text) == _strip_empty_lines_splitlines(text), repr(text)
+
+
+def test_get_cache_path(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", tmp_path.as_posix())
+    assert get_cache_path("cache.json") == tmp_path / "logchange" / "cache.json"
+    monkeypatch.delenv("XDG_CACHE_HOME")
+    assert get_cache_path("cache.json") == Path.home() / ".cache" / "logchange" / "cache.json"
@@ -0,0 +1,97 @@
+import argparse
+import json
+import os
+
+import pytest
+
+from logchange.executor import Executor, ExecutorError
+from logchange.watcher import ChangeLogWatcher, PollingBackend, WatchedChangeLog
+
+CHANGELOG = """# Changelog
+
+## [Unreleased]
+### Added
+- Not released
+
+## [1.1.0] - 2021-02-01
+### Added
+- Feature
+
+## [1.0.0] - 2021-01-01
+### Added
+- Initial
+"""
+
+
+class TestWatchedChangeLog:
+    def test_update(self, tmp_path):
+        path = tmp_path / "CHANGELOG.md"
+        path.write_text(CHANGELOG)
+        changelog = WatchedChangeLog(path)
+        update = changelog.update()
+        assert update.changed == ["unreleased", "1.1.0", "1.0.0"]
+        assert update.blocks == 3
+        assert update.issues == []
+        assert changelog.update() is None
+
+        path.write_text(CHANGELOG.replace("- Feature", "- New feature"))
+        update = changelog.update()
+        assert update.changed == ["1.1.0"]
+        assert changelog.as_dict()[1]["sections"] == {"added": ["- New feature"]}
+
+        path.write_text(CHANGELOG.replace("[1.0.0] - 2021-01-01", "[1.0.0]  -  2021-01-01"))
+        update = changelog.update()
+        assert update.changed == ["1.1.0", "1.0.0"]
+        assert update.issues == ["1.0.0: not formatted, run `logchange init -f`"]
+        assert update.render().endswith("\n  1.0.0: not formatted, run `logchange init -f`")
+
+        path.write_text(CHANGELOG.split("## [1.0.0]")[0])
+        update = changelog.update()
+        assert (update.changed, update.removed) == ([], ["1.0.0"])
+        assert changelog.get_notes() == "## [1.1.0] - 2021-02-01\n### Added\n- Feature"
+
+
+class TestChangeLogWatcher:
+    def test_poll(self, tmp_path):
+        path = tmp_path / "CHANGELOG.md"
+        path.write_text(CHANGELOG)
+        backend = PollingBackend([path], interval=0.01)
+        assert backend.wait(timeout=0.02) == []
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert backend.wait(timeout=0) == [path]
+
+        watcher = ChangeLogWatcher([path], interval=0.01, use_inotify=False)
+        assert len(watcher.check()) == 1
+        path.write_text(CHANGELOG.replace("- Initial", "- First"))
+        assert [i.changed for i in watcher.poll(timeout=1)] == [["1.0.0"]]
+        path.write_text(CHANGELOG.replace("- Initial", "- First") + "\n")
+        assert watcher.poll(timeout=1) == []
+        watcher.close()
+
+    def test_executor(self, tmp_path):
+        path = tmp_path / "CHANGELOG.md"
+        path.write_text(CHANGELOG)
+        json_path = tmp_path / "CHANGELOG.json"
+        config = argparse.Namespace(
+            command="watch",
+            input="",
+            paths=[path],
+            json=True,
+            json_out=json_path,
+            notes_out=None,
+            interval=0.01,
+            poll=True,
+            once=True,
+        )
+        output = Executor(config).execute()
+        assert json.loads(output)["blocks"] == 3
+        assert [i["version"] for i in json.loads(json_path.read_text())] == [
+            "unreleased",
+            "1.1.0",
+            "1.0.0",
+        ]
+
+        path.write_text(CHANGELOG.replace("[1.1.0] -", "[1.1.0]   -"))
+        with pytest.raises(ExecutorError):
+            Executor(config).execute()